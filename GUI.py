@@ -1,31 +1,86 @@
-import tkinter as tk
-from tkinter import ttk
-import keyboard
-import pystray
-from PIL import Image, ImageDraw
-import threading
+import time
+startup_t0 = time.perf_counter()
+
+import startup_trace
+import applog
 import sys
-import winreg
 import os
-import time
+import argparse
 import traceback
-import datetime
-import ctypes
-import atexit
-from tkinter import messagebox  # used for popups
+
+# Frozen builds start their regex helper process as "CaseCon.exe --regex-worker"
+if "--regex-worker" in sys.argv:
+    import regexrules
+    regexrules.serve_stdio()
+    sys.exit(0)
+
+# -------------------- Command line --------------------
+def parse_command_line(argv):
+    """Turn launch arguments into a command list that can be forwarded to a running instance"""
+    parser = argparse.ArgumentParser(prog="CaseCon")
+    parser.add_argument("--show", action="store_true", help="show the main window")
+    parser.add_argument("--convert", nargs=2, metavar=("MODE", "FILE"),
+                        help="convert a text file in place (cleanup steps can prefix MODE, e.g. cleanup+snakecase)")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="show the most frequent words and repeated phrases of a text file")
+    parser.add_argument("--reload-settings", action="store_true", help="re-read settings.json")
+    parser.add_argument("--exit-when-ready", action="store_true",
+                        help="quit as soon as the hook is installed (used by benchmarks/bench_startup.py)")
+    parser.add_argument("--trace-startup", action="store_true",
+                        help="write start-up milestones to casecon_startup_trace.log")
+    args, _unknown = parser.parse_known_args(argv)
+    if args.convert:
+        mode, path = args.convert
+        # Resolve now: the running instance (and this one, below) work from another directory
+        args.command = ["convert", mode, os.path.abspath(path)]
+    elif args.stats:
+        args.command = ["stats", os.path.abspath(args.stats)]
+    elif args.reload_settings:
+        args.command = ["reload"]
+    else:
+        args.command = ["show"]
+    return args
+
+launch_args = parse_command_line(sys.argv[1:])
+launch_command = launch_args.command
+if launch_args.trace_startup:
+    startup_trace.enable()
 
 # Change to script directory to ensure relative imports work
 script_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(script_dir)
 
-# Add error logging for startup debugging
-def log_error(error_msg):
-    try:
-        with open("casecon_error.log", "a", encoding="utf-8") as f:
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{timestamp}] {error_msg}\n")
-    except:
-        pass
+# Logging goes through applog's queue; the file is written by a background thread
+def log_error(error_msg, **fields):
+    applog.log(applog.ERROR, error_msg, **fields)
+
+def log_info(message, **fields):
+    applog.log(applog.INFO, message, **fields)
+
+# -------------------- Single instance --------------------
+# Runs before the heavy imports below so a second launch can hand its command
+# to the running instance and exit without installing another keyboard hook.
+try:
+    from single_instance import acquire_instance_lock, serve_commands
+    instance_listener = acquire_instance_lock(launch_command)
+except Exception as e:
+    log_error(f"Single-instance check failed: {str(e)}\n{traceback.format_exc()}")
+    sys.exit(1)
+
+if instance_listener is None:
+    sys.exit(0)  # command forwarded to the running instance
+startup_trace.mark("instance_lock")
+
+# pystray/PIL (tray), winreg (startup entry) and tkinter.messagebox (popups)
+# are imported where they are used so they stay off the path to hook-ready.
+import tkinter as tk
+from tkinter import ttk
+startup_trace.mark("import_tkinter")
+import keyboard
+startup_trace.mark("import_keyboard")
+import threading
+import ctypes
+import atexit
 
 try:
     from textcore import (
@@ -36,11 +91,44 @@ try:
         get_setting,
         update_setting,
         count_selected_text,
+        count_text,
+        text_stats,
+        file_stats,
+        convert_file,
+        cycle_clipboard_text,
+        set_cycle_modes,
+        invalidate_cycle,
+        start_precompute,
+        stop_precompute,
+        get_precompute_stats,
+        register_custom_modes,
+        set_locale,
+        set_title_style,
+        set_sentence_style,
+        set_identifier_cells,
+        set_protected_words,
+        set_segment_dictionary,
+        set_slug_length,
+        set_cleanup_steps,
+        set_cleanup_first,
+        with_cleanup,
+        custom_modes,
+        register_regex_modes,
+        regex_modes,
+        register_replace_modes,
+        replace_modes,
+        register_pipelines,
+        get_pipelines,
     )
+    from styledetect import style_report, format_report
+    import latency
+    import profiling
+    import metrics
 except Exception as e:
     error_msg = f"Failed to import textcore: {str(e)}\n{traceback.format_exc()}"
     log_error(error_msg)
     sys.exit(1)
+startup_trace.mark("import_textcore")
 
 # -------------------- Key name handling --------------------
 CTRL_SC = 29
@@ -83,51 +171,71 @@ def get_scancode_for_char(target_char):
     return None
 
 # -------------------- Windows startup --------------------
+RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
+
+def get_startup_command():
+    """Command line that should be stored in the Run key for this installation"""
+    # For compiled executable, sys.executable will be your .exe path
+    app_path = sys.executable
+
+    # For development (if running as .py file), use the script path
+    if app_path.endswith('python.exe') or app_path.endswith('pythonw.exe'):
+        app_path = os.path.abspath(__file__)
+        # Try to use pythonw.exe if available
+        python_exe = sys.executable
+        if python_exe.endswith('python.exe'):
+            pythonw_path = python_exe.replace('python.exe', 'pythonw.exe')
+            if os.path.exists(pythonw_path):
+                return f'"{pythonw_path}" "{app_path}"'
+        return f'"{python_exe}" "{app_path}"'
+    # Already an executable
+    return f'"{app_path}"'
+
+def get_startup_value():
+    """Current Run key value for CaseCon, or None if there is none"""
+    import winreg
+    try:
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_READ)
+        try:
+            value, _type = winreg.QueryValueEx(key, "CaseCon")
+            return value
+        finally:
+            winreg.CloseKey(key)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        return None
+
 def add_to_startup():
-    """Direct registry entry - no batch files needed"""
+    """Direct registry entry - no batch files needed. Skips the write when the entry is already correct."""
+    import winreg
     try:
-        # For compiled executable, sys.executable will be your .exe path
-        app_path = sys.executable
-        
-        # For development (if running as .py file), use the script path
-        if app_path.endswith('python.exe') or app_path.endswith('pythonw.exe'):
-            app_path = os.path.abspath(__file__)
-            # Try to use pythonw.exe if available
-            python_exe = sys.executable
-            if python_exe.endswith('python.exe'):
-                pythonw_path = python_exe.replace('python.exe', 'pythonw.exe')
-                if os.path.exists(pythonw_path):
-                    startup_command = f'"{pythonw_path}" "{app_path}"'
-                else:
-                    startup_command = f'"{python_exe}" "{app_path}"'
-            else:
-                startup_command = f'"{python_exe}" "{app_path}"'
-        else:
-            # Already an executable
-            startup_command = f'"{app_path}"'
-        
-        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER,
-                             r"Software\Microsoft\Windows\CurrentVersion\Run",
-                             0, winreg.KEY_SET_VALUE)
+        startup_command = get_startup_command()
+        if get_startup_value() == startup_command:
+            return
+
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE)
         winreg.SetValueEx(key, "CaseCon", 0, winreg.REG_SZ, startup_command)
         winreg.CloseKey(key)
         
-        log_error(f"Successfully added to startup: {startup_command}")
+        log_info(f"Successfully added to startup: {startup_command}")
         
     except Exception as e:
         log_error(f"Failed to add to startup: {str(e)}\n{traceback.format_exc()}")
 
 def remove_from_startup():
+    import winreg
     try:
         # Clean up any old batch file from previous versions
         batch_path = os.path.join(script_dir, "start_casecon.bat")
         if os.path.exists(batch_path): 
             os.remove(batch_path)
+
+        if get_startup_value() is None:
+            return  # nothing to delete, avoid opening the key for writing
             
         # Remove from registry
-        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER,
-                             r"Software\Microsoft\Windows\CurrentVersion\Run",
-                             0, winreg.KEY_SET_VALUE)
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE)
         winreg.DeleteValue(key, "CaseCon")
         winreg.CloseKey(key)
     except FileNotFoundError:
@@ -136,20 +244,11 @@ def remove_from_startup():
         log_error(f"Failed to remove from startup: {str(e)}\n{traceback.format_exc()}")
 
 def is_in_startup():
-    try:
-        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER,
-                             r"Software\Microsoft\Windows\CurrentVersion\Run",
-                             0, winreg.KEY_READ)
-        winreg.QueryValueEx(key, "CaseCon")
-        winreg.CloseKey(key)
-        return True
-    except FileNotFoundError:
-        return False
-    except Exception:
-        return False
+    return get_startup_value() is not None
 
 # -------------------- System Tray --------------------
 def create_tray_icon():
+    from PIL import Image, ImageDraw
     try:
         icon_path = os.path.join(script_dir, "icon.ico")
         if os.path.exists(icon_path):
@@ -188,24 +287,88 @@ def quit_app():
     root.quit()
     sys.exit()
 
+def apply_precompute_setting():
+    """Start or stop the speculative clipboard watcher to match settings.json"""
+    if get_setting("speculative_precompute"):
+        start_precompute(get_setting("speculative_max_chars"), get_setting("speculative_cpu_budget_ms"))
+    else:
+        stop_precompute()
+
+def toggle_precompute():
+    update_setting("speculative_precompute", 0 if get_setting("speculative_precompute") else 1)
+    apply_precompute_setting()
+
+def precompute_menu_text(item):
+    if not get_setting("speculative_precompute"):
+        return "Precompute on copy"
+    stats = get_precompute_stats()
+    return f"Precompute on copy ({stats['hit_rate']:.0%} hits, {stats['hits']}/{stats['hits'] + stats['misses']})"
+
+def apply_profile_setting():
+    """'profile_operations': N in settings.json arms profiling once, then resets to 0"""
+    count = get_setting("profile_operations")
+    if count:
+        profiling.arm(count)
+        update_setting("profile_operations", 0)
+        log_info(f"Profiling the next {count} operations into {os.path.abspath(profiling.PROFILE_DIR)}")
+
+def toggle_profiling():
+    if profiling.remaining():
+        profiling.disarm()
+    else:
+        profiling.arm(profiling.DEFAULT_OPERATIONS)
+        log_info(f"Profiling the next {profiling.DEFAULT_OPERATIONS} operations into "
+                 f"{os.path.abspath(profiling.PROFILE_DIR)}")
+
+def show_latency_stats():
+    """Export the hotkey latency histograms and show the merged percentiles"""
+    def show():
+        from tkinter import messagebox
+        try:
+            path = os.path.abspath(latency.export_stats())
+            message = f"{latency.format_summary()}\n\nPer-mode details saved to:\n{path}"
+        except Exception as e:
+            message = f"{latency.format_summary()}\n\nCould not save details: {str(e)}"
+        messagebox.showinfo("Hotkey Latency", message, parent=root)
+    root.after(0, show)
+
 def setup_tray():
     global tray_icon
+    import pystray
     menu = pystray.Menu(
         pystray.MenuItem("Show CaseCon", show_window, default=True),
         pystray.MenuItem("Hide CaseCon", hide_window),
         pystray.Menu.SEPARATOR,
+        pystray.MenuItem(precompute_menu_text, toggle_precompute,
+                         checked=lambda item: bool(get_setting("speculative_precompute"))),
+        pystray.MenuItem("Show latency stats", show_latency_stats),
+        pystray.MenuItem(f"Profile next {profiling.DEFAULT_OPERATIONS} operations", toggle_profiling,
+                         checked=lambda item: profiling.remaining() > 0),
+        pystray.Menu.SEPARATOR,
         pystray.MenuItem("Quit", quit_app)
     )
+    startup_trace.mark("import_pystray")
     icon_image = create_tray_icon()
+    startup_trace.mark("import_pil")
     tray_icon = pystray.Icon("CaseCon", icon_image, "CaseCon - Text Case Converter", menu)
-    threading.Thread(target=tray_icon.run, daemon=True).start()
+
+    def on_tray_ready(icon):
+        icon.visible = True
+        startup_trace.write_trace("tray_ready")
+
+    threading.Thread(target=tray_icon.run, kwargs={"setup": on_tray_ready}, daemon=True).start()
 
 tray_icon = None
 
 # -------------------- Main Window --------------------
+applog.set_level(get_setting("log_level"))
+
 root = tk.Tk()
+startup_trace.mark("tk_init")
 root.title("CaseCon")
-root.geometry("480x520")  # Fixed window size
+WINDOW_WIDTH, WINDOW_HEIGHT = 480, 520  # fits two rows of mode buttons
+BUTTON_ROW_HEIGHT = 46  # pixels added per extra row (two text lines of Courier New 12 plus borders)
+root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")  # Fixed window size; the height is raised below the button grid
 root.resizable(False, False)
 
 try:
@@ -219,6 +382,8 @@ root.protocol("WM_DELETE_WINDOW", lambda: hide_window() if get_setting("start_hi
 
 # -------------------- Notebook --------------------
 notebook = ttk.Notebook(root)
+root.grid_rowconfigure(0, weight=1)  # the notebook fills the fixed window
+root.grid_columnconfigure(0, weight=1)
 notebook.grid(row=0, column=0, columnspan=4, sticky="nsew", padx=5, pady=5)  # Added padding around notebook
 
 tab_main = tk.Frame(notebook, bg='#f0f0f0')
@@ -240,8 +405,72 @@ def on_tab_changed(event):
 notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
 
 # -------------------- Settings Tab --------------------
-settings_frame = tk.Frame(tab_settings, bg='#f0f0f0')
-settings_frame.grid(row=0, column=0, sticky="nsew", padx=20, pady=20)
+# The shortcut rows grow with every declared mode and pipeline, so the settings scroll inside the fixed window
+tab_settings.grid_rowconfigure(0, weight=1)
+tab_settings.grid_columnconfigure(0, weight=1)
+settings_canvas = tk.Canvas(tab_settings, bg='#f0f0f0', highlightthickness=0, height=1)
+settings_scroll = tk.Scrollbar(tab_settings, orient="vertical", command=settings_canvas.yview)
+settings_canvas.configure(yscrollcommand=settings_scroll.set)
+settings_canvas.grid(row=0, column=0, sticky="nsew")
+settings_scroll.grid(row=0, column=1, sticky="ns")
+
+settings_frame = tk.Frame(settings_canvas, bg='#f0f0f0', padx=15, pady=15)
+settings_canvas.create_window((0, 0), window=settings_frame, anchor="nw")
+settings_frame.bind("<Configure>", lambda e: settings_canvas.configure(
+    scrollregion=settings_canvas.bbox("all"), width=settings_frame.winfo_reqwidth()))
+
+def on_settings_wheel(event):
+    settings_canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+settings_canvas.bind("<Enter>", lambda e: settings_canvas.bind_all("<MouseWheel>", on_settings_wheel))
+settings_canvas.bind("<Leave>", lambda e: settings_canvas.unbind_all("<MouseWheel>"))
+
+# Declared modes must be in MODES before the buttons and shortcut rows are built
+def register_declared_modes():
+    errors = []
+    try:
+        set_title_style(get_setting("title_style") or None, get_setting("title_dictionary") or None)
+    except (ValueError, OSError) as e:
+        errors.append(f"Title case settings: {e}")
+    set_sentence_style(get_setting("sentence_keep_caps"), get_setting("sentence_line_breaks"))
+    try:
+        set_identifier_cells(get_setting("identifier_cells") or "")
+    except ValueError as e:
+        errors.append(str(e))
+    try:
+        set_locale(get_setting("locale"), get_setting("capital_sharp_s"))
+    except ValueError as e:
+        errors.append(str(e))
+    try:
+        set_segment_dictionary(get_setting("segment_dictionary") or None)
+    except OSError as e:
+        errors.append(f"Segment dictionary: {e}")
+    try:
+        set_slug_length(get_setting("slug_max_length"))
+    except ValueError as e:
+        errors.append(str(e))
+    try:
+        set_cleanup_steps(get_setting("cleanup_steps") or None)
+    except ValueError as e:
+        errors.append(str(e))
+    set_cleanup_first(get_setting("cleanup_first"))
+    errors += register_custom_modes(get_setting("custom_modes"))
+    errors += register_regex_modes(get_setting("regex_modes"))
+    errors += register_replace_modes(get_setting("replace_modes"))
+    errors += register_pipelines(get_setting("pipelines"))
+    set_cycle_modes(get_setting("cycle_modes"), get_setting("cycle_timeout"))  # after the modes it may name
+    try:
+        set_protected_words(get_setting("protected_words") or None, get_setting("protected_words_file") or None)
+    except OSError as e:
+        errors.append(f"Protected words: {e}")
+    for error in errors:
+        log_error(error)
+
+def get_declared_modes():
+    """{mode: spec} for every mode that comes from settings rather than MODES"""
+    return {**custom_modes, **regex_modes, **replace_modes}
+
+register_declared_modes()
 
 shortcuts = get_shortcuts()
 
@@ -256,18 +485,25 @@ default_letters = {
     "pascalcase": "P",
     "kebabcase": "K",
     "count": "C",  # Changed to C
-    "launch": "V"  # Changed to V
+    "launch": "V",  # Changed to V
+    "cycle": "X",
+    "smarttoggle": "G"
 }
 
 # Apply defaults only if shortcut is empty string
 for mode, char in default_letters.items():
     current_value = shortcuts.get(mode, "")
     if current_value == "":
-        sc = get_scancode_for_char(char) or {"U":22,"L":38,"T":20,"Z":44,"M":50,"S":31,"P":25,"K":37,"C":46,"V":47}[char]
+        sc = get_scancode_for_char(char) or {"U":22,"L":38,"T":20,"Z":44,"M":50,"S":31,"P":25,"K":37,"C":46,"V":47,"X":45,"G":34}[char]
         default_shortcut = f"{CTRL_SC}+{WIN_SC}+{ALT_SC}+{sc}"
         update_shortcut(mode, default_shortcut)
         shortcuts[mode] = default_shortcut
 
+# The style report, word stats, slugs, cleanup, declared modes and pipelines get a row too; they stay unbound
+# until the user records a key. Chains such as "cleanup+snakecase" can be added to the "shortcuts" setting by hand.
+for mode in ["stylereport", "textstats", "slugify", "cleanup", *get_declared_modes(), *get_pipelines()]:
+    shortcuts.setdefault(mode, "NONE")
+
 # Add SHORTCUTS title
 tk.Label(settings_frame, text="SHORTCUTS", bg='#f0f0f0', font=("Arial", 10, "bold")).grid(row=0, column=0, columnspan=4, sticky="w", pady=(0,5))
 
@@ -293,7 +529,7 @@ for mode, default in shortcuts.items():
     def make_reset_callback(entry=e, m=mode, default_char=default_letters.get(mode, None)):
         def reset_shortcut():
             if default_char:
-                sc = get_scancode_for_char(default_char) or {"U":22,"L":38,"T":20,"Z":44,"M":50,"S":31,"P":25,"K":37,"C":46,"V":47}[default_char]
+                sc = get_scancode_for_char(default_char) or {"U":22,"L":38,"T":20,"Z":44,"M":50,"S":31,"P":25,"K":37,"C":46,"V":47,"X":45,"G":34}[default_char]
                 default_shortcut = f"{CTRL_SC}+{WIN_SC}+{ALT_SC}+{sc}"
                 update_shortcut(m, default_shortcut)
                 entry.delete(0, tk.END)
@@ -329,7 +565,7 @@ def restore_all_shortcuts():
     """Restore all shortcuts to their default values"""
     for mode, default_char in default_letters.items():
         if default_char:
-            sc = get_scancode_for_char(default_char) or {"U":22,"L":38,"T":20,"Z":44,"M":50,"S":31,"P":25,"K":37,"C":46,"V":47}[default_char]
+            sc = get_scancode_for_char(default_char) or {"U":22,"L":38,"T":20,"Z":44,"M":50,"S":31,"P":25,"K":37,"C":46,"V":47,"X":45,"G":34}[default_char]
             default_shortcut = f"{CTRL_SC}+{WIN_SC}+{ALT_SC}+{sc}"
             
             # Update the shortcut in storage and dynamic shortcuts
@@ -364,6 +600,16 @@ start_hidden_tray_var = tk.IntVar(value=get_setting("start_hidden_tray"))
 tk.Checkbutton(settings_frame, text="Always hide in system tray", variable=start_hidden_tray_var,
                command=lambda: update_setting("start_hidden_tray", start_hidden_tray_var.get()),
                bg='#f0f0f0').grid(row=row, column=0, columnspan=2, sticky="w", pady=(5,0))
+row += 1
+
+tk.Label(settings_frame, text="CONVERSION", bg='#f0f0f0', font=("Arial", 10, "bold")).grid(row=row, column=0, columnspan=4, sticky="w", pady=(10,3))
+row += 1
+
+cleanup_first_var = tk.IntVar(value=get_setting("cleanup_first"))
+tk.Checkbutton(settings_frame, text="Clean up text before converting", variable=cleanup_first_var,
+               command=lambda: (update_setting("cleanup_first", cleanup_first_var.get()),
+                                set_cleanup_first(cleanup_first_var.get())),
+               bg='#f0f0f0').grid(row=row, column=0, columnspan=2, sticky="w", pady=(5,0))
 
 root.focus()
 
@@ -374,14 +620,18 @@ shortcut_lock = threading.Lock()
 recording_active = False
 main_hook_active = False
 count_popup_active = False  # NEW: Flag to track if count popup is active
+transformation_active = False  # True while execute_transformation sends its own Ctrl+C/Ctrl+V/Ctrl+Z
 
 # Track currently pressed keys manually
 pressed_scancodes = set()
 pressed_lock = threading.Lock()
 
+last_key_event_time = None  # time.time() of the latest event seen by the hook (hook health)
+
 # small cooldown to prevent repeated triggers while holding the keys
 last_trigger_time = 0.0
 TRIGGER_COOLDOWN = 0.35  # seconds
+SLOW_HOTKEY_MS = 2000  # hotkeys slower than this are logged as warnings
 
 def update_dynamic_shortcut(mode, shortcut_sc):
     """Thread-safe shortcut update"""
@@ -418,6 +668,9 @@ def global_key_handler(event):
     if not app_running:
         return
     
+    global last_key_event_time
+    last_key_event_time = event.time
+
     # Update our pressed keys tracking (always update – do not ignore user presses)
     with pressed_lock:
         if event.event_type == keyboard.KEY_DOWN:
@@ -434,6 +687,13 @@ def global_key_handler(event):
     if event.event_type != keyboard.KEY_DOWN:
         return
     
+    # Any real key press outside the cycle shortcut may have changed the selection
+    if not transformation_active:
+        with shortcut_lock:
+            cycle_combination = parse_shortcut_combination(dynamic_shortcuts.get("cycle"))
+        if not cycle_combination or event.scan_code not in cycle_combination:
+            invalidate_cycle()
+    
     # Check each registered shortcut
     with shortcut_lock:
         for mode, shortcut_sc in dynamic_shortcuts.items():
@@ -444,54 +704,91 @@ def global_key_handler(event):
                     # still in cooldown, ignore repeated triggers from holding the keys
                     return
                 last_trigger_time = now
+                metrics.inc("hotkey_triggers", mode=mode)
                 # Start conversion in a separate thread (non-blocking)
                 threading.Thread(
                     target=execute_transformation, 
-                    args=(mode,), 
+                    args=(mode, event.time), 
                     daemon=True
                 ).start()
                 # Schedule a quick cleanup in case some KEY_UP events were missed
                 threading.Timer(0.25, clear_pressed_scancodes).start()
                 break  # Only execute one transformation per key press
 
-def execute_transformation(mode):
-    """Execute text transformation safely. If mode == 'count' -> show popup with counts. If mode == 'launch' -> show window."""
+def run_hotkey_mode(mode):
+    """Dispatch one hotkey. If mode == 'count' -> show popup with counts. If mode == 'launch' -> show window.
+    If mode == 'cycle' -> step the selection through the 'cycle_modes' setting.
+    If mode == 'stylereport' -> show how many selected lines are in each case style.
+    If mode == 'textstats' -> show the word stats of the selection. Otherwise convert the selection."""
     global count_popup_active
+    if mode == "count":
+        if count_popup_active:
+            return  # Silently ignore if a popup is already open
+        try:
+            result = count_selected_text()
+            # --- CORRECTED LOGIC START ---
+            # Only show the popup if there is selected text (all_chars > 0)
+            if result['all_chars'] > 0:
+                def show_count_popup():
+                    global count_popup_active
+                    try:
+                        from tkinter import messagebox
+                        count_popup_active = True
+                        messagebox.showinfo(
+                            "Text Count",
+                            f"Words: {result['words']} - Letters: {result['letters']} - Characters: {result['all_chars']}",
+                            parent=root
+                        )
+                        count_popup_active = False
+                    except Exception as e:
+                        count_popup_active = False
+                        log_error(f"Failed to show count popup: {str(e)}")
+                root.after(0, show_count_popup)
+            # --- CORRECTED LOGIC END ---
+        except Exception as e:
+            count_popup_active = False
+            log_error(f"Error counting selection: {str(e)}\n{traceback.format_exc()}")
+    elif mode == "launch":
+        if root.state() == 'withdrawn':  # Only show window if it's currently hidden
+            root.after(0, show_window)  # Schedule show_window on main thread
+    elif mode == "stylereport":
+        text = count_selected_text()["text"]
+        if text.strip():
+            report = format_report(style_report(text))
+            def show_style_report():
+                from tkinter import messagebox
+                messagebox.showinfo("Case Styles", report, parent=root)
+            root.after(0, show_style_report)
+    elif mode == "textstats":
+        text = count_selected_text()["text"]
+        if text.strip():
+            report = text_stats(text)
+            root.after(0, lambda: show_stats_window(report, "Selection"))
+    elif mode == "cycle":
+        cycle_clipboard_text()
+    else:
+        convert_clipboard_text(with_cleanup(mode))
+
+def execute_transformation(mode, event_time=None):
+    """Execute a hotkey safely on its worker thread (see run_hotkey_mode).
+    event_time is the key event's time.time(); it is used to measure hook-to-finish latency."""
+    global transformation_active
+    transformation_active = True
+    if event_time:
+        # key event -> worker thread running: hook delivery, shortcut matching and thread start
+        latency.record(mode, "hook", max(0.0, (time.time() - event_time) * 1000))
     try:
-        if mode == "count":
-            if count_popup_active:
-                return  # Silently ignore if a popup is already open
-            try:
-                result = count_selected_text()
-                # --- CORRECTED LOGIC START ---
-                # Only show the popup if there is selected text (all_chars > 0)
-                if result['all_chars'] > 0:
-                    def show_count_popup():
-                        global count_popup_active
-                        try:
-                            count_popup_active = True
-                            messagebox.showinfo(
-                                "Text Count",
-                                f"Words: {result['words']} - Letters: {result['letters']} - Characters: {result['all_chars']}",
-                                parent=root
-                            )
-                            count_popup_active = False
-                        except Exception as e:
-                            count_popup_active = False
-                            log_error(f"Failed to show count popup: {str(e)}")
-                    root.after(0, show_count_popup)
-                # --- CORRECTED LOGIC END ---
-            except Exception as e:
-                count_popup_active = False
-                log_error(f"Error counting selection: {str(e)}\n{traceback.format_exc()}")
-        elif mode == "launch":
-            if root.state() == 'withdrawn':  # Only show window if it's currently hidden
-                root.after(0, show_window)  # Schedule show_window on main thread
-        else:
-            convert_clipboard_text(mode)
+        with profiling.profile(f"hotkey_{mode}"):
+            run_hotkey_mode(mode)
     except Exception as e:
-        log_error(f"Error executing transformation for {mode}: {str(e)}")
+        log_error(f"Error executing transformation for {mode}: {str(e)}", mode=mode)
     finally:
+        transformation_active = False
+        if event_time:
+            total_ms = max(0.0, (time.time() - event_time) * 1000)
+            latency.record(mode, "total", total_ms)
+            if total_ms > SLOW_HOTKEY_MS:
+                applog.log(applog.WARNING, "Slow hotkey", mode=mode, phase="total", duration_ms=round(total_ms, 1))
         clear_pressed_scancodes()
 
 def initialize_global_hook():
@@ -521,12 +818,52 @@ def complete_shutdown():
     global app_running
     app_running = False
     cleanup_global_hook()
+    metrics.stop()
+    if regex_modes:
+        import regexrules
+        regexrules.shutdown()
+    startup_trace.write_trace()  # no-op unless tracing and the tray never came up
+    try:
+        instance_listener.close()
+    except Exception:
+        pass
 
 # Register cleanup on exit
 atexit.register(complete_shutdown)
 
+# -------------------- Metrics (opt-in) --------------------
+metrics.register_gauge("hook_active", "1 while the global keyboard hook is installed",
+                       lambda: 1 if main_hook_active else 0)
+metrics.register_gauge("hook_seconds_since_last_event", "Seconds since the hook last saw a key event",
+                       lambda: None if last_key_event_time is None else round(time.time() - last_key_event_time, 3))
+
+def apply_regex_setting():
+    """Start the regex helper process early so the first regex hotkey does not pay for it"""
+    if not regex_modes:
+        return
+    def warm_up():
+        try:
+            import regexrules
+            regexrules.warm_up()
+        except Exception as e:
+            log_error(f"Failed to start the regex helper: {str(e)}")
+    threading.Thread(target=warm_up, daemon=True).start()
+
+def apply_metrics_setting():
+    """Start the localhost endpoint ('metrics_port') and/or file writer ('metrics_file') if configured"""
+    try:
+        if get_setting("metrics_port"):
+            port = metrics.start_server(get_setting("metrics_port"))
+            log_info(f"Metrics served on http://127.0.0.1:{port}/metrics")
+        if get_setting("metrics_file"):
+            metrics.start_file_writer(get_setting("metrics_file"),
+                                      get_setting("metrics_interval") or metrics.DEFAULT_FILE_INTERVAL)
+    except Exception as e:
+        log_error(f"Failed to start metrics: {str(e)}")
+
 # Initialize the global hook
 initialize_global_hook()
+startup_trace.mark("hook_installed")
 
 # -------------------- RECORDING SYSTEM --------------------
 current_entry = None
@@ -686,8 +1023,15 @@ buttons = [
     ("MACRO_CASE", "macrocase"),
     ("snake_case", "snakecase"),
     ("PascalCase", "pascalcase"),
-    ("kebab-case", "kebabcase")
+    ("kebab-case", "kebabcase"),
+    ("Smart\ntoggle", "smarttoggle"),
+    ("url-slug", "slugify"),
+    ("Clean up", "cleanup")
 ]
+buttons += [(spec.get("label", mode), mode) for mode, spec in get_declared_modes().items()]
+button_rows = (len(buttons) + 3) // 4
+# Grow the fixed window with the button grid so the text box below it is never pushed out of view
+root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT + max(0, button_rows - 2) * BUTTON_ROW_HEIGHT}")
 
 btn_widgets = []
 for idx, (text, mode) in enumerate(buttons):
@@ -704,13 +1048,14 @@ for i in range(4):
 
 # --- Counts + Buttons Row (centered and properly spaced) ---
 counts_frame = tk.Frame(main_frame, bg='#f0f0f0')
-counts_frame.grid(row=2, column=0, columnspan=4, pady=(15, 10), sticky="ew")  # Better vertical spacing
+counts_frame.grid(row=button_rows, column=0, columnspan=4, pady=(15, 10), sticky="ew")  # Better vertical spacing
 
 # Updated grid configuration to accommodate 4 buttons and flexible label
 counts_frame.grid_columnconfigure(0, weight=0)  # Copy button
 counts_frame.grid_columnconfigure(1, weight=0)  # Reset button
 counts_frame.grid_columnconfigure(2, weight=0)  # Delete button
-counts_frame.grid_columnconfigure(3, weight=1)  # Status label (flexible width)
+counts_frame.grid_columnconfigure(3, weight=0)  # Stats button
+counts_frame.grid_columnconfigure(4, weight=1)  # Status label (flexible width)
 
 copy_btn = tk.Button(counts_frame, text="Copy", width=5, command=lambda: copy_text())
 copy_btn.grid(row=0, column=0, padx=(0,3), sticky="w")
@@ -720,7 +1065,10 @@ reset_btn.grid(row=0, column=1, padx=(0,3), sticky="w")
 
 # NEW: Delete button
 delete_btn = tk.Button(counts_frame, text="✕", width=3, fg="red", command=lambda: delete_text())
-delete_btn.grid(row=0, column=2, padx=(0,6), sticky="w")
+delete_btn.grid(row=0, column=2, padx=(0,3), sticky="w")
+
+stats_btn = tk.Button(counts_frame, text="Stats", width=5, command=lambda: show_text_box_stats())
+stats_btn.grid(row=0, column=3, padx=(0,6), sticky="w")
 
 # Fixed-width label with click functionality for large numbers
 status_label = tk.Label(
@@ -733,7 +1081,7 @@ status_label = tk.Label(
     cursor="hand2",                  # Show hand cursor to indicate clickable
     wraplength=300                   # Wrap text if it exceeds this width
 )
-status_label.grid(row=0, column=3, sticky="w")
+status_label.grid(row=0, column=4, sticky="w")
 
 # Store original counts for popup display
 original_counts = {"words": 0, "letters": 0, "all_chars": 0}
@@ -747,6 +1095,7 @@ def format_number_with_limit(num, limit=3):
 
 def show_full_counts():
     """Show popup with full count numbers when status label is clicked"""
+    from tkinter import messagebox
     messagebox.showinfo(
         "Full Text Count",
         f"Words: {original_counts['words']}\n"
@@ -758,18 +1107,40 @@ def show_full_counts():
 # Bind click event to status label
 status_label.bind("<Button-1>", lambda e: show_full_counts())
 
+def show_stats_window(report, source):
+    """Stats view: word frequencies, word pairs, repeated phrases and longest words in a scrollable window"""
+    from textstats import format_stats
+    window = tk.Toplevel(root)
+    window.title(f"Word Stats - {source}")
+    window.configure(bg='#f0f0f0')
+    window.grid_columnconfigure(0, weight=1)
+    window.grid_rowconfigure(0, weight=1)
+    view = tk.Text(window, height=30, width=60, font=("Consolas", 10), wrap="none")
+    view.grid(row=0, column=0, sticky="nsew")
+    view_scroll = tk.Scrollbar(window, orient="vertical", command=view.yview)
+    view_scroll.grid(row=0, column=1, sticky="ns")
+    view.config(yscrollcommand=view_scroll.set)
+    view.insert("1.0", format_stats(report))
+    view.config(state="disabled")  # read-only, but still selectable for copying
+
+def show_text_box_stats():
+    try:
+        show_stats_window(text_stats(TextBox.get("1.0", "end-1c")), "Text box")
+    except Exception as e:
+        log_error(f"Failed to show word stats: {str(e)}\n{traceback.format_exc()}")
+
 # --- Text Box with Scrollbars ---
 TextBox = tk.Text(main_frame, height=20, width=58, font=("Consolas", 10), wrap="none")  # wrap="none" allows horizontal scroll
-TextBox.grid(row=3, column=0, columnspan=4, pady=(5,0), sticky="nsew")
+TextBox.grid(row=button_rows + 1, column=0, columnspan=4, pady=(5,0), sticky="nsew")
 
 # Vertical scrollbar
 text_scroll_y = tk.Scrollbar(main_frame, orient="vertical", command=TextBox.yview)
-text_scroll_y.grid(row=3, column=4, sticky="ns")
+text_scroll_y.grid(row=button_rows + 1, column=4, sticky="ns")
 TextBox.config(yscrollcommand=text_scroll_y.set)
 
 # Horizontal scrollbar
 text_scroll_x = tk.Scrollbar(main_frame, orient="horizontal", command=TextBox.xview)
-text_scroll_x.grid(row=4, column=0, columnspan=4, sticky="ew")
+text_scroll_x.grid(row=button_rows + 2, column=0, columnspan=4, sticky="ew")
 TextBox.config(xscrollcommand=text_scroll_x.set)
 
 # Configure main_frame grid weights for proper expansion
@@ -777,7 +1148,7 @@ main_frame.grid_columnconfigure(0, weight=1)
 main_frame.grid_columnconfigure(1, weight=1)
 main_frame.grid_columnconfigure(2, weight=1)
 main_frame.grid_columnconfigure(3, weight=1)
-main_frame.grid_rowconfigure(3, weight=1)  # TextBox expands vertically
+main_frame.grid_rowconfigure(button_rows + 1, weight=1)  # TextBox expands vertically
 
 # -------------------- Reset / Copy / Delete / typing tracking --------------------
 # Undo history system
@@ -837,13 +1208,9 @@ def undo_text():
     except Exception:
         content = ""
     
-    words = len(content.split())
-    letters = sum(c.isalpha() for c in content)
-    all_chars = len(content)
-    
-    original_counts["words"] = words
-    original_counts["letters"] = letters
-    original_counts["all_chars"] = all_chars
+    counts = count_text(content)
+    words, letters, all_chars = counts["words"], counts["letters"], counts["all_chars"]
+    original_counts.update(counts)
     
     words_display = format_number_with_limit(words)
     letters_display = format_number_with_limit(letters)
@@ -901,14 +1268,11 @@ def update_counts_and_user_state(event=None):
         history_index = -1  # Reset to latest state
     
     # Update counters
-    words = len(content.split())
-    letters = sum(c.isalpha() for c in content)
-    all_chars = len(content)
+    counts = count_text(content)
+    words, letters, all_chars = counts["words"], counts["letters"], counts["all_chars"]
     
     # Store original counts for popup
-    original_counts["words"] = words
-    original_counts["letters"] = letters
-    original_counts["all_chars"] = all_chars
+    original_counts.update(counts)
     
     # Format numbers with digit limit
     words_display = format_number_with_limit(words)
@@ -942,6 +1306,16 @@ TextBox.bind("<Control-v>", on_paste_event)
 TextBox.bind("<Control-V>", on_paste_event)
 
 def convert(mode):
+    try:
+        with profiling.profile(f"gui_{mode}"):
+            convert_textbox(mode)
+    except Exception as e:
+        # e.g. a regex mode that ran past its time budget
+        log_error(f"Error converting text box ({mode}): {str(e)}", mode=mode)
+        from tkinter import messagebox
+        messagebox.showwarning("Conversion failed", str(e), parent=root)
+
+def convert_textbox(mode):
     """Transform text but preserve original input before transformation (saved into original_text)."""
     global original_text, last_user_nonempty, history_index
     try:
@@ -955,7 +1329,7 @@ def convert(mode):
         if original_text is None:
             original_text = content
     
-    result = transform_text(content, mode)
+    result = transform_text(content, with_cleanup(mode))
     TextBox.delete("1.0", "end")
     TextBox.insert("1.0", result)
     
@@ -969,8 +1343,62 @@ def convert(mode):
 # Initial count update
 update_counts_and_user_state()
 
+# -------------------- Forwarded commands (single instance) --------------------
+def reload_settings():
+    """Re-read settings.json into the running hooks and the Settings tab"""
+    register_declared_modes()
+    apply_regex_setting()
+    fresh_shortcuts = get_shortcuts()
+    for mode, shortcut_sc in fresh_shortcuts.items():
+        update_dynamic_shortcut(mode, shortcut_sc)
+        entry = entry_widgets.get(mode)
+        if entry is None or entry == current_entry:
+            continue  # new mode without a row, or the user is recording it right now
+        try:
+            display_text = '+'.join(get_key_name(int(sc)) for sc in shortcut_sc.split('+'))
+        except:
+            display_text = "NONE"
+        entry.delete(0, tk.END)
+        entry.insert(0, display_text)
+    start_with_windows_var.set(get_setting("start_with_windows"))
+    start_hidden_tray_var.set(get_setting("start_hidden_tray"))
+    apply_precompute_setting()
+    apply_profile_setting()
+    applog.set_level(get_setting("log_level"))
+
+def run_file_conversion(mode, path):
+    try:
+        convert_file(path, mode)
+    except Exception as e:
+        log_error(f"Failed to convert file {path} ({mode}): {str(e)}\n{traceback.format_exc()}")
+
+def run_file_stats(path):
+    try:
+        report = file_stats(path)
+        root.after(0, lambda: show_stats_window(report, os.path.basename(path)))
+    except Exception as e:
+        log_error(f"Failed to analyze file {path}: {str(e)}\n{traceback.format_exc()}")
+
+def handle_instance_command(command):
+    """Dispatch a command from a second launch. Runs on the listener thread, so it only schedules work."""
+    if not command:
+        return "error: empty command"
+    name = command[0]
+    if name == "show":
+        root.after(0, show_window)
+    elif name == "reload":
+        root.after(0, reload_settings)
+    elif name == "convert" and len(command) == 3:
+        threading.Thread(target=run_file_conversion, args=(command[1], command[2]), daemon=True).start()
+    elif name == "stats" and len(command) == 2:
+        threading.Thread(target=run_file_stats, args=(command[1],), daemon=True).start()
+    else:
+        return f"error: unknown command {command!r}"
+    return "ok"
+
 # -------------------- Setup Tray --------------------
-setup_tray()
+# Deferred until the event loop is idle: pystray and PIL are not needed for hook-ready
+root.after_idle(setup_tray)
 
 # --- CORRECTED INITIAL SETUP LOGIC ---
 # Check the desired startup state from the settings file
@@ -987,6 +1415,29 @@ else:
 if get_setting("start_hidden_tray"):
     hide_window()
 
+apply_precompute_setting()
+apply_profile_setting()
+apply_metrics_setting()
+apply_regex_setting()
+
+# Listen for later launches, then apply our own launch command ("show" is already covered above)
+serve_commands(instance_listener, handle_instance_command, on_error=log_error)
+if launch_command[0] != "show":
+    handle_instance_command(launch_command)
+
+def report_ready_and_quit():
+    """--exit-when-ready: tell the startup benchmark we got here, then shut down"""
+    elapsed_ms = (time.perf_counter() - startup_t0) * 1000
+    if sys.stdout:
+        print(f"CASECON_READY {elapsed_ms:.1f}", flush=True)
+    startup_trace.write_trace("ready")
+    quit_app()
+
+if launch_args.exit_when_ready:
+    root.after(0, report_ready_and_quit)
+
+startup_trace.mark("window_built")
+
 # -------------------- Run --------------------
 try:
     root.mainloop()
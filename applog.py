@@ -0,0 +1,87 @@
+"""
+Asynchronous application log for CaseCon.
+Callers only put records on a queue; a QueueListener thread formats them and
+writes casecon_error.log with size-based rotation, so logging never blocks the
+keyboard hook or the clipboard path. `logging` itself is imported on first use
+to keep it off the start-up path of a forwarding second instance.
+"""
+import atexit
+import threading
+
+LOG_FILE = "casecon_error.log"
+MAX_BYTES = 1_000_000
+BACKUP_COUNT = 3
+
+# Same values as the logging module, usable without importing it
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+
+# Extra fields appended as key=value after the message when present
+STRUCTURED_FIELDS = ("mode", "phase", "duration_ms")
+
+_logger = None
+_listener = None
+_level = INFO
+_start_lock = threading.Lock()
+
+
+def _start(path):
+    global _logger, _listener
+    import logging
+    import logging.handlers
+    import queue
+
+    class StructuredFormatter(logging.Formatter):
+        def format(self, record):
+            line = super().format(record)
+            fields = [f"{name}={getattr(record, name)}" for name in STRUCTURED_FIELDS if hasattr(record, name)]
+            return f"{line} | {' '.join(fields)}" if fields else line
+
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT,
+                                                        encoding="utf-8", delay=True)
+    file_handler.setFormatter(StructuredFormatter("[%(asctime)s] %(levelname)s %(message)s", "%Y-%m-%d %H:%M:%S"))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+
+    logger = logging.getLogger("casecon")
+    logger.propagate = False
+    logger.setLevel(_level)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _listener = listener
+    _logger = logger
+    atexit.register(shutdown)
+
+
+def set_level(level):
+    """Accepts a level number or a name such as "DEBUG"; unknown values fall back to INFO"""
+    global _level
+    if isinstance(level, str):
+        level = LEVELS.get(level.upper(), INFO)
+    _level = level or INFO
+    if _logger is not None:
+        _logger.setLevel(_level)
+
+
+def log(level, message, path=LOG_FILE, **fields):
+    """Queue a record. `fields` (mode, phase, duration_ms) are written as key=value pairs."""
+    if level < _level:
+        return
+    if _logger is None:
+        with _start_lock:
+            if _logger is None:
+                try:
+                    _start(path)
+                except Exception:
+                    return
+    _logger.log(level, message, extra=fields)
+
+
+def shutdown():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
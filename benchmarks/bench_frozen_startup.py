@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Frozen start-up benchmark for CaseCon
+Launches the onefile and onedir builds with --exit-when-ready and start-up
+tracing on, then compares time to hook-ready taken from each trace file.
+
+Build both first:
+    python build_exe.py
+    python build_exe.py --onedir
+Close any running CaseCon first (the single-instance guard would forward the launch).
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+VARIANTS = {
+    "onefile": ROOT / "installer_files" / "CaseCon.exe",
+    "onedir": ROOT / "installer_files" / "onedir" / "CaseCon" / "CaseCon.exe",
+}
+
+# "    123.4 ms     +5.6 ms  label" as written by startup_trace.write_trace
+TRACE_LINE = re.compile(r"\s*([\d.]+) ms\s+[+-][\d.]+ ms\s+(\S+)")
+
+
+def parse_trace(path):
+    """Return {label: ms since the earliest milestone} for the last run in the file"""
+    marks = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                marks = {}
+                continue
+            match = TRACE_LINE.match(line)
+            if match:
+                marks[match.group(2)] = float(match.group(1))
+    return marks
+
+
+def run_once(exe):
+    """Launch once; returns (wall ms until the process exits, trace marks)"""
+    fd, trace_path = tempfile.mkstemp(suffix=".log", prefix="casecon_trace_")
+    os.close(fd)
+    env = dict(os.environ, CASECON_TRACE_STARTUP="1", CASECON_TRACE_FILE=trace_path)
+    try:
+        start = time.perf_counter()
+        subprocess.run([str(exe), "--exit-when-ready"], env=env, timeout=120)
+        wall_ms = (time.perf_counter() - start) * 1000
+        marks = parse_trace(trace_path)
+    finally:
+        os.remove(trace_path)
+    if "hook_installed" not in marks:
+        raise RuntimeError(f"{exe} did not write a start-up trace. Is another CaseCon instance running?")
+    return wall_ms, marks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare onefile and onedir cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    summary = {}
+    for name, exe in VARIANTS.items():
+        if not exe.exists():
+            print(f"✗ {name}: {exe} not found, build it first")
+            continue
+        print(f"\n{name}: {exe}")
+        hook_times = []
+        wall_times = []
+        last_marks = {}
+        for i in range(args.runs):
+            wall_ms, marks = run_once(exe)
+            wall_times.append(wall_ms)
+            hook_times.append(marks["hook_installed"])
+            last_marks = marks
+            print(f"  run {i + 1}: hook ready at {marks['hook_installed']:8.1f} ms, process exited after {wall_ms:8.1f} ms")
+        print("  milestones (last run):")
+        for label, ms in sorted(last_marks.items(), key=lambda kv: kv[1]):
+            print(f"    {ms:10.1f} ms  {label}")
+        summary[name] = (hook_times[0], statistics.median(hook_times), statistics.median(wall_times))
+
+    if not summary:
+        sys.exit(1)
+    print("\n" + "=" * 60)
+    print(f"{'variant':<10}{'first run':>14}{'median hook':>16}{'median exit':>16}")
+    for name, (first_ms, median_ms, wall_ms) in summary.items():
+        print(f"{name:<10}{first_ms:>11.1f} ms{median_ms:>13.1f} ms{wall_ms:>13.1f} ms")
+    if len(summary) == 2:
+        onefile, onedir = summary["onefile"][1], summary["onedir"][1]
+        print(f"\nonedir reaches hook-ready {onefile - onedir:+.1f} ms sooner than onefile (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for CaseCon
+Launches GUI.py under -X importtime until the global hook is installed,
+prints the slowest top-level imports and fails when start-up exceeds the budget.
+
+Close any running CaseCon first: the single-instance guard would otherwise
+forward the launch and the benchmark would never see the app become ready.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GUI_SCRIPT = ROOT / "GUI.py"
+READY_PREFIX = "CASECON_READY"
+DEFAULT_BUDGET_MS = 1500
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr_text):
+    """Return {module: cumulative_us} for top-level imports only"""
+    imports = {}
+    for line in stderr_text.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            imports[match.group(4)] = int(match.group(2))
+    return imports
+
+
+def run_once(python):
+    """Launch once; returns (wall_ms to ready line, in-process ms, imports)"""
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as err:
+        start = time.perf_counter()
+        # stderr goes to a file: -X importtime output can fill a pipe and stall the child
+        proc = subprocess.Popen(
+            [python, "-X", "importtime", str(GUI_SCRIPT), "--exit-when-ready"],
+            stdout=subprocess.PIPE, stderr=err, text=True, cwd=ROOT,
+        )
+        wall_ms = None
+        in_process_ms = None
+        for line in proc.stdout:
+            if line.startswith(READY_PREFIX):
+                wall_ms = (time.perf_counter() - start) * 1000
+                in_process_ms = float(line.split()[1])
+                break
+        proc.wait(timeout=60)
+        err.seek(0)
+        imports = parse_importtime(err.read())
+
+    if wall_ms is None:
+        raise RuntimeError("GUI.py exited without reporting ready. Is another CaseCon instance running?")
+    return wall_ms, in_process_ms, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CaseCon cold start to hook-ready")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("CASECON_STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)),
+                        help="fail when the median wall time to hook-ready exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="number of slow imports to list")
+    parser.add_argument("--python", default=sys.executable)
+    args = parser.parse_args()
+
+    wall_times = []
+    in_process_times = []
+    first_imports = None
+    for i in range(args.runs):
+        wall_ms, in_process_ms, imports = run_once(args.python)
+        wall_times.append(wall_ms)
+        in_process_times.append(in_process_ms)
+        if first_imports is None:
+            first_imports = imports
+        print(f"run {i + 1}: {wall_ms:8.1f} ms to ready ({in_process_ms:.1f} ms inside GUI.py)")
+
+    median_ms = statistics.median(wall_times)
+    print("=" * 50)
+    print(f"first (cold) run: {wall_times[0]:.1f} ms")
+    print(f"median:           {median_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"median in GUI.py: {statistics.median(in_process_times):.1f} ms")
+
+    print(f"\nSlowest top-level imports (first run, cumulative):")
+    for module, us in sorted(first_imports.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {module}")
+
+    if median_ms > args.budget_ms:
+        print(f"\n✗ Startup regressed: {median_ms:.1f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print("\n✓ Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Transform benchmark suite for CaseCon
+Runs every MODES entry, transform_text and the counting code over deterministic
+synthetic corpora, records throughput and peak memory as JSON and compares the
+run against a stored baseline.
+
+Examples:
+    python benchmarks/bench_transforms.py
+    python benchmarks/bench_transforms.py --sizes 1KB,1MB,500MB --corpora identifiers
+    python benchmarks/bench_transforms.py --save-baseline
+    python benchmarks/bench_transforms.py --threshold 0.15   # fail on >15% regressions
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import graphemes  # noqa: E402  (needs the repo root on sys.path)
+import multireplace  # noqa: E402
+import protectedwords  # noqa: E402
+import regexrules  # noqa: E402
+import sentencestyle  # noqa: E402
+import slugs  # noqa: E402
+import styledetect  # noqa: E402
+import textstats  # noqa: E402
+import titlestyle  # noqa: E402
+import wordsegment  # noqa: E402
+import textcore  # noqa: E402
+
+DEFAULT_SIZES = "1KB,64KB,1MB,16MB"
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "transforms.json"
+DEFAULT_BASELINE = ROOT / "benchmarks" / "transform_baseline.json"
+DEFAULT_THRESHOLD = 0.10
+BLOCK_CHARS = 1 << 20  # corpora are built from one deterministic 1 MiB block
+SEED = 1234
+MIN_TIMED_SECONDS = 0.2
+MIN_SAMPLE_SECONDS = 0.02
+
+UNITS = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+# -------------------- Corpus generators --------------------
+PROSE_WORDS = ("the quick brown fox jumps over lazy dog while an editor reviews every line of "
+               "this document before it is published to readers across many different teams").split()
+UNICODE_WORDS = ["café", "naïve", "façade", "İstanbul", "ıslak", "straße", "ĳssel", "Ελληνικά", "λόγος",
+                 "ΟΔΟΣ", "Привет", "мир", "Ærø", "Łódź", "日本語", "テキスト", "한국어", "emoji😀",
+                 "👩‍💻", "🇺🇸", "é", "Ñandú", "ǅemal", "ﬁnance"]
+IDENTIFIER_PARTS = ["user", "id", "http", "server", "request", "max", "retry", "count", "get", "by",
+                    "email", "address", "api", "key", "json", "parser", "xml", "config", "value", "list"]
+TITLE_WORDS = ["How", "to", "Build", "a", "Fast", "Parser", "in", "Python", "Café", "Crème", "Brûlée", "Déjà",
+               "Vu", "Straße", "Ærø", "Łódź", "Søren", "Kierkegaard", "Привет", "мир", "Новости", "Київ",
+               "Ελληνικά", "Ιστορία", "日本語", "ガイド", "C++", "&", "Q&A:", "2024", "—", "(Part", "2)", "Top-10",
+               "Tips!", "What's", "New?"]
+LOG_LEVELS = ["DEBUG", "INFO", "INFO", "INFO", "WARN", "ERROR"]
+WHITESPACE = [" ", "  ", "\t", "\n", "\r\n", " \t ", " ", " ", "　", "      \n\n\t"]
+
+
+def _ascii_prose(rng):
+    words = [rng.choice(PROSE_WORDS) for _ in range(rng.randint(6, 18))]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice([". ", "! ", "? ", ".\n"])
+
+
+def _unicode_mixed(rng):
+    return " ".join(rng.choice(UNICODE_WORDS) for _ in range(rng.randint(4, 12))) + rng.choice([". ", "\n"])
+
+
+def _identifier(rng):
+    parts = [rng.choice(IDENTIFIER_PARTS) for _ in range(rng.randint(1, 4))]
+    style = rng.randrange(6)
+    if style == 0:
+        ident = "_".join(parts)
+    elif style == 1:
+        ident = parts[0] + "".join(p.capitalize() for p in parts[1:])
+    elif style == 2:
+        ident = "".join(p.capitalize() for p in parts)
+    elif style == 3:
+        ident = "_".join(parts).upper()
+    elif style == 4:
+        ident = "-".join(parts)
+    else:
+        ident = "".join(p.upper() if p in ("http", "api", "json", "xml", "id") else p.capitalize() for p in parts)
+    return ident + rng.choice([" ", "\n", ", "])
+
+
+def _title(rng):
+    return " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(3, 12))) + "\n"
+
+
+def _log_line(rng):
+    return (f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:"
+            f"{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d}Z "
+            f"{rng.choice(LOG_LEVELS):<5} [worker-{rng.randint(1, 16)}] "
+            f"request_id={rng.getrandbits(64):016x} GET /api/v1/users/{rng.randint(1, 99999)} "
+            f"status={rng.choice([200, 200, 201, 404, 500])} dur={rng.randint(1, 2000)}ms\n")
+
+
+def _pathological_whitespace(rng):
+    return rng.choice(["a", "Word", "x1", "É", ""]) + "".join(rng.choice(WHITESPACE) for _ in range(rng.randint(1, 40)))
+
+
+CORPORA = {
+    "ascii_prose": _ascii_prose,
+    "unicode_mixed": _unicode_mixed,
+    "identifiers": _identifier,
+    "titles": _title,
+    "log_lines": _log_line,
+    "whitespace": _pathological_whitespace,
+}
+
+
+def generate_corpus(name, size):
+    """Deterministic text of exactly `size` characters"""
+    rng = random.Random(f"{SEED}-{name}")
+    piece = CORPORA[name]
+    parts = []
+    length = 0
+    target = min(size, BLOCK_CHARS)
+    while length < target:
+        part = piece(rng)
+        parts.append(part)
+        length += len(part)
+    block = "".join(parts)[:target]
+    if size <= len(block):
+        return block
+    repeats, remainder = divmod(size, len(block))
+    return block * repeats + block[:remainder]
+
+
+# -------------------- Operations --------------------
+# Custom modes covering each renderer specialization (single join+case, per-word case, acronyms)
+BENCH_CUSTOM_MODES = {
+    "custom_dotcase": {"separator": ".", "first": "lower"},
+    "custom_traincase": {"separator": "-", "first": "capitalize"},
+    "custom_camelcase": {"separator": "", "first": "lower", "rest": "capitalize", "acronyms": "preserve"},
+}
+
+# Regex rules: "mode:" runs them through the helper process (IPC included), "regex_rules:" in-process
+SQL_KEYWORD_RULES = [
+    {"pattern": r"\b(select|from|where|join|group by|order by|insert|update|delete|values)\b",
+     "flags": "i", "case": "upper"},
+]
+BENCH_REGEX_MODES = {
+    "regex_sqlkeywords": {"rules": SQL_KEYWORD_RULES, "timeout_ms": 60_000},
+}
+
+RENAME_TERM_COUNT = 2000
+
+
+def rename_terms(count=RENAME_TERM_COUNT):
+    """Deterministic old -> new pairs built from the identifier vocabulary (some hit the corpora)"""
+    rng = random.Random(f"{SEED}-rename")
+    terms = {}
+    while len(terms) < count:
+        old = " ".join(rng.choice(IDENTIFIER_PARTS) for _ in range(rng.randint(1, 3)))
+        terms.setdefault(old, f"{old} v{len(terms)}")
+    return terms
+
+
+def get_operations():
+    """name -> callable(text) for everything the suite measures"""
+    textcore.register_custom_modes(BENCH_CUSTOM_MODES)
+    textcore.register_regex_modes(BENCH_REGEX_MODES)
+    operations = {f"mode:{mode}": func for mode, func in textcore.MODES.items()}
+    operations["transform_text:uppercase"] = lambda text: textcore.transform_text(text, "uppercase")
+    operations["count_text"] = textcore.count_text
+    operations["graphemes:count"] = graphemes.count
+    operations["style_report"] = styledetect.style_report
+    # Word stats: exact counters, and the same text with counters that switch to the sketch almost at once
+    operations["textstats:analyze"] = textstats.analyze_text
+    operations["textstats:sketched"] = lambda text: textstats.analyze_text(text, exact_limit=1_000)
+    # Locale-aware casing next to the mode:uppercase / mode:titlecase built-ins
+    for locale, mode in [("tr", "uppercase"), ("tr", "titlecase"), ("lt", "lowercase"), ("el", "uppercase"),
+                         ("nl", "titlecase")]:
+        operations[f"locale:{locale}:{mode}"] = textcore.localized_mode(mode, locale)
+    operations["locale:de_capital_sharp_s:uppercase"] = textcore.localized_mode("uppercase", "de", True)
+    # Same engine with and without a 100k-entry brand dictionary: the difference should be noise
+    for style in titlestyle.STYLES:
+        operations[f"titlestyle:{style}"] = titlestyle.make_title_case(style)
+    operations["titlestyle:chicago_100k_dictionary"] = titlestyle.make_title_case(
+        "chicago", titlestyle.load_dictionary(f"Brand{i}X" for i in range(100_000)))
+    operations["sentencestyle:keep_caps"] = sentencestyle.make_sentence_case(keep_caps=True)
+    sentence_case = textcore.MODES["sentencecase"]
+    operations["sentencestyle:stream_1MiB_chunks"] = lambda text: "".join(sentencestyle.stream_sentence_case(
+        (text[i:i + BLOCK_CHARS] for i in range(0, len(text), BLOCK_CHARS)), sentence_case))
+    # One dict lookup per word: 50k entries should cost the same as a handful
+    operations["protectedwords:50k_entries"] = protectedwords.make_protector(protectedwords.compile_words(
+        [f"Brand{i}X" for i in range(50_000)] + ["API", "HTTPServer", "iPhone", "GitHub"]))
+    operations["protectedwords:4_entries"] = protectedwords.make_protector(protectedwords.compile_words(
+        ["API", "HTTPServer", "iPhone", "GitHub"]))
+    # Every single-case word of 4+ letters goes through the memory-mapped word list and the DP
+    word_list = Path(tempfile.mkdtemp()) / "words.txt"
+    word_list.write_text("\n".join([*PROSE_WORDS, *IDENTIFIER_PARTS]), encoding="utf-8")
+    operations["wordsegment:segment_text"] = wordsegment.make_text_segmenter(
+        wordsegment.load_segmenter(str(word_list), str(word_list.with_suffix(".seg"))))
+    # Title lists for slugs: mode:slugify has no length limit, this one trims every line to 60 characters
+    operations["slugs:max_length_60"] = slugs.make_slugify(60)
+    compiled_rules = regexrules.compile_rules(SQL_KEYWORD_RULES)
+    operations["regex_rules:sqlkeywords"] = lambda text: regexrules.apply_rules(compiled_rules, text)
+    operations[f"multireplace:{RENAME_TERM_COUNT}terms"] = multireplace.compile_replacer(rename_terms())
+    operations["pipeline:trim,collapsewhitespace,snakecase,uppercase"] = textcore.compile_pipeline(
+        ["trim", "collapsewhitespace", "snakecase", "uppercase"])
+    # Cleanup steps fused in front of a mode vs the same steps as separate passes
+    operations["chain:cleanup+uppercase"] = lambda text: textcore.transform_text(text, "cleanup+uppercase")
+    cleanup_passes = [textcore.MODES[step] for step in textcore.DEFAULT_CLEANUP_STEPS] + [str.upper]
+
+    def one_by_one(text):
+        for func in cleanup_passes:
+            text = func(text)
+        return text
+    operations["chain:cleanup,uppercase_one_by_one"] = one_by_one
+    return operations
+
+
+# -------------------- Measurement --------------------
+def parse_size(label):
+    label = label.strip().upper()
+    for unit, factor in UNITS.items():
+        if label.endswith(unit):
+            return int(float(label[:-len(unit)]) * factor)
+    return int(label)
+
+
+def time_operation(func, text, max_repeats):
+    """
+    Best per-call wall time over up to `max_repeats` samples. Small inputs are
+    looped inside each sample (like timeit) so a sample lasts at least MIN_SAMPLE_SECONDS.
+    """
+    start = time.perf_counter()
+    func(text)
+    first = time.perf_counter() - start
+    number = max(1, int(MIN_SAMPLE_SECONDS / first)) if first > 0 else 1000
+    best = first
+    spent = first
+    for _ in range(max_repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(text)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed / number)
+        spent += elapsed
+        if spent >= MIN_TIMED_SECONDS:
+            break
+    return best
+
+
+def peak_memory(func, text):
+    """Peak bytes allocated while running func(text) once"""
+    tracemalloc.start()
+    try:
+        func(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(corpora, sizes, operations, max_repeats, measure_memory):
+    results = {}
+    for corpus in corpora:
+        for size_label in sizes:
+            text = generate_corpus(corpus, parse_size(size_label))
+            for op_name, func in operations.items():
+                key = f"{corpus}/{size_label}/{op_name}"
+                seconds = time_operation(func, text, max_repeats)
+                entry = {
+                    "chars": len(text),
+                    "seconds": seconds,
+                    "mchars_per_s": len(text) / seconds / 1e6 if seconds else float("inf"),
+                }
+                if measure_memory:
+                    entry["peak_mb"] = peak_memory(func, text) / (1 << 20)
+                results[key] = entry
+                memory = f"{entry['peak_mb']:9.2f} MB" if measure_memory else ""
+                print(f"{key:<55}{entry['mchars_per_s']:10.1f} Mchar/s {memory}")
+            del text
+    return results
+
+
+# -------------------- Baseline comparison --------------------
+def compare(results, baseline, threshold):
+    """Return a list of regression messages (slower throughput or higher peak memory than allowed)"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        if current["mchars_per_s"] < previous["mchars_per_s"] * (1 - threshold):
+            regressions.append(f"{key}: throughput {previous['mchars_per_s']:.1f} -> "
+                               f"{current['mchars_per_s']:.1f} Mchar/s")
+        if "peak_mb" in current and "peak_mb" in previous and previous["peak_mb"] > 0.01:
+            if current["peak_mb"] > previous["peak_mb"] * (1 + threshold):
+                regressions.append(f"{key}: peak memory {previous['peak_mb']:.2f} -> {current['peak_mb']:.2f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CaseCon transforms and counting")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated, e.g. 1KB,1MB,500MB")
+    parser.add_argument("--corpora", default=",".join(CORPORA), help="comma separated corpus names")
+    parser.add_argument("--ops", default="", help="only run operations whose name contains one of these (comma separated)")
+    parser.add_argument("--repeat", type=int, default=5, help="maximum timed runs per case (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative regression before failing (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    corpora = [c.strip() for c in args.corpora.split(",") if c.strip()]
+    unknown = [c for c in corpora if c not in CORPORA]
+    if unknown:
+        parser.error(f"unknown corpora: {', '.join(unknown)} (available: {', '.join(CORPORA)})")
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    operations = get_operations()
+    if args.ops:
+        wanted = [w.strip() for w in args.ops.split(",") if w.strip()]
+        operations = {name: func for name, func in operations.items() if any(w in name for w in wanted)}
+
+    results = run_suite(corpora, sizes, operations, args.repeat, not args.no_memory)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=4), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=4), encoding="utf-8")
+        print(f"Baseline saved to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")).get("results", {})
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f"\n✓ No regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
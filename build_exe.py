@@ -9,6 +9,30 @@ import subprocess
 import shutil
 from pathlib import Path
 
+# Modules the app never imports; dropping them shrinks the bundle that is
+# unpacked/scanned at every launch. Used by the --onedir variant.
+TRIMMED_EXCLUDES = [
+    'unittest',
+    'pydoc',
+    'doctest',
+    'pdb',
+    'lib2to3',
+    'test',
+    'tkinter.test',
+    'idlelib',
+    'turtle',
+    'turtledemo',
+    'distutils',
+    'setuptools',
+    'pip',
+    'PIL.ImageQt',
+    'PyQt5',
+    'PyQt6',
+    'PySide2',
+    'PySide6',
+    'numpy',
+]
+
 def clean_build():
     """Clean previous build artifacts"""
     dirs_to_clean = ['build', 'dist', '__pycache__']
@@ -86,28 +110,34 @@ def create_icon():
         except Exception as e:
             print(f"Could not create icon: {e}")
 
-def build_executable():
-    """Build the executable using PyInstaller"""
+def build_executable(onedir=False):
+    """Build the executable using PyInstaller (onefile by default, trimmed onedir variant on request)"""
     print("Building executable with PyInstaller...")
     
     # PyInstaller command
     cmd = [
         'pyinstaller',
-        '--onefile',                    # Single executable file
+        '--onedir' if onedir else '--onefile',  # onedir skips the unpack-to-temp step on every launch
         '--windowed',                   # No console window
         '--name=CaseCon',              # Executable name
         '--icon=icon.ico',             # Icon file (if exists)
         '--add-data=icon.ico;.',       # Include icon in bundle
         '--hidden-import=pystray._win32',  # Required for pystray
         '--hidden-import=PIL._tkinter_finder',  # Required for PIL with tkinter
-        '--distpath=installer_files',   # Output to installer_files directory
-        'GUI.py'                       # Main script
     ]
+    if onedir:
+        cmd += [f'--exclude-module={name}' for name in TRIMMED_EXCLUDES]
+        cmd += ['--distpath=installer_files/onedir', '--workpath=build/onedir']
+        output = "installer_files/onedir/CaseCon/CaseCon.exe"
+    else:
+        cmd += ['--distpath=installer_files']   # Output to installer_files directory
+        output = "installer_files/CaseCon.exe"
+    cmd.append('GUI.py')                       # Main script
     
     try:
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         print("✓ Executable built successfully!")
-        print("Output location: installer_files/CaseCon.exe")
+        print(f"Output location: {output}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"✗ Build failed: {e}")
@@ -129,9 +159,10 @@ def create_installer_directory():
             print(f"Copied {file_name} to installer directory")
 
 def main():
-    """Main build process"""
+    """Main build process. Pass --onedir to build the trimmed onedir variant instead."""
+    onedir = '--onedir' in sys.argv[1:]
     print("=" * 50)
-    print("Building CaseCon Application")
+    print("Building CaseCon Application" + (" (onedir)" if onedir else ""))
     print("=" * 50)
     
     # Step 1: Clean previous builds
@@ -147,9 +178,17 @@ def main():
     create_installer_directory()
     
     # Step 5: Build executable
-    if build_executable():
-        print("\n" + "=" * 50)
-        print("Build completed successfully!")
+    if not build_executable(onedir):
+        print("\n✗ Build failed. Check error messages above.")
+        sys.exit(1)
+
+    print("\n" + "=" * 50)
+    print("Build completed successfully!")
+    if onedir:
+        print("Onedir build: installer_files/onedir/CaseCon/")
+        print("\nCompare its cold start with the onefile build:")
+        print("  python benchmarks/bench_frozen_startup.py")
+    else:
         print("Files ready for Inno Setup:")
         print("- installer_files/CaseCon.exe")
         print("- installer_files/icon.ico")
@@ -158,10 +197,7 @@ def main():
         print("1. Install Inno Setup Compiler")
         print("2. Open CaseCon_Setup.iss in Inno Setup")
         print("3. Click 'Compile' to create the installer")
-        print("=" * 50)
-    else:
-        print("\n✗ Build failed. Check error messages above.")
-        sys.exit(1)
+    print("=" * 50)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
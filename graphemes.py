@@ -0,0 +1,167 @@
+"""
+Extended grapheme clusters (Unicode UAX #29) for CaseCon.
+A user-perceived character can be several code points: e + combining accent, an emoji
+ZWJ sequence (👩‍💻), a flag (two regional indicators), a Hangul syllable in jamo. Counting
+and capitalizing code points splits them, so count() and first_cluster() work on clusters.
+Every code point is mapped to its Grapheme_Cluster_Break property by one str.translate over
+a precomputed property table (one letter per code point, built from unicodedata on first use),
+and the cluster rules are one regex over that property string, so the work stays in C.
+ASCII and Latin-1/Latin Extended text skips all of it: below U+0300 every code point is a
+cluster except CR LF.
+"""
+import re
+import unicodedata
+
+# Grapheme_Cluster_Break values, one letter each
+CR, LF, CONTROL, EXTEND, ZWJ, REGIONAL_INDICATOR, PREPEND, SPACING_MARK = "r", "n", "c", "e", "z", "i", "p", "s"
+L, V, T, LV, LVT, PICTOGRAPHIC, OTHER = "L", "V", "T", "v", "t", "x", "o"
+
+# The table covers the BMP and the SMP (emoji, historic scripts); beyond it only plane 14 matters
+TABLE_SIZE = 0x20000
+PLANE_14 = {0xE0001: CONTROL, **dict.fromkeys(range(0xE0020, 0xE0080), EXTEND),
+            **dict.fromkeys(range(0xE0100, 0xE01F0), EXTEND)}
+
+CATEGORY_CLASSES = {"Mn": EXTEND, "Me": EXTEND, "Mc": SPACING_MARK,
+                    "Cc": CONTROL, "Cf": CONTROL, "Cs": CONTROL, "Zl": CONTROL, "Zp": CONTROL}
+# Exceptions to the general categories above, applied in this order: (class, [(first, last), ...])
+OVERRIDES = [
+    # Other_Grapheme_Extend: spacing marks and format characters that extend
+    (EXTEND, [(0x09BE, 0x09BE), (0x09D7, 0x09D7), (0x0B3E, 0x0B3E), (0x0B57, 0x0B57), (0x0BBE, 0x0BBE),
+              (0x0BD7, 0x0BD7), (0x0CC2, 0x0CC2), (0x0CD5, 0x0CD6), (0x0D3E, 0x0D3E), (0x0D57, 0x0D57),
+              (0x0DCF, 0x0DCF), (0x0DDF, 0x0DDF), (0x1B35, 0x1B35), (0x200C, 0x200C), (0x302E, 0x302F),
+              (0xFF9E, 0xFF9F), (0x1133E, 0x1133E), (0x11357, 0x11357), (0x114B0, 0x114B0),
+              (0x114BD, 0x114BD), (0x115AF, 0x115AF), (0x11930, 0x11930), (0x1D165, 0x1D165),
+              (0x1D16E, 0x1D172)]),
+    # Spacing marks that do not attach (Myanmar, Tai Tham, ...) and two that do although they are letters
+    (OTHER, [(0x102B, 0x102C), (0x1038, 0x1038), (0x1062, 0x1064), (0x1067, 0x106D), (0x1083, 0x1083),
+             (0x1087, 0x108C), (0x108F, 0x108F), (0x109A, 0x109C), (0x1A61, 0x1A61), (0x1A63, 0x1A64),
+             (0xAA7B, 0xAA7B), (0xAA7D, 0xAA7D), (0x11720, 0x11721)]),
+    (SPACING_MARK, [(0x0E33, 0x0E33), (0x0EB3, 0x0EB3)]),
+    (PREPEND, [(0x0600, 0x0605), (0x06DD, 0x06DD), (0x070F, 0x070F), (0x0890, 0x0891), (0x08E2, 0x08E2),
+               (0x0D4E, 0x0D4E), (0x110BD, 0x110BD), (0x110CD, 0x110CD), (0x111C2, 0x111C3),
+               (0x1193F, 0x1193F), (0x11941, 0x11941), (0x11A3A, 0x11A3A), (0x11A84, 0x11A89),
+               (0x11D46, 0x11D46)]),
+    (L, [(0x1100, 0x115F), (0xA960, 0xA97C)]),
+    (V, [(0x1160, 0x11A7), (0xD7B0, 0xD7C6)]),
+    (T, [(0x11A8, 0x11FF), (0xD7CB, 0xD7FB)]),
+    # Extended_Pictographic (emoji-data.txt)
+    (PICTOGRAPHIC, [
+        (0x00A9, 0x00A9), (0x00AE, 0x00AE), (0x203C, 0x203C), (0x2049, 0x2049), (0x2122, 0x2122),
+        (0x2139, 0x2139), (0x2194, 0x2199), (0x21A9, 0x21AA), (0x231A, 0x231B), (0x2328, 0x2328),
+        (0x2388, 0x2388), (0x23CF, 0x23CF), (0x23E9, 0x23F3), (0x23F8, 0x23FA), (0x24C2, 0x24C2),
+        (0x25AA, 0x25AB), (0x25B6, 0x25B6), (0x25C0, 0x25C0), (0x25FB, 0x25FE), (0x2600, 0x2605),
+        (0x2607, 0x2612), (0x2614, 0x2685), (0x2690, 0x2705), (0x2708, 0x2712), (0x2714, 0x2714),
+        (0x2716, 0x2716), (0x271D, 0x271D), (0x2721, 0x2721), (0x2728, 0x2728), (0x2733, 0x2734),
+        (0x2744, 0x2744), (0x2747, 0x2747), (0x274C, 0x274C), (0x274E, 0x274E), (0x2753, 0x2755),
+        (0x2757, 0x2757), (0x2763, 0x2767), (0x2795, 0x2797), (0x27A1, 0x27A1), (0x27B0, 0x27B0),
+        (0x27BF, 0x27BF), (0x2934, 0x2935), (0x2B05, 0x2B07), (0x2B1B, 0x2B1C), (0x2B50, 0x2B50),
+        (0x2B55, 0x2B55), (0x3030, 0x3030), (0x303D, 0x303D), (0x3297, 0x3297), (0x3299, 0x3299),
+        (0x1F000, 0x1F0FF), (0x1F10D, 0x1F10F), (0x1F12F, 0x1F12F), (0x1F16C, 0x1F171),
+        (0x1F17E, 0x1F17F), (0x1F18E, 0x1F18E), (0x1F191, 0x1F19A), (0x1F1AD, 0x1F1E5),
+        (0x1F201, 0x1F20F), (0x1F21A, 0x1F21A), (0x1F22F, 0x1F22F), (0x1F232, 0x1F23A),
+        (0x1F23C, 0x1F23F), (0x1F249, 0x1F3FA), (0x1F400, 0x1F53D), (0x1F546, 0x1F64F),
+        (0x1F680, 0x1F6FF), (0x1F774, 0x1F77F), (0x1F7D5, 0x1F7FF), (0x1F80C, 0x1F80F),
+        (0x1F848, 0x1F84F), (0x1F85A, 0x1F85F), (0x1F888, 0x1F88F), (0x1F8AE, 0x1F8FF),
+        (0x1F90C, 0x1F93A), (0x1F93C, 0x1F945), (0x1F947, 0x1FAFF), (0x1FC00, 0x1FFFD)]),
+    (EXTEND, [(0x1F3FB, 0x1F3FF)]),  # emoji skin tone modifiers
+    (REGIONAL_INDICATOR, [(0x1F1E6, 0x1F1FF)]),
+    (ZWJ, [(0x200D, 0x200D)]),
+    (CR, [(0x0D, 0x0D)]),
+    (LF, [(0x0A, 0x0A)]),
+]
+HANGUL_SYLLABLES = (0xAC00, 0xD7A3)  # LV every 28th code point, LVT in between
+
+# GB3-GB13 over the property string: CR LF, controls, then an optional prepend, a core
+# (Hangul syllable, flag, emoji ZWJ sequence or any other character) and its extending marks
+CLUSTER = r'rn|[rnc]|p*(?:L*(?:V+|vV*|t)T*|L+|T+|ii|x(?:e*zx)*|[^rnc])[ezs]*'
+CLUSTER_RE = re.compile(CLUSTER)
+# Only the clusters of two or more code points: everything the search skips is a one-code-point
+# cluster, so counting needs no match object for ordinary characters
+MULTI_CLUSTER_RE = re.compile(rf'(?=.[ezs]|rn|p|[LVTvt][LVTvt]|ii|xe*zx)(?:{CLUSTER})', re.S)
+# The combining blocks used with cased (Latin, Greek, Cyrillic) letters: enough where only casing
+# matters, and usable in regexes compiled at import without building the table
+COMBINING_MARKS = "\u0300-\u036f\u0483-\u0489\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f"
+FIRST_MARK = "\u0300"  # nothing below it extends a cluster or joins one (except CR LF)
+EXTENDING = (EXTEND, ZWJ, SPACING_MARK)
+CLUSTER_WINDOW = 32  # characters looked at for the first cluster before widening the window
+
+_table = {"classes": None, "marks": None}
+
+
+def build_table(size=TABLE_SIZE):
+    """The property string: classes[code] is the Grapheme_Cluster_Break letter of chr(code)"""
+    category = unicodedata.category
+    classes = [CATEGORY_CLASSES.get(category(chr(code)), OTHER) for code in range(size)]
+    for value, ranges in OVERRIDES:
+        for first, last in ranges:
+            if first < size:
+                last = min(last, size - 1)
+                classes[first:last + 1] = value * (last - first + 1)
+    first, last = HANGUL_SYLLABLES
+    for code in range(first, min(last + 1, size)):
+        classes[code] = LV if (code - first) % 28 == 0 else LVT
+    return "".join(classes)
+
+
+def _property_table():
+    table = _table["classes"]
+    if table is None:
+        table = _table["classes"] = build_table()
+    return table
+
+
+def property_string(text):
+    """One Grapheme_Cluster_Break letter per code point of `text`"""
+    classes = text.translate(_property_table())  # code points past the table stay themselves, i.e. "other"
+    if not classes.isascii():
+        classes = classes.translate(PLANE_14)
+    return classes
+
+
+def count(text):
+    """Number of extended grapheme clusters (user-perceived characters) in `text`"""
+    if text.isascii() or max(text) < FIRST_MARK:
+        return len(text) - text.count("\r\n")
+    joined = sum(match.end() - match.start() - 1 for match in MULTI_CLUSTER_RE.finditer(property_string(text)))
+    return len(text) - joined
+
+
+def clusters(text):
+    """List of the grapheme clusters of `text`"""
+    if (text.isascii() or max(text) < FIRST_MARK) and "\r\n" not in text:
+        return list(text)
+    return [text[m.start():m.end()] for m in CLUSTER_RE.finditer(property_string(text))]
+
+
+def first_cluster(text):
+    """The first grapheme cluster of `text` ("" for empty text), e.g. "é" as e + U+0301"""
+    if len(text) < 2 or (text[1] < FIRST_MARK and text[0] < FIRST_MARK and text[0] != "\r"):
+        return text[:1]  # such characters never join
+    first, second = ord(text[0]), ord(text[1])
+    if first < TABLE_SIZE and second < TABLE_SIZE:
+        table = _property_table()
+        if table[first] == OTHER and table[second] not in EXTENDING:
+            return text[:1]  # a plain letter followed by anything but a mark: the common case
+    window = CLUSTER_WINDOW
+    while True:
+        end = CLUSTER_RE.match(property_string(text[:window])).end()
+        if end < window or window >= len(text):
+            return text[:end]
+        window *= 2  # the cluster may continue past the window (stacked marks)
+
+
+def mark_class():
+    """Regex character-class body matching the code points that extend a cluster (marks, ZWJ)"""
+    marks = _table["marks"]
+    if marks is None:
+        codes = [code for code, value in enumerate(_property_table()) if value in EXTENDING]
+        codes += [code for code, value in PLANE_14.items() if value == EXTEND]
+        ranges = []
+        for code in codes:
+            if ranges and ranges[-1][1] == code - 1:
+                ranges[-1][1] = code
+            else:
+                ranges.append([code, code])
+        marks = _table["marks"] = "".join(
+            re.escape(chr(first)) + ("-" + re.escape(chr(last)) if last > first else "") for first, last in ranges)
+    return marks
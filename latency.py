@@ -0,0 +1,114 @@
+"""
+Hotkey latency instrumentation for CaseCon.
+Spans around each phase of a hotkey (hook, copy, transform, paste, restore,
+total) feed fixed log-scale histograms, so percentiles stay cheap and memory
+stays constant however long the app runs.
+"""
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_FILE = "casecon_latency.json"
+PHASES = ("hook", "copy", "transform", "paste", "restore", "total")
+
+# Bucket upper bounds in ms, 10 per decade from 10 µs to ~100 s (~26% relative error)
+BUCKET_BOUNDS = [0.01 * 10 ** (i / 10) for i in range(71)]
+
+histograms = {}  # (mode, phase) -> {"counts": [...], "count": n, "sum": ms, "max": ms}
+histogram_lock = threading.Lock()
+
+
+def record(mode, phase, ms):
+    """Add one measurement in milliseconds"""
+    index = bisect.bisect_left(BUCKET_BOUNDS, ms)
+    with histogram_lock:
+        hist = histograms.get((mode, phase))
+        if hist is None:
+            hist = histograms[(mode, phase)] = {"counts": [0] * (len(BUCKET_BOUNDS) + 1), "count": 0,
+                                                "sum": 0.0, "max": 0.0}
+        hist["counts"][index] += 1
+        hist["count"] += 1
+        hist["sum"] += ms
+        if ms > hist["max"]:
+            hist["max"] = ms
+
+
+@contextmanager
+def span(mode, phase):
+    """Time the enclosed block as `phase` of a `mode` hotkey"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(mode, phase, (time.perf_counter() - start) * 1000)
+
+
+def percentile(hist, q):
+    """Upper bound of the bucket holding the q-th quantile, capped at the observed max"""
+    target = q * hist["count"]
+    seen = 0
+    for index, count in enumerate(hist["counts"]):
+        seen += count
+        if count and seen >= target:
+            bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else hist["max"]
+            return min(bound, hist["max"])
+    return hist["max"]
+
+
+def _summarize(hist):
+    return {
+        "count": hist["count"],
+        "mean_ms": round(hist["sum"] / hist["count"], 3),
+        "p50_ms": round(percentile(hist, 0.50), 3),
+        "p95_ms": round(percentile(hist, 0.95), 3),
+        "p99_ms": round(percentile(hist, 0.99), 3),
+        "max_ms": round(hist["max"], 3),
+    }
+
+
+def get_histograms():
+    """Consistent copy of the raw histograms, {(mode, phase): hist}"""
+    with histogram_lock:
+        return {key: {"counts": list(h["counts"]), "count": h["count"], "sum": h["sum"], "max": h["max"]}
+                for key, h in histograms.items()}
+
+
+def get_summary():
+    """{mode: {phase: stats}} plus an "all" entry that merges every mode per phase"""
+    snapshot = get_histograms()
+
+    merged = {}
+    for (mode, phase), hist in snapshot.items():
+        total = merged.setdefault(phase, {"counts": [0] * len(hist["counts"]), "count": 0, "sum": 0.0, "max": 0.0})
+        total["counts"] = [a + b for a, b in zip(total["counts"], hist["counts"])]
+        total["count"] += hist["count"]
+        total["sum"] += hist["sum"]
+        total["max"] = max(total["max"], hist["max"])
+
+    summary = {}
+    for (mode, phase), hist in sorted(snapshot.items()):
+        summary.setdefault(mode, {})[phase] = _summarize(hist)
+    if merged:
+        summary["all"] = {phase: _summarize(merged[phase]) for phase in PHASES if phase in merged}
+    return summary
+
+
+def format_summary(summary=None):
+    """Short text table (all modes merged) for the tray popup"""
+    summary = summary if summary is not None else get_summary()
+    overall = summary.get("all")
+    if not overall:
+        return "No hotkeys measured yet."
+    lines = [f"{'phase':<10}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"]
+    for phase, stats in overall.items():
+        lines.append(f"{phase:<10}{stats['count']:>6}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+    return "\n".join(lines)
+
+
+def export_stats(path=LATENCY_FILE):
+    """Write the per-mode, per-phase summary as JSON. Returns the path."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"generated": time.strftime("%Y-%m-%d %H:%M:%S"), "modes": get_summary()}, f, indent=4)
+    return path
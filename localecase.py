@@ -0,0 +1,181 @@
+"""
+Locale-aware casing for CaseCon.
+get_casing(locale) returns upper/lower/title/capitalize functions that apply the
+locale's special cases from small precomputed tables around the built-in str methods:
+    tr, az  dotted/dotless i (i <-> İ, ı <-> I)
+    lt      keeps the dot on i/j when lowercasing before accents (Í -> i̇́) and drops it when uppercasing
+    el      uppercase drops the tonos (ά -> Α); final sigma is already handled by str.lower
+    nl      IJ is capitalized as one letter in titles (ijssel -> IJssel)
+    de      optional capital sharp s (ß -> ẞ instead of SS)
+Locales whose rules only touch non-ASCII letters keep the plain str methods for ASCII text.
+"""
+import re
+
+from graphemes import COMBINING_MARKS, first_cluster
+
+LOCALES = ("", "tr", "az", "lt", "el", "nl", "de")
+COMBINING_DOT_ABOVE = "̇"
+
+# A letter that follows a non-letter starts a word, as in str.title(), but a combining mark belongs
+# to the letter before it (str.title() turns a decomposed "école" into "ÉCole"). The match is the
+# whole first character, marks included, so upper_char sees e.g. Lithuanian i + dot above together.
+WORD_START_RE = re.compile(rf'(?<![^\W\d_])(?<![{COMBINING_MARKS}])[^\W\d_][{COMBINING_MARKS}]*')
+DUTCH_IJ_RE = re.compile(r'(?<![^\W\d_])Ij')
+MARK_RE = re.compile(f'[{COMBINING_MARKS}]')
+LT_DOT_RE = re.compile(r'(?<=[ijį])̇')  # dot above on a soft-dotted letter
+LT_ACCENTED_IJ_RE = re.compile(r'[IJĮ](?=[̀-ͯ])')
+
+TURKIC_UPPER = {"i": "İ"}
+TURKIC_LOWER = {"I": "ı", "İ": "i"}
+LITHUANIAN_LOWER = {"Ì": "i̇̀", "Í": "i̇́", "Ĩ": "i̇̃"}
+GREEK_UPPER = {
+    "ά": "Α", "έ": "Ε", "ή": "Η", "ί": "Ι", "ό": "Ο", "ύ": "Υ", "ώ": "Ω", "ΐ": "Ϊ", "ΰ": "Ϋ",
+    "Ά": "Α", "Έ": "Ε", "Ή": "Η", "Ί": "Ι", "Ό": "Ο", "Ύ": "Υ", "Ώ": "Ω",
+}
+CAPITAL_SHARP_S = {"ß": "ẞ"}
+
+_casings = {}  # (locale, capital_sharp_s) -> casing dict
+
+
+def translator(table):
+    """
+    Function applying a small {char: replacement} table. The tables hold a handful of letters,
+    so a presence check plus str.replace per entry (both vectorized in C) is much faster than
+    str.translate, which does a dict lookup for every character.
+    """
+    pairs = tuple(table.items())
+
+    def translate(text):
+        for old, new in pairs:
+            if old in text:
+                text = text.replace(old, new)
+        return text
+    return translate
+
+
+turkic_upper = translator(TURKIC_UPPER)
+turkic_lower = translator(TURKIC_LOWER)
+lithuanian_lower = translator(LITHUANIAN_LOWER)
+greek_upper = translator(GREEK_UPPER)
+capital_sharp_s = translator(CAPITAL_SHARP_S)
+
+
+def _title_with(lower, upper_char):
+    def title(text):
+        return WORD_START_RE.sub(lambda match: upper_char(match.group()), lower(text))
+    return title
+
+
+def _capitalize_with(lower, upper_char):
+    def capitalize(text):
+        lowered = lower(text)
+        head = first_cluster(lowered)
+        return upper_char(head) + lowered[len(head):]
+    return capitalize
+
+
+def _build_casing(locale, sharp_s):
+    upper, lower, title, capitalize = str.upper, str.lower, str.title, str.capitalize
+    upper_char = str.title
+
+    if locale in ("tr", "az"):
+        # No ASCII fast path: plain i/I are exactly what differs
+        def upper(text):
+            return turkic_upper(text).upper()
+
+        def lower(text):
+            return turkic_lower(text).lower()
+
+        def upper_char(char):
+            return turkic_upper(char).title()
+        slow_title = _title_with(lower, upper_char)
+        capitalize = _capitalize_with(lower, upper_char)
+
+        def title(text):
+            # str.title() gets everything right except a word-initial i, which must become İ
+            lowered = lower(text)
+            titled = lowered.title()
+            if "I" not in titled:
+                return titled
+            if len(titled) != len(lowered):
+                return slow_title(text)  # a letter changed length, so indexes no longer line up
+            parts = []
+            start = 0
+            for match in re.finditer("I", titled):
+                index = match.start()
+                if lowered[index] == "i":
+                    parts.append(titled[start:index])
+                    parts.append("İ")
+                    start = index + 1
+            parts.append(titled[start:])
+            return "".join(parts)
+
+    elif locale == "lt":
+        def upper(text):
+            if text.isascii():
+                return text.upper()
+            return LT_DOT_RE.sub("", text).upper()
+
+        def lower(text):
+            if text.isascii():
+                return text.lower()
+            text = LT_ACCENTED_IJ_RE.sub(lambda match: match.group().lower() + COMBINING_DOT_ABOVE, text)
+            return lithuanian_lower(text).lower()
+
+        def upper_char(char):
+            return LT_DOT_RE.sub("", char).title()
+        slow_title = _title_with(lower, upper_char)
+        slow_capitalize = _capitalize_with(lower, upper_char)
+
+        def title(text):
+            return text.title() if text.isascii() else slow_title(text)
+
+        def capitalize(text):
+            return text.capitalize() if text.isascii() else slow_capitalize(text)
+
+    elif locale == "el":
+        def upper(text):
+            if text.isascii():
+                return text.upper()
+            return greek_upper(text).upper()
+
+    elif locale == "nl":
+        def title(text):
+            titled = text.title()
+            return DUTCH_IJ_RE.sub("IJ", titled) if "Ij" in titled else titled
+
+        def capitalize(text):
+            capitalized = text.capitalize()
+            return "IJ" + capitalized[2:] if capitalized.startswith("Ij") else capitalized
+
+    elif locale not in LOCALES:
+        raise ValueError(f"Unsupported locale {locale!r} (available: {', '.join(l for l in LOCALES if l)})")
+
+    # str.title() starts a new word after a combining mark, so text with marks goes through WORD_START_RE
+    plain_title = title
+    marked_title = _title_with(lower, upper_char)
+
+    def title(text):
+        if text.isascii() or MARK_RE.search(text) is None:
+            return plain_title(text)
+        titled = marked_title(text)
+        return DUTCH_IJ_RE.sub("IJ", titled) if locale == "nl" else titled
+
+    if sharp_s:
+        base_upper = upper
+
+        def upper(text):
+            if text.isascii():
+                return base_upper(text)
+            return base_upper(capital_sharp_s(text))
+
+    return {"upper": upper, "lower": lower, "title": title, "capitalize": capitalize}
+
+
+def get_casing(locale="", sharp_s=False):
+    """{"upper", "lower", "title", "capitalize"} for locale ("" = Python's default rules)"""
+    key = ((locale or "").lower(), bool(sharp_s))
+    casing = _casings.get(key)
+    if casing is None:
+        casing = _casings[key] = _build_casing(*key)
+    return casing
@@ -0,0 +1,232 @@
+"""
+Opt-in local metrics for CaseCon.
+Counters and gauges are rendered as OpenMetrics text, either served on
+127.0.0.1:<metrics_port>/metrics or written to <metrics_file> every few seconds.
+Hotkey latency histograms come from the latency module.
+
+Check a running instance with:
+    python metrics.py --scrape 9464
+"""
+import os
+import sys
+import threading
+
+import latency
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_FILE_INTERVAL = 15  # seconds between metrics_file rewrites
+# Export every 5th latency bucket bound (~3.16x apart) so le values are exact bucket edges
+EXPORTED_BUCKETS = list(range(0, len(latency.BUCKET_BOUNDS), 5))
+
+COUNTER_HELP = {
+    "hotkey_triggers": "Hotkeys triggered, by mode",
+    "clipboard_retries": "Extra Ctrl+C attempts needed to read the selection",
+    "selection_read_failures": "Hotkeys that gave up with 'Could not read the selected text'",
+    "precompute_hits": "Hotkeys served from the speculative cache",
+    "precompute_misses": "Hotkeys that had to transform while the watcher ran",
+}
+
+counters = {}  # (name, (("label", "value"), ...)) -> value
+counter_lock = threading.Lock()
+gauges = {}  # name -> (help, callable returning a number)
+
+_server = None
+_file_stop = None
+
+
+# -------------------- Recording --------------------
+def inc(name, amount=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with counter_lock:
+        counters[key] = counters.get(key, 0) + amount
+
+
+def register_gauge(name, help_text, func):
+    """`func()` is called at every scrape; it must be cheap and thread-safe"""
+    gauges[name] = (help_text, func)
+
+
+def get_rss_bytes():
+    """Resident set size of this process, or None if it cannot be read"""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            kernel32 = ctypes.WinDLL("kernel32")
+            kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+            psapi = ctypes.WinDLL("psapi")
+            psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD]
+
+            counters_struct = PROCESS_MEMORY_COUNTERS()
+            counters_struct.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+            if psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters_struct),
+                                          counters_struct.cb):
+                return counters_struct.WorkingSetSize
+            return None
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+register_gauge("process_resident_memory_bytes", "Resident memory of the CaseCon process", get_rss_bytes)
+
+
+# -------------------- OpenMetrics rendering --------------------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """Current metrics in OpenMetrics text format"""
+    lines = []
+    with counter_lock:
+        snapshot = dict(counters)
+
+    by_name = {}
+    for (name, labels), value in snapshot.items():
+        by_name.setdefault(name, []).append((labels, value))
+    for name in sorted(set(by_name) | set(COUNTER_HELP)):
+        metric = f"casecon_{name}"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"# HELP {metric} {COUNTER_HELP.get(name, name)}")
+        for labels, value in sorted(by_name.get(name, [])):
+            lines.append(f"{metric}_total{_labels(labels)} {_number(value)}")
+
+    for name, (help_text, func) in sorted(gauges.items()):
+        try:
+            value = func()
+        except Exception:
+            value = None
+        if value is None:
+            continue
+        metric = f"casecon_{name}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"{metric} {_number(value)}")
+
+    metric = "casecon_hotkey_latency_seconds"
+    lines.append(f"# TYPE {metric} histogram")
+    lines.append(f"# HELP {metric} Time per hotkey phase (hook, copy, transform, paste, restore, total)")
+    for (mode, phase), hist in sorted(latency.get_histograms().items()):
+        base = (("mode", mode), ("phase", phase))
+        cumulative = 0
+        exported = iter(EXPORTED_BUCKETS)
+        next_edge = next(exported, None)
+        for index, count in enumerate(hist["counts"][:len(latency.BUCKET_BOUNDS)]):
+            cumulative += count
+            if index == next_edge:
+                le = latency.BUCKET_BOUNDS[index] / 1000
+                lines.append(f"{metric}_bucket{_labels(base + (('le', f'{le:.6g}'),))} {cumulative}")
+                next_edge = next(exported, None)
+        lines.append(f"{metric}_bucket{_labels(base + (('le', '+Inf'),))} {hist['count']}")
+        lines.append(f"{metric}_count{_labels(base)} {hist['count']}")
+        lines.append(f"{metric}_sum{_labels(base)} {hist['sum'] / 1000!r}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+# -------------------- Exposition --------------------
+def start_server(port, host="127.0.0.1"):
+    """Serve /metrics on localhost in a daemon thread. Returns the bound port."""
+    global _server
+    if _server is not None:
+        return _server.server_address[1]
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # windowed builds have no stderr
+
+    _server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server.server_address[1]
+
+
+def write_file(path):
+    """Atomically replace `path` with the current metrics"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+
+def start_file_writer(path, interval=DEFAULT_FILE_INTERVAL):
+    global _file_stop
+    if _file_stop is not None:
+        return
+    _file_stop = stop_event = threading.Event()
+
+    def loop():
+        while True:
+            try:
+                write_file(path)
+            except OSError:
+                pass
+            if stop_event.wait(interval):
+                return
+
+    threading.Thread(target=loop, daemon=True).start()
+
+
+def stop():
+    global _server, _file_stop
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+    if _file_stop is not None:
+        _file_stop.set()
+        _file_stop = None
+
+
+def scrape(port, host="127.0.0.1", timeout=2.0):
+    """Fetch /metrics from a running instance (what a local Prometheus agent would do)"""
+    from urllib.request import urlopen
+    with urlopen(f"http://{host}:{port}/metrics", timeout=timeout) as response:
+        return response.headers.get("Content-Type", ""), response.read().decode("utf-8")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape a running CaseCon metrics endpoint")
+    parser.add_argument("--scrape", type=int, metavar="PORT", required=True)
+    args = parser.parse_args()
+    content_type, text = scrape(args.scrape)
+    print(text, end="")
+    if not content_type.startswith("application/openmetrics-text") or not text.endswith("# EOF\n"):
+        print("✗ Response is not OpenMetrics text", file=sys.stderr)
+        sys.exit(1)
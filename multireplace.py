@@ -0,0 +1,97 @@
+"""
+Case-preserving multi-term replace for CaseCon.
+Each old -> new pair is expanded into its case-style variants (user_id, userId,
+UserId, USER_ID, user-id, User Id, ...) with the MODES renderers. All variants of
+all pairs are merged into one trie, compiled into a single regular expression,
+so one scan over the text finds every term and each hit is replaced by the new
+term rendered in the style of that hit.
+"""
+import re
+
+from textcore import MODES, tokenize
+
+
+def camel_case(phrase):
+    pascal = MODES["pascalcase"](phrase)
+    return pascal[:1].lower() + pascal[1:]
+
+
+# Style -> renderer for a lowercase, space separated phrase. When two styles render a term
+# the same way (one-word terms), the earlier style decides how the new term is written.
+STYLES = {
+    "snakecase": MODES["snakecase"],
+    "kebabcase": MODES["kebabcase"],
+    "macrocase": MODES["macrocase"],
+    "camelcase": camel_case,
+    "pascalcase": MODES["pascalcase"],
+    "titlecase": MODES["titlecase"],
+    "lowercase": MODES["lowercase"],
+    "uppercase": MODES["uppercase"],
+}
+
+# A hit must not continue an identifier on either side, except across a camelCase boundary
+# (so "UserId" is found in "getUserId" and "userId" in "userIdValue")
+IDENTIFIER_CHAR = re.compile(r'[^\W_]')
+SUFFIX_GUARD = r'(?:(?![^\W_])|(?<=[a-z0-9])(?=[A-Z]))'
+
+
+def build_variants(old, new):
+    """{variant of old: same style rendering of new}"""
+    old_phrase = " ".join(tokenize(old)).lower()
+    new_phrase = " ".join(tokenize(new)).lower()
+    if not old_phrase:
+        raise ValueError(f"Nothing to match in {old!r}")
+    variants = {}
+    for render in STYLES.values():
+        variants.setdefault(render(old_phrase), render(new_phrase))
+    return variants
+
+
+def trie_regex(strings):
+    """
+    Regex source matching any of `strings`, factored as a prefix trie so the regex engine walks
+    shared prefixes once instead of trying every alternative (longest alternative wins).
+    """
+    trie = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node):
+        end = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if end else group
+
+    return render(trie)
+
+
+def compile_replacer(pairs):
+    """Callable(text) replacing every variant of every old term in `pairs` ({old: new})"""
+    replacements = {}
+    for old, new in pairs.items():
+        for variant, rendered in build_variants(old, new).items():
+            replacements.setdefault(variant, rendered)
+    if not replacements:
+        return lambda text: text
+    pattern = re.compile(trie_regex(replacements) + SUFFIX_GUARD)
+
+    def replace_match(match):
+        start = match.start()
+        found = match.group()
+        if start:
+            previous = match.string[start - 1]
+            camel_start = found[0].isupper() and (previous.islower() or previous.isdigit())
+            if IDENTIFIER_CHAR.match(previous) and not camel_start:
+                return found  # the middle of a longer identifier
+        return replacements[found]
+
+    def replace(text):
+        return pattern.sub(replace_match, text)
+    return replace
@@ -0,0 +1,120 @@
+"""
+On-demand profiling for CaseCon.
+arm(n) wraps the next n hotkey executions and GUI conversions in cProfile plus a
+tracemalloc snapshot and writes .pstats, .snapshot and a text summary to
+casecon_profiles/. While disarmed, profile() hands back one shared no-op context.
+"""
+import contextlib
+import os
+import threading
+import time
+
+PROFILE_DIR = "casecon_profiles"
+DEFAULT_OPERATIONS = 10
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+
+_remaining = 0
+_counter = 0
+_lock = threading.Lock()
+_active = threading.Lock()  # held while an operation is being profiled
+_NOT_PROFILING = contextlib.nullcontext()
+
+
+def arm(count=DEFAULT_OPERATIONS):
+    global _remaining
+    with _lock:
+        _remaining = max(0, int(count))
+
+
+def disarm():
+    arm(0)
+
+
+def remaining():
+    return _remaining
+
+
+def profile(label):
+    """Context manager for one operation: profiled while armed, free otherwise"""
+    if not _remaining:
+        return _NOT_PROFILING
+    return _profiled(label)
+
+
+def _claim_slot():
+    global _remaining, _counter
+    with _lock:
+        if not _remaining:
+            return None
+        _remaining -= 1
+        _counter += 1
+        return _counter
+
+
+def _return_slot():
+    global _remaining
+    with _lock:
+        _remaining += 1
+
+
+@contextlib.contextmanager
+def _profiled(label):
+    import cProfile
+    import tracemalloc
+
+    # Only one cProfile can be enabled at a time (Python 3.12+ raises ValueError for a second one),
+    # so an operation overlapping a profiled one runs unprofiled and leaves the slot for later
+    if not _active.acquire(blocking=False):
+        yield
+        return
+    try:
+        number = _claim_slot()
+        if number is None:  # another thread used the last slot
+            yield
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # a profiler from outside CaseCon is running
+            _return_slot()
+            yield
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            write_profile(f"{time.strftime('%Y%m%d-%H%M%S')}_{number:03d}_{label}", profiler, snapshot, peak_bytes)
+    finally:
+        _active.release()
+
+
+def write_profile(name, profiler, snapshot, peak_bytes):
+    """Write <name>.pstats, <name>.snapshot and <name>.txt (top functions and allocations)"""
+    import io
+    import pstats
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, name)
+    profiler.dump_stats(base + ".pstats")
+    snapshot.dump(base + ".snapshot")
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(f"Peak traced memory: {peak_bytes / 1024:.1f} KiB\n\n")
+        f.write(f"Top {TOP_FUNCTIONS} functions by cumulative time\n")
+        f.write(stream.getvalue())
+        f.write(f"\nTop {TOP_ALLOCATIONS} allocation sites still alive at the end\n")
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            f.write(f"{stat}\n")
+    return base
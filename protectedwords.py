@@ -0,0 +1,172 @@
+"""
+Protected words for CaseCon.
+A dictionary of tokens whose casing has to survive a conversion: acronyms (API, HTTP),
+brands (iPhone, GitHub) and product names (HTTPServer, Visual Studio Code). After a mode
+has rendered the text, protect() writes every listed word back in its dictionary casing,
+also inside joined identifiers (ApiKeyForHttpserver -> APIKeyForHTTPServer).
+Entries are stored in a word trie keyed by lowercase words: a word of the text costs one
+dict lookup whatever the dictionary size, and only entries of several words walk further.
+Entries that tokenize() splits further (HTTPServer -> HTTP, Server) are indexed by those parts
+as well, since identifier modes render them as separate words: camelCase of "API key for
+HTTPServer" is apiKeyForHttpServer, which comes back as apiKeyForHTTPServer.
+The compiled trie is pickled to a cache file and reused while its sources are unchanged.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+
+from textcore import tokenize
+
+CACHE_VERSION = 2
+END = ""  # trie key holding the canonical words of an entry that ends at this node
+PARTS = "\n"  # root key of the trie of entries by their tokenize() parts (never a word of the text)
+CHUNK_RE = re.compile(r'[^\W_]+')
+PHRASE_GAP_RE = re.compile(r'[^\w\r\n]{1,3}')  # what may separate the words of a multi-word entry
+
+
+def read_word_file(path):
+    """Entries of a shared list: one per line, # starts a comment"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def compile_words(entries):
+    """Word trie for `entries` ("API", "iPhone", "Visual Studio Code"); later entries win"""
+    trie = {}
+    for entry in entries:
+        words = CHUNK_RE.findall(entry)
+        if not words:
+            continue
+        node = trie
+        for word in words:
+            node = node.setdefault(word.lower(), {})
+        node[END] = words
+        parts = [part for word in words for part in tokenize(word)]
+        if len(parts) > len(words):
+            node = trie.setdefault(PARTS, {})
+            for part in parts:
+                node = node.setdefault(part.lower(), {})
+            node[END] = parts
+    return trie
+
+
+def _sources_key(words, path):
+    digest = hashlib.sha1(json.dumps([CACHE_VERSION, list(words)]).encode("utf-8"))
+    if path:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_trie(words=(), path=None, cache_path=None):
+    """
+    Trie for the user's `words` plus the shared list at `path`, read from cache_path when it was
+    built from the same sources (rebuilt and saved otherwise). Raises OSError if `path` is unreadable.
+    """
+    words = list(words or ())
+    key = _sources_key(words, path)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                cached_key, trie = pickle.load(f)
+            if cached_key == key:
+                return trie
+        except Exception:
+            pass  # unreadable or from another version: rebuild below
+    trie = compile_words((read_word_file(path) if path else []) + words)
+    if cache_path:
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump((key, trie), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # read-only install folder: the cache is only a startup shortcut
+    return trie
+
+
+def _longest_match(trie, words, start):
+    """(canonical words, count) of the longest entry matching words[start:], or (None, 0)"""
+    node = trie.get(words[start].lower())
+    best, count = None, 0
+    index = start
+    while node is not None:
+        index += 1
+        if END in node:
+            best, count = node[END], index - start
+        if index == len(words) or len(node) == (END in node):
+            break
+        node = node.get(words[index].lower())
+    return best, count
+
+
+def _protect_identifier(trie, chunk):
+    """Fix protected words among the camelCase parts of a joined identifier (a lowercase head stays)"""
+    parts = tokenize(chunk)
+    if len(parts) < 2 or "".join(parts) != chunk:
+        return chunk
+    index = 1 if parts[0].islower() else 0
+    split_entries = trie.get(PARTS)
+    while index < len(parts):
+        canonical, count = _longest_match(trie, parts, index)
+        if split_entries:
+            split_canonical, split_count = _longest_match(split_entries, parts, index)
+            if split_count > count:
+                canonical, count = split_canonical, split_count
+        if count:
+            parts[index:index + count] = canonical
+            index += count
+        else:
+            index += 1
+    return "".join(parts)
+
+
+def make_protector(trie):
+    """Callable(text) putting every protected word of `trie` back in its dictionary casing"""
+    if not trie:
+        return lambda text: text
+    get = trie.get
+
+    def extend_phrase(text, node, end):
+        """(canonical words, end) of the longest entry continuing after `end` on the same line"""
+        best = None
+        while node is not None and len(node) > (END in node):
+            gap = PHRASE_GAP_RE.match(text, end)
+            word = gap and CHUNK_RE.match(text, gap.end())
+            if not word:
+                break
+            node = node.get(word.group().lower())
+            end = word.end()
+            if node is not None and END in node:
+                best = node[END], end
+        return best
+
+    def protect(text):
+        parts = []
+        position = 0
+        for match in CHUNK_RE.finditer(text):
+            if match.start() < position:
+                continue  # already recased as part of a multi-word entry
+            word = match.group()
+            node = get(word.lower())
+            if node is None:
+                # Not a dictionary word by itself, but it may join several (ApiKey)
+                if len(word) > 2 and not word[1:].islower() and not word.isupper():
+                    fixed = _protect_identifier(trie, word)
+                    if fixed != word:
+                        parts += [text[position:match.start()], fixed]
+                        position = match.end()
+                continue
+            phrase = extend_phrase(text, node, match.end())
+            if phrase is not None:
+                canonical, end = phrase
+                # Keep the original separators and only recase the words
+                for found, canonical_word in zip(CHUNK_RE.finditer(text, match.start(), end), canonical):
+                    parts += [text[position:found.start()], canonical_word]
+                    position = found.end()
+            elif END in node and word != node[END][0]:
+                parts += [text[position:match.start()], node[END][0]]
+                position = match.end()
+        parts.append(text[position:])
+        return "".join(parts)
+    return protect
@@ -0,0 +1,194 @@
+"""
+Regex rule modes for CaseCon.
+A regex mode is a list of find/replace rules from the "regex_modes" setting. Rules run
+in a long-lived helper process that keeps the compiled patterns cached; if a rule set
+runs past its time budget (for example catastrophic backtracking on a big selection)
+the helper is killed and the hotkey fails with an error instead of hanging.
+Python's re module cannot be interrupted from another thread, hence the process.
+"""
+import atexit
+import os
+import pickle
+import queue
+import re
+import subprocess
+import sys
+import threading
+
+WORKER_FLAG = "--regex-worker"
+DEFAULT_TIMEOUT_MS = 1000
+WORKER_START_TIMEOUT = 15  # seconds; a frozen onefile build unpacks itself first
+
+CASES = {
+    "upper": str.upper,
+    "lower": str.lower,
+    "capitalize": str.capitalize,
+    "title": str.title,
+}
+FLAGS = {
+    "i": re.IGNORECASE,
+    "m": re.MULTILINE,
+    "s": re.DOTALL,
+    "x": re.VERBOSE,
+    "a": re.ASCII,
+}
+
+_worker = None  # (process, reply queue) while the helper runs
+_worker_lock = threading.Lock()
+
+
+# -------------------- Rules --------------------
+def compile_rule(rule):
+    """
+    (pattern, repl) for one rule: {"pattern": ..., "flags": "im", "replace": ..., "case": "upper"}.
+    "replace" is an re.sub template; "case" is applied to the replacement (or to the match).
+    Raises ValueError for invalid rules.
+    """
+    try:
+        pattern = rule["pattern"]
+        flags = 0
+        for flag in rule.get("flags", ""):
+            flags |= FLAGS[flag]
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError(f"rule needs a 'pattern' and flags from '{''.join(FLAGS)}'") from None
+    replace = rule.get("replace")
+    case = rule.get("case")
+    if replace is None and case is None:
+        raise ValueError("rule needs a 'replace' template and/or a 'case'")
+    if case is not None and case not in CASES:
+        raise ValueError(f"case must be one of {', '.join(CASES)}")
+    try:
+        compiled = re.compile(pattern, flags)
+    except re.error as e:
+        raise ValueError(f"bad pattern {pattern!r}: {e}") from None
+
+    if case is None:
+        return compiled, replace
+    func = CASES[case]
+    if replace is None:
+        return compiled, lambda match: func(match.group())
+    return compiled, lambda match: func(match.expand(replace))
+
+
+def compile_rules(rules):
+    return [compile_rule(rule) for rule in rules]
+
+
+def apply_rules(compiled_rules, text):
+    for pattern, repl in compiled_rules:
+        text = pattern.sub(repl, text)
+    return text
+
+
+# -------------------- Helper process --------------------
+def serve(stdin, stdout):
+    """Helper loop: read (key, rules, text) requests, reply ("ok", text) or ("error", message)"""
+    cache = {}  # key -> compiled rules
+    pickle.dump(("ready", None), stdout)
+    stdout.flush()
+    while True:
+        try:
+            key, rules, text = pickle.load(stdin)
+        except EOFError:
+            return
+        try:
+            compiled = cache.get(key)
+            if compiled is None:
+                compiled = cache[key] = compile_rules(rules)
+            reply = ("ok", apply_rules(compiled, text))
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        pickle.dump(reply, stdout)
+        stdout.flush()
+
+
+def serve_stdio():
+    # Windowed builds have no sys.stdin/sys.stdout objects, but the pipe handles are still fds 0 and 1
+    stdin = sys.stdin.buffer if sys.stdin else os.fdopen(0, "rb")
+    stdout = sys.stdout.buffer if sys.stdout else os.fdopen(1, "wb")
+    serve(stdin, stdout)
+
+
+def worker_command():
+    if getattr(sys, "frozen", False):
+        return [sys.executable, WORKER_FLAG]  # GUI.py hands this flag to serve_stdio()
+    return [sys.executable, os.path.abspath(__file__), WORKER_FLAG]
+
+
+def _start_worker():
+    kwargs = {"creationflags": subprocess.CREATE_NO_WINDOW} if sys.platform == "win32" else {}
+    process = subprocess.Popen(worker_command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, **kwargs)
+    replies = queue.SimpleQueue()
+
+    def read_replies():
+        try:
+            while True:
+                replies.put(pickle.load(process.stdout))
+        except Exception:
+            replies.put(None)  # EOF: the helper exited or was killed
+
+    threading.Thread(target=read_replies, daemon=True).start()
+    try:
+        ready = replies.get(timeout=WORKER_START_TIMEOUT)
+    except queue.Empty:
+        ready = None
+    if ready is None:
+        process.kill()
+        raise RuntimeError("Could not start the regex helper process")
+    return process, replies
+
+
+def _stop_worker():
+    global _worker
+    worker, _worker = _worker, None
+    if worker is not None:
+        process = worker[0]
+        process.kill()
+        process.wait()
+
+
+def warm_up():
+    """Start the helper ahead of the first regex hotkey"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = _start_worker()
+
+
+def run(key, rules, text, timeout_ms=DEFAULT_TIMEOUT_MS):
+    """Apply `rules` (cached in the helper under `key`) to text within timeout_ms"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or _worker[0].poll() is not None:
+            _worker = _start_worker()
+        process, replies = _worker
+        try:
+            pickle.dump((key, rules, text), process.stdin)
+            process.stdin.flush()
+            reply = replies.get(timeout=timeout_ms / 1000)
+        except OSError:
+            reply = None
+        except queue.Empty:
+            _stop_worker()
+            raise RuntimeError(f"Regex rules took longer than {timeout_ms} ms and were stopped")
+        if reply is None:
+            _stop_worker()
+            raise RuntimeError("The regex helper process stopped unexpectedly")
+    status, value = reply
+    if status != "ok":
+        raise ValueError(value)
+    return value
+
+
+def shutdown():
+    with _worker_lock:
+        _stop_worker()
+
+
+atexit.register(shutdown)
+
+
+if __name__ == "__main__":
+    if WORKER_FLAG in sys.argv:
+        serve_stdio()
@@ -0,0 +1,177 @@
+"""
+Sentence case for CaseCon.
+make_sentence_case() returns a renderer that lowercases the text and capitalizes the
+first letter of every sentence, where a sentence starts at the beginning of the text,
+after . ! ? or … followed by whitespace (closing quotes and brackets may sit in between),
+and after a blank line. Abbreviations (Dr., e.g., U.S.) do not end a sentence, the
+pronoun I stays capitalized, and words typed in all caps (NASA) can be kept.
+All sentence starts are found by one regex scan, and stream_sentence_case() applies
+the renderer to a file read in chunks so multi-MB documents never sit in memory whole.
+"""
+import re
+
+from graphemes import COMBINING_MARKS, first_cluster
+
+TERMINATORS = ".!?…"
+CLOSERS = "\"')]}’”»"
+OPENERS = "\"'([{‘“«¿¡"
+# Uppercase letters of the Latin-1, Latin Extended, Greek and Cyrillic blocks
+UPPER_LETTERS = "A-ZÀ-ÖØ-ÞΆΈ-ΏΑ-ΫА-Я"
+
+ABBREVIATIONS = frozenset({
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "mt.", "rev.", "gen.", "capt.", "lt.", "sgt.",
+    "vs.", "cf.", "al.", "approx.", "ca.", "no.", "nos.", "vol.", "fig.", "figs.", "pp.", "ch.", "sec.",
+    "ed.", "eds.", "inc.", "ltd.", "co.", "corp.", "dept.", "est.", "jan.", "feb.", "mar.", "apr.", "jun.",
+    "jul.", "aug.", "sep.", "sept.", "oct.", "nov.", "dec.",
+})
+INITIALS_RE = re.compile(r'(?:[^\W\d_]\.)+')  # J. / U.S. / e.g. / a.m.
+PARAGRAPH_RE = re.compile(r'\n[^\S\n]*\n')
+# A word, with the combining marks \w leaves out, so its first letter is capitalized with its accents
+WORD = rf'[^\W\d_]\w*(?:[{COMBINING_MARKS}]+\w*)*'
+START_RE = re.compile(rf'\s*[{re.escape(OPENERS)}]*(?P<word>{WORD})')
+CONTEXT_CHARS = 64  # text kept from the previous chunk to look back at abbreviations
+MAX_PENDING_CHARS = 1 << 24  # text without whitespace buffered before stream_sentence_case gives up streaming
+
+
+def _pattern(keep_caps, line_breaks, pronoun_i):
+    """
+    One regex for every spot that needs casing other than lower(). Each branch starts with the
+    character it is triggered by, so the whole pattern begins with a single character class and
+    the regex engine skips ahead to candidates instead of trying every position.
+    """
+    terminator = re.escape(TERMINATORS)
+    triggers = terminator + r"\n"
+    new_line = r'\s*' if line_breaks else r'[^\S\n]*\n\s*'
+    branches = [
+        rf"(?P<sentence>(?:(?<=[{terminator}])[{re.escape(CLOSERS)}]{{0,2}}\s+|(?<=\n){new_line})"
+        rf"[{re.escape(OPENERS)}]*(?P<word>{WORD}))",
+    ]
+    if pronoun_i:
+        triggers += "iI"
+        branches.append(r"(?P<pronoun>(?<=(?<!\w)[iI])(?=['’](?:m|ve|d|ll)(?!\w)|(?!['’\w]|\.\w)))")
+    if keep_caps:
+        triggers += UPPER_LETTERS
+        branches.append(rf"(?P<caps>(?<=(?<!\w)[{UPPER_LETTERS}])[{UPPER_LETTERS}\d]*[{UPPER_LETTERS}](?!\w))")
+    return re.compile(f"[{triggers}](?:{'|'.join(branches)})")
+
+
+def _follows_abbreviation(source, start):
+    """True if the word before `start` ends in an abbreviation rather than a sentence"""
+    before = source[max(0, start - CONTEXT_CHARS):start].split()
+    if not before:
+        return False
+    token = before[-1].lstrip(OPENERS).rstrip(CLOSERS)
+    return token.endswith(".") and (token.lower() in ABBREVIATIONS or INITIALS_RE.fullmatch(token) is not None)
+
+
+def make_sentence_case(keep_caps=False, line_breaks=False, upper_char=str.title, lower=str.lower,
+                       pronoun_i=True):
+    """
+    Renderer(text, context="", shouting=None) for sentence case. keep_caps leaves all-caps words
+    alone (unless the whole text is shouting); line_breaks starts a sentence on every line instead
+    of only after blank lines. upper_char/lower let a locale supply its casing rules.
+    context is the text just before `text` when it is one chunk of a longer document, and
+    shouting then says whether that whole document is in capitals (None: decided from `text`).
+    """
+    caps_pattern = _pattern(keep_caps, line_breaks, pronoun_i)
+    plain_pattern = _pattern(False, line_breaks, pronoun_i)
+
+    def case_word(word, starts_sentence, keep):
+        if keep and len(word) > 1 and word.isupper():
+            return word
+        if starts_sentence:
+            head = first_cluster(word)
+            return upper_char(head) + lower(word[len(head):])
+        return lower(word)
+
+    def sentence_case(text, context="", shouting=None):
+        source = context + text if context else text
+        if shouting is None:
+            shouting = text.upper() == text
+        keep = keep_caps and not shouting
+        pattern = caps_pattern if keep else plain_pattern
+        parts = []
+        position = len(context)
+        if not context:
+            match = START_RE.match(source)
+            if match:
+                parts.append(source[:match.start("word")])
+                parts.append(case_word(match.group("word"), True, keep))
+                position = match.end()
+        # A sentence start in this chunk may be triggered by a terminator at the end of context
+        for match in pattern.finditer(source, max(0, position - 3)):
+            start = match.start()
+            if match.end() <= position:
+                continue
+            parts.append(lower(source[position:start]))
+            kind = match.lastgroup
+            if kind == "sentence":
+                word_start = match.start("word")
+                lead = source[start:word_start]
+                new_block = "\n" in lead if line_breaks else PARAGRAPH_RE.search(lead) is not None
+                starts = new_block or not _follows_abbreviation(source, start + 1)
+                parts.append(lower(source[max(start, position):word_start]))
+                parts.append(case_word(match.group("word"), starts, keep))
+            elif kind == "pronoun":
+                parts.append("I")
+            else:
+                parts.append(match.group())  # caps
+            position = match.end()
+        parts.append(lower(source[position:]))
+        return "".join(parts)
+    return sentence_case
+
+
+def _split_point(chunk, trailing):
+    """
+    Offset from the start of `chunk` of the last whitespace run that has a word after it, or None.
+    Only the new chunk is scanned: the text held back before it has no such run of its own and
+    ends in `trailing` whitespace characters, so a run reaching back into it starts -trailing.
+    """
+    end = len(chunk.rstrip())
+    if not end:
+        return None
+    while end and not chunk[end - 1].isspace():
+        end -= 1
+    if not end:  # the last word starts the chunk, after the held-back space or inside a held-back word
+        return -trailing if trailing else None
+    while end and chunk[end - 1].isspace():
+        end -= 1
+    return end or -trailing
+
+
+def stream_sentence_case(chunks, sentence_case, shouting=None):
+    """
+    Yield sentence_case() over an iterable of text chunks with the same result as on their
+    concatenation. Chunks are cut before a whitespace run, so no sentence start is split,
+    and the tail of the previous piece is passed along as context. Once more than
+    MAX_PENDING_CHARS have gone by without whitespace the rest is converted in one call.
+    Whether keep_caps applies depends on the whole text: pass `shouting` (True if it has no
+    lowercase letters at all), or the first piece decides for the rest.
+    """
+    context = ""
+    parts = []  # text held back since the last split; joined once, not copied on every chunk
+    pending = 0
+    trailing = 0  # whitespace at the end of the held-back text
+    for chunk in chunks:
+        split = _split_point(chunk, trailing) if pending <= MAX_PENDING_CHARS else None
+        if split is not None and pending + split > 0:
+            held = "".join(parts)
+            if split >= 0:
+                piece, rest = held + chunk[:split], chunk[split:]
+            else:
+                piece, rest = held[:split], held[split:] + chunk
+            if shouting is None:
+                shouting = piece.upper() == piece
+            yield sentence_case(piece, context, shouting)
+            context = (context + piece[-CONTEXT_CHARS:])[-CONTEXT_CHARS:]
+            parts = [rest]
+            pending = len(rest)
+        else:
+            parts.append(chunk)
+            pending += len(chunk)
+        stripped = len(chunk.rstrip())
+        trailing = trailing + len(chunk) if not stripped else len(chunk) - stripped
+    rest = "".join(parts)
+    if rest:
+        yield sentence_case(rest, context, shouting)
@@ -0,0 +1,107 @@
+"""
+Single-instance guard for CaseCon.
+The first instance owns a per-user IPC endpoint (a named pipe on Windows, a
+unix socket elsewhere). Later launches forward their command to it and exit.
+"""
+import os
+import sys
+import tempfile
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client, answer_challenge, deliver_challenge
+
+AUTHKEY = b"CaseCon-instance"
+FORWARD_ATTEMPTS = 2
+REPLY_TIMEOUT = 2.0  # seconds to wait for the running instance to acknowledge
+COMMAND_TIMEOUT = 5.0  # seconds a connected client has to send its command
+
+
+def get_instance_address():
+    """Per-user endpoint name so different users on one machine do not collide"""
+    user = os.environ.get("USERNAME") or os.environ.get("USER") or "default"
+    domain = os.environ.get("USERDOMAIN", "")
+    if sys.platform == "win32":
+        return rf"\\.\pipe\CaseCon-{domain}-{user}"
+    return os.path.join(tempfile.gettempdir(), f"casecon-{user}.sock")
+
+
+def forward_command(command, address=None):
+    """
+    Send `command` (a list of strings) to the running instance.
+    Returns the instance's reply, or None if no instance is listening.
+    """
+    address = address or get_instance_address()
+    try:
+        conn = Client(address, authkey=AUTHKEY)
+    except OSError:
+        return None
+    try:
+        conn.send(list(command))
+        if conn.poll(REPLY_TIMEOUT):
+            return conn.recv()
+        return "timeout"  # the instance exists but is busy; do not start another one
+    finally:
+        conn.close()
+
+
+def acquire_instance_lock(command, address=None):
+    """
+    Become the primary instance or hand `command` over to the existing one.
+    Returns a Listener when this process is the primary instance, or None
+    after the command has been forwarded (the caller should exit).
+    The listener does not authenticate by itself: serve_commands() does it per connection.
+    """
+    address = address or get_instance_address()
+    for attempt in range(FORWARD_ATTEMPTS):
+        if forward_command(command, address) is not None:
+            return None
+        if sys.platform != "win32" and os.path.exists(address):
+            # Nobody answered on the socket file, so it was left behind by a crash
+            os.remove(address)
+        try:
+            # On Windows the first pipe instance is created exclusively, so a
+            # second Listener on the same name fails instead of sharing it.
+            return Listener(address)
+        except OSError:
+            if attempt == FORWARD_ATTEMPTS - 1:
+                raise
+    return None
+
+
+def _handle_connection(conn, handler, on_error):
+    try:
+        deliver_challenge(conn, AUTHKEY)
+        answer_challenge(conn, AUTHKEY)
+        if not conn.poll(COMMAND_TIMEOUT):
+            raise TimeoutError(f"no command within {COMMAND_TIMEOUT:g}s")
+        command = conn.recv()
+        conn.send(handler(command))
+    except AuthenticationError as e:
+        # A stray client that does not know the key
+        if on_error:
+            on_error(f"Rejected instance connection: {str(e)}")
+    except Exception as e:
+        if on_error:
+            on_error(f"Failed to handle forwarded command: {str(e)}")
+    finally:
+        conn.close()
+
+
+def serve_commands(listener, handler, on_error=None):
+    """
+    Accept forwarded commands on a daemon thread.
+    `handler(command)` must return quickly; its return value is sent back as the reply.
+    Each connection is authenticated and read on a thread of its own, so a client that
+    connects and then stalls cannot hold up later launches.
+    """
+    def serve():
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception:
+                return  # listener closed on shutdown
+            threading.Thread(target=_handle_connection, args=(conn, handler, on_error), daemon=True).start()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,118 @@
+"""
+URL slugs and file names for CaseCon.
+make_slugify() returns a renderer that turns every line into a slug such as
+"cafe-ellinika-privet-mir": letters are lowercased and transliterated (Cyrillic, Greek
+and the Latin letters that do not decompose, like ß, ø, ł), accents are stripped after
+NFKD normalization, apostrophes are dropped (don't -> dont), and each run of other
+punctuation and whitespace becomes one hyphen.
+Letters without a transliteration (CJK, ...) are kept. An optional maximum length cuts
+at the last hyphen that fits.
+NFKD, transliteration and separator detection are precompiled into one dense
+str.translate table for the Latin, Greek, Cyrillic and punctuation blocks, built on first
+use so importing the module stays cheap; most text is then slugged by lower(), a single
+translate() and two literal-led regex substitutions. Characters beyond the table are
+looked up once and cached.
+"""
+import re
+import unicodedata
+
+# Letters that NFKD would split into a base letter and a mark that matters for transliteration
+COMPOSED = {
+    "й": "y", "ё": "yo", "ї": "yi", "ў": "u", "ѓ": "gj", "ќ": "kj", "ѝ": "i",
+}
+CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh", "з": "z", "и": "i", "к": "k",
+    "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+    "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "", "э": "e",
+    "ю": "yu", "я": "ya", "є": "ye", "і": "i", "ґ": "g", "ђ": "dj", "ј": "j", "љ": "lj", "њ": "nj",
+    "ћ": "c", "џ": "dz", "ѕ": "dz",
+}
+GREEK = {
+    "α": "a", "β": "v", "γ": "g", "δ": "d", "ε": "e", "ζ": "z", "η": "i", "θ": "th", "ι": "i", "κ": "k",
+    "λ": "l", "μ": "m", "ν": "n", "ξ": "x", "ο": "o", "π": "p", "ρ": "r", "σ": "s", "ς": "s", "τ": "t",
+    "υ": "y", "φ": "f", "χ": "ch", "ψ": "ps", "ω": "o",
+}
+LATIN = {
+    "ß": "ss", "æ": "ae", "ø": "o", "œ": "oe", "đ": "d", "ð": "d", "þ": "th", "ł": "l", "ı": "i",
+    "ħ": "h", "ŧ": "t", "ŋ": "ng", "ſ": "s", "ĸ": "k",
+}
+TRANSLITERATIONS = {**CYRILLIC, **GREEK, **LATIN}
+# Code points below this get a precompiled entry: Latin, IPA, Greek, Cyrillic, Latin Extended
+# Additional (Vietnamese), Greek Extended and General Punctuation
+TABLE_SIZE = 0x2070
+
+SEPARATOR = "-"
+APOSTROPHES = "'’ʼ"  # removed rather than turned into a separator, as in "dont"
+HYPHENS_RE = re.compile(r'-{2,}')
+LINE_EDGE_RE = re.compile(r'-(?=[\r\n])|(?<=[\r\n])-')
+OUTSIDE_TABLE_RE = re.compile(r'[^\x00-\x7f]+')  # non-ASCII left after translate(): CJK, emoji, ...
+
+
+def transliterate(char):
+    """Slug text for one lowercase character: NFKD, transliteration, no marks or apostrophes, separators as "-"."""
+    decomposed = unicodedata.normalize("NFKD", COMPOSED.get(char, char))
+    parts = []
+    for part in decomposed:
+        if unicodedata.combining(part) or part in APOSTROPHES:
+            continue
+        part = TRANSLITERATIONS.get(part, part)
+        if part in "\r\n":
+            parts.append(part)  # slugs are made line by line
+        elif not part.isalnum():
+            parts.append(SEPARATOR)
+        else:
+            parts.append(part)
+    return "".join(parts)
+
+
+def compile_table(size=TABLE_SIZE):
+    """Dense translate table indexed by code point (a list beats a dict for whole blocks)"""
+    return [transliterate(chr(code)) for code in range(size)]
+
+
+_table = {"table": None}
+_outside = {}  # slug text of characters beyond TABLE_SIZE, filled as they are met
+
+
+def _translate_table():
+    table = _table["table"]
+    if table is None:
+        table = _table["table"] = compile_table()
+    return table
+
+
+def _outside_char(char):
+    slug = _outside.get(char)
+    if slug is None:
+        if unicodedata.combining(char):
+            slug = ""
+        elif ord(unicodedata.normalize("NFKD", char)[0]) < TABLE_SIZE:
+            slug = transliterate(char)  # compatibility forms: ﬁ, fullwidth Ａ, ...
+        else:
+            slug = char if char.isalnum() else SEPARATOR  # kept whole so ガ keeps its voicing mark
+        _outside[char] = slug
+    return slug
+
+
+def _outside_table(match):
+    return "".join(map(_outside_char, match.group()))
+
+
+def make_slugify(max_length=0):
+    """Renderer turning each line into a slug of at most max_length characters (0 = no limit)"""
+    long_line_re = re.compile(r'^[^\r\n]{%d,}' % (max_length + 1), re.M) if max_length else None
+
+    def trim(match):
+        slug = match.group()
+        cut = slug.rfind(SEPARATOR, 0, max_length + 1)
+        return slug[:cut] if cut > 0 else slug[:max_length]
+
+    def slugify(text):
+        slug = text.lower().translate(_translate_table())
+        if not slug.isascii():
+            slug = OUTSIDE_TABLE_RE.sub(_outside_table, slug)
+        slug = LINE_EDGE_RE.sub("", HYPHENS_RE.sub(SEPARATOR, slug)).strip(SEPARATOR)
+        if long_line_re is not None:
+            slug = long_line_re.sub(trim, slug)
+        return slug
+    return slugify
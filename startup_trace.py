@@ -0,0 +1,124 @@
+"""
+Startup trace for CaseCon.
+Milestones are recorded on every launch (one list append each) and written to
+casecon_startup_trace.log only when tracing is enabled with --trace-startup or
+CASECON_TRACE_STARTUP=1.
+"""
+import os
+import sys
+import time
+import datetime
+
+TRACE_FILE = "casecon_startup_trace.log"
+
+_marks = [("python_main", time.perf_counter())]
+_enabled = os.environ.get("CASECON_TRACE_STARTUP", "") not in ("", "0")
+_written = False
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def mark(label):
+    """Record a milestone. Cheap enough to leave in the normal start-up path."""
+    _marks.append((label, time.perf_counter()))
+
+
+def get_build_kind():
+    """'source', 'onefile' or 'onedir'"""
+    if not getattr(sys, "frozen", False):
+        return "source"
+    meipass = getattr(sys, "_MEIPASS", "")
+    # onefile unpacks into a temporary _MEIxxxxxx directory on every launch
+    if os.path.basename(os.path.normpath(meipass)).startswith("_MEI"):
+        return "onefile"
+    return "onedir"
+
+
+def get_trace_path():
+    """Next to the executable when frozen: a onefile build runs from a temp dir that is deleted on exit"""
+    if os.environ.get("CASECON_TRACE_FILE"):
+        return os.environ["CASECON_TRACE_FILE"]
+    if getattr(sys, "frozen", False):
+        return os.path.join(os.path.dirname(sys.executable), TRACE_FILE)
+    return os.path.abspath(TRACE_FILE)
+
+
+def _process_age_seconds(pid=None):
+    """Seconds since the given process (default: this one) was created. Windows only, None elsewhere."""
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    # Private WinDLL instance so these prototypes do not leak into other ctypes users
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.GetProcessTimes.argtypes = [wintypes.HANDLE] + [ctypes.POINTER(wintypes.FILETIME)] * 4
+    kernel32.GetSystemTimeAsFileTime.argtypes = [ctypes.POINTER(wintypes.FILETIME)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    if pid is None:
+        handle = kernel32.GetCurrentProcess()
+    else:
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+    try:
+        creation, exit_time, kernel_time, user_time = (wintypes.FILETIME() for _ in range(4))
+        if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                                        ctypes.byref(kernel_time), ctypes.byref(user_time)):
+            return None
+        now = wintypes.FILETIME()
+        kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+        to_int = lambda ft: (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+        return (to_int(now) - to_int(creation)) / 10_000_000  # FILETIME ticks are 100 ns
+    finally:
+        if pid is not None:
+            kernel32.CloseHandle(handle)
+
+
+def get_process_marks():
+    """
+    Milestones from before Python ran: process creation and, for onefile builds,
+    the bootloader parent that unpacked the archive. Returned on the perf_counter clock.
+    """
+    marks = []
+    now = time.perf_counter()
+    if get_build_kind() == "onefile":
+        parent_age = _process_age_seconds(os.getppid())
+        if parent_age is not None:
+            marks.append(("bootloader_start", now - parent_age))
+    own_age = _process_age_seconds()
+    if own_age is not None:
+        label = "bootloader_handoff" if get_build_kind() == "onefile" else "process_start"
+        marks.append((label, now - own_age))
+    return marks
+
+
+def write_trace(final_label=None):
+    """Append this launch's milestones to the trace file (once per run)"""
+    global _written
+    if final_label:
+        mark(final_label)
+    if not _enabled or _written:
+        return None
+    _written = True
+    marks = sorted(get_process_marks() + _marks, key=lambda m: m[1])
+    origin = marks[0][1]
+    path = get_trace_path()
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"# CaseCon startup trace {timestamp} build={get_build_kind()} pid={os.getpid()}\n")
+            previous = origin
+            for label, t in marks:
+                f.write(f"{(t - origin) * 1000:10.1f} ms {(t - previous) * 1000:+9.1f} ms  {label}\n")
+                previous = t
+    except OSError:
+        return None
+    return path
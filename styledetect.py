@@ -0,0 +1,133 @@
+"""
+Case-style detection for CaseCon.
+classify_style() reads a line once, crossing off the styles each character rules
+out, and stops as soon as none is left ("mixed"). style_report() runs it over
+every line of a batch, e.g. a list of identifiers.
+
+Report on files from the command line with:
+    python styledetect.py identifiers.txt [--lines]
+"""
+import sys
+
+from titlestyle import STYLES as TITLE_STYLES
+
+STYLES = ("snake", "kebab", "camel", "pascal", "macro", "title", "sentence", "upper", "lower")
+SNAKE, KEBAB, CAMEL, PASCAL, MACRO, TITLE, SENTENCE, UPPER, LOWER = (1 << i for i in range(len(STYLES)))
+ALL = (1 << len(STYLES)) - 1
+IDENTIFIER = SNAKE | KEBAB | CAMEL | PASCAL | MACRO
+PROSE = TITLE | SENTENCE | UPPER | LOWER
+
+# Words a title keeps lowercase after its first word ("The Lord of the Rings"), in any title style
+MINOR_WORDS = frozenset().union(*(style["minor"] for style in TITLE_STYLES.values()))
+TRAILING_PUNCTUATION = ",;:.!?)]}\"'’”"
+
+# Tie-breaks when several styles fit: separators decide first, then the richer casing patterns
+PREFERENCE = [(SNAKE, "snake"), (MACRO, "macro"), (KEBAB, "kebab"), (CAMEL, "camel"), (PASCAL, "pascal"),
+              (UPPER, "upper"), (LOWER, "lower"), (TITLE, "title"), (SENTENCE, "sentence")]
+
+
+def classify_style(line):
+    """One of STYLES or "mixed" for a single line (surrounding whitespace is ignored)"""
+    possible = ALL
+    first_letter = True
+    word_start = True  # no letter or digit yet since the last whitespace
+    seen = 0  # bits: 1 underscore, 2 hyphen, 4 uppercase after the first letter, 8 lowercase
+    lower_start = -1  # start of the current lowercase word after the first; a minor word keeps TITLE
+    line = line.strip()
+    for index, char in enumerate(line):
+        if char.isupper():
+            possible &= ~(SNAKE | KEBAB | LOWER)
+            if first_letter:
+                possible &= ~CAMEL
+            elif word_start:
+                possible &= ~SENTENCE
+                seen |= 4
+            else:
+                possible &= ~(TITLE | SENTENCE)
+                seen |= 4
+            first_letter = word_start = False
+        elif char.islower():
+            possible &= ~(MACRO | UPPER)
+            if first_letter:
+                possible &= ~(PASCAL | TITLE | SENTENCE)
+            elif word_start:
+                lower_start = index
+            first_letter = word_start = False
+            seen |= 8
+        elif char.isspace():
+            possible &= ~IDENTIFIER
+            if lower_start >= 0 and not _is_minor(line[lower_start:index]):
+                possible &= ~TITLE
+            lower_start = -1
+            word_start = True
+        elif char == "_":
+            possible &= ~(KEBAB | CAMEL | PASCAL | TITLE | SENTENCE)
+            seen |= 1
+        elif char == "-":
+            possible &= ~(SNAKE | MACRO | CAMEL | PASCAL)
+            seen |= 2
+        elif char.isdigit():
+            word_start = False
+        else:
+            possible &= ~IDENTIFIER  # punctuation only appears in prose
+        if not possible:
+            return "mixed"
+
+    if first_letter:
+        return "mixed"  # no letters at all
+    if lower_start >= 0:
+        possible &= ~TITLE  # the last word of a title is capitalized even when it is minor
+    if not seen & 1:
+        possible &= ~(SNAKE | MACRO)
+    if not seen & 2:
+        possible &= ~KEBAB
+    if not seen & 4:
+        possible &= ~(CAMEL | PASCAL)
+    elif not seen & 8:
+        possible &= ~PASCAL
+    for bit, name in PREFERENCE:
+        if possible & bit:
+            return name
+    return "mixed"
+
+
+def _is_minor(word):
+    return word in MINOR_WORDS or word.rstrip(TRAILING_PUNCTUATION) in MINOR_WORDS
+
+
+def style_report(text):
+    """{style: number of lines} over the non-blank lines of text, most common first"""
+    counts = {}
+    for line in text.splitlines():
+        if line.strip():
+            style = classify_style(line)
+            counts[style] = counts.get(style, 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+
+def format_report(report):
+    total = sum(report.values())
+    if not total:
+        return "No text to classify."
+    return "\n".join(f"{style:<10}{count:>8}  {count / total:6.1%}" for style, count in report.items())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report the case style of every line in text files")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--lines", action="store_true", help="print each line with its style")
+    args = parser.parse_args()
+
+    totals = {}
+    for path in args.files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        if args.lines:
+            for line in text.splitlines():
+                if line.strip():
+                    print(f"{classify_style(line):<10}{line}")
+        for style, count in style_report(text).items():
+            totals[style] = totals.get(style, 0) + count
+    print(format_report(dict(sorted(totals.items(), key=lambda item: -item[1]))), file=sys.stderr if args.lines else sys.stdout)
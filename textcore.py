@@ -1,45 +1,93 @@
 import re
 import keyboard
-import pyperclip
 import time
 import json
 import os
 import ctypes
+import threading
+from latency import span
+import metrics
+import localecase
+import titlestyle
+import sentencestyle
+import slugs
+import graphemes
+from styledetect import classify_style
 
 CONFIG_FILE = "settings.json"
 
 
 # -------------------- Text Modes --------------------
+# The identifier styles convert every line on its own: whitespace between words becomes the separator
+# while indentation, trailing whitespace and line breaks are kept, so a selected column of names stays
+# a column. With the "identifier_cells" setting each tab or comma separated cell is converted apart.
+CELL_DELIMITERS = {"": "", "tab": "\t", "comma": ","}
+
+
+def layout_patterns(delimiters=""):
+    """(whitespace between the words of a cell, trimmed content of a cell) for cells split at `delimiters`"""
+    d = re.escape(delimiters)
+    space = rf'[^\S\r\n{d}]'
+    # Starts with the space class (the lookbehind follows it) so the regex engine skips to candidates
+    inner_space = re.compile(rf'{space}(?<=[^\s{d}]{space}){space}*(?=[^\s{d}])')
+    content = re.compile(rf'[^\s{d}](?:[^\r\n{d}]*[^\s{d}])?')
+    return inner_space, content
+
+
+INNER_SPACE_RE, LINE_CONTENT_RE = layout_patterns()
+
+
+def _pascal_words(match):
+    return ''.join(word.capitalize() for word in match.group().split())
+
+
 class TextModes:
     @staticmethod
     def macro_case(text):
-        return re.sub(r'\s+', '_', text).upper()
+        return INNER_SPACE_RE.sub('_', text).upper()
 
     @staticmethod
     def snake_case(text):
-        return re.sub(r'\s+', '_', text).lower()
+        return INNER_SPACE_RE.sub('_', text).lower()
 
     @staticmethod
     def pascal_case(text):
-        return ''.join(word.capitalize() for word in text.split())
+        return LINE_CONTENT_RE.sub(_pascal_words, text)
 
     @staticmethod
     def kebab_case(text):
-        return re.sub(r'\s+', '-', text).lower()
+        return INNER_SPACE_RE.sub('-', text).lower()
+
+
+def make_identifier_modes(delimiters="", upper=str.upper, lower=str.lower, capitalize=str.capitalize):
+    """TextModes' four identifier styles for another cell layout and/or a locale's casing"""
+    inner_space, content = layout_patterns(delimiters)
+
+    def pascal_words(match):
+        return ''.join(capitalize(word) for word in match.group().split())
+    return {
+        "macrocase": lambda text: upper(inner_space.sub('_', text)),
+        "snakecase": lambda text: lower(inner_space.sub('_', text)),
+        "pascalcase": lambda text: content.sub(pascal_words, text),
+        "kebabcase": lambda text: lower(inner_space.sub('-', text)),
+    }
 
 
 # -------------------- Modes Dictionary --------------------
 MODES = {
     "uppercase": str.upper,
     "lowercase": str.lower,
-    "titlecase": str.title,
-    "sentencecase": str.capitalize,
+    "titlecase": titlestyle.make_title_case(),
+    "sentencecase": sentencestyle.make_sentence_case(),
     "macrocase": TextModes.macro_case,
     "snakecase": TextModes.snake_case,
     "pascalcase": TextModes.pascal_case,
     "kebabcase": TextModes.kebab_case,
-    # NOTE: "count" and "launch" are intentionally NOT in MODES because they do not transform text.
+    # NOTE: "count", "launch", "cycle", "stylereport" and "textstats" are intentionally NOT in MODES because they
+    # do not transform text themselves ("cycle" steps through the modes listed in the "cycle_modes" setting).
+    # "smarttoggle" is added below its classifier-driven implementation.
 }
+HOTKEY_ACTIONS = ("count", "launch", "cycle", "stylereport", "textstats")
 
 
 # -------------------- Helpers for scancodes --------------------
@@ -79,7 +127,9 @@ def load_json():
             "pascalcase": "P",
             "kebabcase": "K",
             "count": "C",  # Changed to C
-            "launch": "V"  # Changed to V
+            "launch": "V",  # Changed to V
+            "cycle": "X",
+            "smarttoggle": "G"
         }
 
         default_shortcuts = {}
@@ -96,7 +146,9 @@ def load_json():
                     "P": 25,
                     "K": 37,
                     "C": 46,  # Changed to C
-                    "V": 47   # Changed to V
+                    "V": 47,  # Changed to V
+                    "X": 45,
+                    "G": 34
                 }[char]
                 sc = fallback_sc
             default_shortcuts[mode] = f"{CTRL_SC}+{WIN_SC}+{ALT_SC}+{sc}"
@@ -104,7 +156,8 @@ def load_json():
         default_settings = {
             "shortcuts": default_shortcuts,
             "start_with_windows": 1,
-            "start_hidden_tray": 0
+            "start_hidden_tray": 0,
+            "cycle_modes": list(DEFAULT_CYCLE_MODES)
         }
 
         with open(CONFIG_FILE, "w", encoding="utf-8") as f:
@@ -145,51 +198,1063 @@ def update_setting(key, value):
     save_json(data)
 
 
+# -------------------- Cleanup Modes --------------------
+# Modes that tidy text instead of recasing it. They are MODES entries like any other (hotkeys, buttons,
+# --convert) and can prefix any mode with "+", e.g. "cleanup+snakecase" or "plainquotes+trim+titlecase"
+# as a shortcut name or on the command line. A chain is run as a pipeline, so the cleanup ops fuse into
+# the pass that follows instead of each scanning the whole text (see _segments).
+# "cleanup" runs the steps in the "cleanup_steps" setting; collapsewhitespace is not among the
+# defaults because it joins lines.
+WHITESPACE_RE = re.compile(r'\s+')
+PLAIN_QUOTES = str.maketrans({"‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'",
+                              "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"'})
+PLAIN_DASHES = str.maketrans(dict.fromkeys("‐‑‒–—―−", "-"))
+# Zero-width (non-)joiners are kept: emoji sequences and several scripts depend on them
+ZERO_WIDTH = str.maketrans(dict.fromkeys("\u200b\u2060\ufeff\u180e\u00ad"))
+
+
+def fix_line_endings(text):
+    """CRLF and lone CR line breaks -> LF"""
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+
+CLEANUP_MODES = {
+    "trim": str.strip,
+    "collapsewhitespace": lambda text: WHITESPACE_RE.sub(' ', text),
+    "plainquotes": lambda text: text.translate(PLAIN_QUOTES),
+    "plaindashes": lambda text: text.translate(PLAIN_DASHES),
+    "removezerowidth": lambda text: text.translate(ZERO_WIDTH),
+    "fixlineendings": fix_line_endings,
+}
+DEFAULT_CLEANUP_STEPS = ("removezerowidth", "fixlineendings", "plainquotes", "plaindashes", "trim")
+
+cleanup_options = {"steps": DEFAULT_CLEANUP_STEPS, "first": False}  # first: clean up before every conversion
+
+MODES.update(CLEANUP_MODES)
+MODES["cleanup"] = lambda text: compile_pipeline(cleanup_options["steps"])(text)
+
+
+# -------------------- Pipelines --------------------
+# A pipeline is a named list of steps in the "pipelines" setting (read by register_pipelines), e.g.
+#   "pipelines": {"const_name": ["trim", "collapsewhitespace", "snakecase", "uppercase"]}
+# and is bound to a shortcut like any mode (shortcuts["const_name"]). Steps are MODES entries,
+# "<mode>@<locale>" or the pipeline-only steps below. Each step is expanded into primitive ops:
+#   ("map", table)      str.translate with a table whose keys are all non-ASCII (quotes, dashes, ...)
+#   ("newlines", None)  CRLF and lone CR line breaks -> LF
+#   ("strip", None)     trim surrounding whitespace
+#   ("space", sep)      replace every whitespace run with sep
+#   ("case", func)      str.upper / str.lower
+#   ("call", func)      anything else, run as-is
+# These ops commute, so each run of them is fused into at most one translate, one line-ending pass,
+# one strip, one regex pass and one case pass (later case ops replace earlier ones). _segments starts
+# a new run where that would not be exact; two case ops only commute for ASCII (lower(upper("ß"))
+# is "ss"), so such a run falls back on other text to the ops one by one, which gives exactly what
+# pressing the shortcuts in sequence would.
+PIPELINE_STEPS = {
+    "segment": lambda text: segment_joined_words(text),  # getuserbyid -> get user by id
+}
+
+STEP_OPS = {
+    "uppercase": (("case", str.upper),),
+    "lowercase": (("case", str.lower),),
+    "trim": (("strip", None),),
+    "collapsewhitespace": (("space", " "),),
+    "plainquotes": (("map", PLAIN_QUOTES),),
+    "plaindashes": (("map", PLAIN_DASHES),),
+    "removezerowidth": (("map", ZERO_WIDTH),),
+    "fixlineendings": (("newlines", None),),
+}
+STEP_OPS["cleanup"] = tuple(op for step in DEFAULT_CLEANUP_STEPS for op in STEP_OPS[step])
+
+
+def expand_steps(steps):
+    """Primitive ops for a list of step names. Raises ValueError for unknown steps."""
+    ops = []
+    for step in steps:
+        if step in STEP_OPS and uses_default_casing(step):
+            ops.extend(STEP_OPS[step])
+        elif step in MODES:
+            ops.append(("call", MODES[step]))
+        elif step in PIPELINE_STEPS:
+            ops.append(("call", PIPELINE_STEPS[step]))
+        elif "@" in step:
+            base, _, locale = step.partition("@")
+            ops.append(("call", localized_mode(base, locale.lower(), current_locale["capital_sharp_s"])))
+        else:
+            raise ValueError(f"Unknown pipeline step: {step!r}")
+    return ops
+
+
+def _op_function(kind, arg):
+    if kind == "map":
+        return lambda text: text.translate(arg)
+    if kind == "newlines":
+        return fix_line_endings
+    if kind == "strip":
+        return str.strip
+    if kind == "space":
+        return lambda text: WHITESPACE_RE.sub(arg, text)
+    return arg
+
+
+def _compose_tables(first, second):
+    """translate table doing `first`, then `second`"""
+    return {**second, **{key: value and value.translate(second) for key, value in first.items()}}
+
+
+def _fused_function(table, newlines, strip, sep, case):
+    def fused(text):
+        if table is not None and not text.isascii():
+            text = text.translate(table)
+        if newlines and sep is None:  # a whitespace pass replaces the line breaks anyway
+            text = fix_line_endings(text)
+        if strip:
+            text = text.strip()
+        if sep is not None:
+            text = WHITESPACE_RE.sub(sep, text)
+        if case is not None:
+            text = case(text)
+        return text
+    return fused
+
+
+def _segments(ops):
+    """
+    Split ops into [(fused_func, [exact_funcs], fused_is_exact)] at points where fusion is not exact;
+    fused_is_exact is False where the fused function is only exact for ASCII text.
+    """
+    segments = []
+    current = None  # [table, newlines, strip, sep, case, exact_funcs, case ops]
+
+    def flush():
+        if current is not None:
+            segments.append((_fused_function(*current[:5]), current[5], current[6] < 2))
+
+    for kind, arg in ops:
+        if kind == "call":
+            flush()
+            segments.append((arg, [arg], True))
+            current = None
+            continue
+        if kind == "map" and current is not None and (
+                current[6] or (None in arg.values() and (current[2] or current[3] is not None))):
+            # The fused function maps first: not exact after a case op (Greek final sigma looks at
+            # the next character), nor deleting characters after whitespace was trimmed or collapsed
+            flush()
+            current = None
+        if current is None:
+            current = [None, False, False, None, None, [], 0]
+        table, newlines, strip, sep, case, exact, cases = current
+        exact.append(_op_function(kind, arg))
+        if kind == "map":
+            current[0] = arg if table is None else _compose_tables(table, arg)
+        elif kind == "newlines":
+            current[1] = True
+        elif kind == "case":
+            current[4] = arg
+            current[6] += 1
+        elif kind == "space":
+            if sep is None or sep == " ":
+                current[3] = arg
+            # after a non-space separator no whitespace is left to replace
+        elif sep is None or sep == " ":
+            current[2] = True
+            # after a non-space separator there is no whitespace left to trim
+    flush()
+    return segments
+
+
+_compiled_pipelines = {}  # tuple(steps) -> segments
+
+
+def compile_pipeline(steps):
+    """Cached callable(text) that runs `steps` in a single call"""
+    key = tuple(steps)
+    segments = _compiled_pipelines.get(key)
+    if segments is None:
+        segments = _compiled_pipelines[key] = _segments(expand_steps(key))
+
+    def run(text):
+        for fused, exact, fused_is_exact in segments:
+            if fused_is_exact or text.isascii():  # isascii() is O(1) in CPython
+                text = fused(text)
+            else:
+                for func in exact:
+                    text = func(text)
+        return text
+    return run
+
+
+def set_cleanup_steps(steps=None):
+    """Rebuild "cleanup" from a list of CLEANUP_MODES names. Raises ValueError for anything else."""
+    steps = tuple(steps or DEFAULT_CLEANUP_STEPS)
+    unknown = [step for step in steps if step not in CLEANUP_MODES]
+    if unknown:
+        raise ValueError(f"cleanup_steps can only hold {', '.join(CLEANUP_MODES)} "
+                         f"(not {', '.join(repr(step) for step in unknown)})")
+    cleanup_options["steps"] = steps
+    STEP_OPS["cleanup"] = tuple(op for step in steps for op in STEP_OPS[step])
+    _compiled_pipelines.clear()
+    with precompute_lock:
+        precomputed["text"] = None
+
+
+def set_cleanup_first(enabled):
+    """Turn "Clean up text before converting" on or off for with_cleanup()"""
+    cleanup_options["first"] = bool(enabled)
+    with precompute_lock:
+        precomputed["text"] = None  # rendered under the other setting
+
+
+def with_cleanup(mode):
+    """`mode` with the cleanup steps in front when "Clean up text before converting" is on"""
+    if not cleanup_options["first"] or mode == "cleanup" or mode in CLEANUP_MODES:
+        return mode
+    return "cleanup+" + mode
+
+
+# Declared in the "pipelines" setting, each a list of steps run as one mode on one shortcut, e.g.
+#   "pipelines": {
+#       "tidyconstant": ["trim", "collapsewhitespace", "snakecase", "uppercase"]
+#   }
+# Steps are mode names (see expand_steps); the shortcut row shows "NONE" until a key is recorded.
+pipelines = {}  # name -> steps, for everything register_pipelines() accepted
+
+
+def register_pipelines(specs):
+    """
+    Replace the registered pipelines with `specs` ({name: [step, ...]}), read once from settings
+    instead of on every hotkey. Register the modes they use first. Returns a list of error messages.
+    """
+    errors = []
+    pipelines.clear()
+    _compiled_pipelines.clear()
+    if not isinstance(specs, dict):
+        return errors
+    for name, steps in specs.items():
+        if name in MODES or name in HOTKEY_ACTIONS:
+            errors.append(f"Pipeline {name!r} clashes with an existing mode")
+            continue
+        if not isinstance(steps, list) or not steps or not all(isinstance(step, str) for step in steps):
+            errors.append(f"Pipeline {name!r} must be a list of step names")
+            continue
+        try:
+            expand_steps(steps)
+        except ValueError as e:
+            errors.append(f"Pipeline {name!r}: {e}")
+            continue
+        pipelines[name] = list(steps)
+    return errors
+
+
+def get_pipelines():
+    return pipelines
+
+
+# -------------------- Tokenizer --------------------
+# Words are runs of letters/digits; inside a run, camelCase and ACRONYMWord boundaries split it
+# (trailing digits stay on their word): "parseHTTPResponse_v2 body" -> parse HTTP Response v2 body.
+# Outside ASCII a run also takes the combining and spacing marks \w leaves out, so accents written
+# as separate code points and Indic vowel signs stay on their letters (graphemes.mark_class()).
+CHUNK_RE = re.compile(r'[^\W_]+')
+WORD_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])\d*|[A-Z]?[a-z]+\d*|[A-Z]+\d*|\d+')
+
+_unicode_chunk_re = {"re": None}  # compiled on first non-ASCII text: the mark class needs the property table
+
+
+def _next_letter(chunk, index):
+    """First letter or digit of chunk[index:], skipping marks ("" at the end)"""
+    return next((char for char in chunk[index:] if char.isalnum()), "")
+
+
+def _split_unicode_chunk(chunk):
+    """Camel-case split for a chunk with non-ASCII letters (the regex above only knows ASCII case)"""
+    words = []
+    start = 0
+    prev = chunk[0]  # the last letter or digit: a mark belongs to the character before it
+    for i in range(1, len(chunk)):
+        char = chunk[i]
+        if not char.isalnum():
+            continue
+        if char.isupper() and (prev.islower() or (prev.isupper() and _next_letter(chunk, i + 1).islower())):
+            words.append(chunk[start:i])
+            start = i
+        elif char.isalpha() and prev.isdigit():
+            words.append(chunk[start:i])
+            start = i
+        prev = char
+    words.append(chunk[start:])
+    return words
+
+
+def tokenize(text):
+    """Split text (one identifier or phrase) into words"""
+    if text.isascii():
+        return WORD_RE.findall(text)  # separators are simply skipped between matches
+    chunk_re = _unicode_chunk_re["re"]
+    if chunk_re is None:
+        marks = graphemes.mark_class()
+        chunk_re = _unicode_chunk_re["re"] = re.compile(rf'[^\W_]+(?:[{marks}]+[^\W_]*)*')
+    words = []
+    for chunk in chunk_re.findall(text):
+        if chunk.isascii():
+            words.extend(WORD_RE.findall(chunk))
+        else:
+            words.extend(_split_unicode_chunk(chunk))
+    return words
+
+
+# -------------------- Custom Modes --------------------
+# Declared in the "custom_modes" setting, e.g.
+#   "custom_modes": {
+#       "camelcase": {"separator": "", "first": "lower", "rest": "capitalize", "acronyms": "preserve",
+#                     "label": "camelCase"},
+#       "dotcase": {"separator": ".", "first": "lower", "label": "dot.case"},
+#       "pathcase": {"separator": "/", "first": "lower", "label": "path/case"},
+#       "traincase": {"separator": "-", "first": "capitalize", "label": "Train-Case"}
+#   }
+# first/rest: "lower", "upper", "capitalize" or "keep". acronyms: "normalize" (default, case them
+# like any word) or "preserve" (leave all-caps words such as HTTP untouched). "segment": true also
+# splits joined single-case words with the segment dictionary (getuserbyid -> get, user, by, id).
+# Each line is converted on its own so a selected list of names stays a list; indentation is kept.
+WORD_CASES = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "capitalize": str.capitalize,
+    "keep": None,
+}
+LINE_RE = re.compile(r'[^\r\n]+')
+
+custom_modes = {}  # name -> spec, for everything register_custom_modes() added to MODES
+
+
+def compile_custom_mode(spec):
+    """Build a renderer for one spec. Raises ValueError for unknown options."""
+    separator = str(spec.get("separator", ""))
+    first_case = spec.get("first", "lower")
+    rest_case = spec.get("rest", first_case)
+    acronyms = spec.get("acronyms", "normalize")
+    segment = spec.get("segment", False)
+    if first_case not in WORD_CASES or rest_case not in WORD_CASES:
+        raise ValueError(f"word case must be one of {', '.join(WORD_CASES)}")
+    if acronyms not in ("normalize", "preserve"):
+        raise ValueError("acronyms must be 'normalize' or 'preserve'")
+    if not isinstance(segment, bool):
+        raise ValueError("segment must be true or false")
+    first, rest = WORD_CASES[first_case], WORD_CASES[rest_case]
+
+    # Pick the cheapest join for the spec once, instead of deciding per word
+    if acronyms == "normalize" and first is rest and first is not str.capitalize:
+        if first is None:
+            def render_words(words):
+                return separator.join(words)
+        else:
+            def render_words(words):
+                return first(separator.join(words))
+    elif acronyms == "normalize":
+        first = first or str
+        rest = rest or str
+
+        def render_words(words):
+            return separator.join([first(words[0]), *map(rest, words[1:])])
+    else:
+        def case_word(func, word):
+            if func is None or (len(word) > 1 and word.isupper()):
+                return word
+            return func(word)
+
+        def render_words(words):
+            return separator.join([case_word(first, words[0])] + [case_word(rest, w) for w in words[1:]])
+
+    def render_line(match):
+        line = match.group()
+        words = tokenize(line)
+        if segment and word_segmenter["segment"] is not None:
+            words = [piece for word in words for piece in word_segmenter["segment"](word)]
+        if not words:
+            return line
+        stripped = line.lstrip()
+        return line[:len(line) - len(stripped)] + render_words(words)
+
+    def render(text):
+        return LINE_RE.sub(render_line, text)
+    return render
+
+
+# -------------------- Word Segmentation --------------------
+# The "segment_dictionary" setting names a word list (most frequent word first, or "word count"
+# lines). It is compiled once to SEGMENT_COMPILED and memory-mapped; see wordsegment.
+SEGMENT_COMPILED = "segment_dictionary.seg"
+
+word_segmenter = {"segment": None, "text": None}  # set while a dictionary is loaded
+
+
+def set_segment_dictionary(path=None):
+    """Load (compiling if needed) the word list at `path`, or unload it. Raises OSError for unreadable files."""
+    import wordsegment
+
+    if not path:
+        word_segmenter["segment"] = word_segmenter["text"] = None
+    else:
+        segment = wordsegment.load_segmenter(path, SEGMENT_COMPILED)
+        word_segmenter["segment"] = segment
+        word_segmenter["text"] = wordsegment.make_text_segmenter(segment)
+    with precompute_lock:
+        precomputed["text"] = None
+
+
+def segment_joined_words(text):
+    """Put spaces between the words of single-case runs such as getuserbyid or MAXRETRYCOUNT"""
+    if word_segmenter["text"] is None:
+        raise RuntimeError("Word segmentation needs a word list in the segment_dictionary setting")
+    return word_segmenter["text"](text)
+
+
+def register_custom_modes(specs):
+    """
+    Replace the previously registered custom modes with `specs` ({name: spec}).
+    Built-in modes cannot be overridden. Returns a list of error messages for skipped specs.
+    """
+    errors = []
+    for name in custom_modes:
+        MODES.pop(name, None)
+    custom_modes.clear()
+    _compiled_pipelines.clear()  # pipelines hold references to the old renderers
+    if not isinstance(specs, dict):
+        return errors
+    for name, spec in specs.items():
+        if name in MODES or name in HOTKEY_ACTIONS:
+            errors.append(f"Custom mode {name!r} clashes with a built-in mode")
+            continue
+        try:
+            MODES[name] = compile_custom_mode(spec)
+        except (ValueError, AttributeError) as e:
+            errors.append(f"Custom mode {name!r}: {e}")
+            continue
+        custom_modes[name] = spec
+    return errors
+
+
+# -------------------- Smart Toggle --------------------
+# Each line is classified (styledetect) and rewritten in its counterpart style:
+# snake <-> camel, other identifier styles -> snake, lower -> UPPER -> Title -> lower,
+# sentence -> lower. Mixed lines are normalized (sentence case for prose, snake_case otherwise).
+TOGGLE_TARGETS = {
+    "snake": "camel",
+    "camel": "snake",
+    "pascal": "snake",
+    "kebab": "snake",
+    "macro": "snake",
+    "lower": "upper",
+    "upper": "title",
+    "title": "lower",
+    "sentence": "lower",
+}
+
+STYLE_RENDERERS = {
+    "snake": compile_custom_mode({"separator": "_", "first": "lower"}),
+    "camel": compile_custom_mode({"separator": "", "first": "lower", "rest": "capitalize"}),
+    "upper": str.upper,
+    "lower": str.lower,
+    "title": lambda text: MODES["titlecase"](text),
+    "sentence": lambda text: MODES["sentencecase"](text),
+}
+
+
+def _toggle_line(match):
+    line = match.group()
+    style = classify_style(line)
+    if style == "mixed":
+        target = "sentence" if len(line.split()) > 1 else "snake"
+    else:
+        target = TOGGLE_TARGETS[style]
+    return STYLE_RENDERERS[target](line)
+
+
+def smart_toggle(text):
+    return LINE_RE.sub(_toggle_line, text)
+
+
+MODES["smarttoggle"] = smart_toggle
+
+
+# -------------------- URL Slugs --------------------
+# "slugify" turns every line into a URL slug / file name (see slugs); the "slug_max_length"
+# setting cuts longer slugs at a word boundary (0 = no limit).
+MODES["slugify"] = slugs.make_slugify()
+
+
+def set_slug_length(max_length=0):
+    """Rebuild "slugify" for slugs of at most max_length characters. Raises ValueError for other values."""
+    max_length = max_length or 0
+    if not isinstance(max_length, int) or isinstance(max_length, bool) or max_length < 0:
+        raise ValueError(f"slug_max_length must be a whole number of characters, not {max_length!r}")
+    MODES["slugify"] = slugs.make_slugify(max_length)
+    _compiled_pipelines.clear()
+    with precompute_lock:
+        precomputed["text"] = None
+
+
+# -------------------- Regex Modes --------------------
+# Declared in the "regex_modes" setting, e.g.
+#   "regex_modes": {"sqlkeywords": {"label": "SQL KEYWORDS", "timeout_ms": 1000, "rules": [
+#       {"pattern": "\\b(select|from|where|join|order by)\\b", "flags": "i", "case": "upper"}]}}
+# Rules are validated here and executed by regexrules' helper process under the time budget.
+regex_modes = {}  # name -> spec, for everything register_regex_modes() added to MODES
+
+
+def register_regex_modes(specs):
+    """Replace the previously registered regex modes with `specs`. Returns a list of error messages."""
+    errors = []
+    for name in regex_modes:
+        MODES.pop(name, None)
+    regex_modes.clear()
+    _compiled_pipelines.clear()
+    if not isinstance(specs, dict) or not specs:
+        return errors
+    import regexrules
+
+    for name, spec in specs.items():
+        if name in MODES or name in HOTKEY_ACTIONS:
+            errors.append(f"Regex mode {name!r} clashes with an existing mode")
+            continue
+        try:
+            rules = list(spec["rules"])
+            regexrules.compile_rules(rules)
+            timeout_ms = float(spec.get("timeout_ms", regexrules.DEFAULT_TIMEOUT_MS))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            errors.append(f"Regex mode {name!r}: {e}")
+            continue
+        key = json.dumps(rules, sort_keys=True)
+        MODES[name] = (lambda text, key=key, rules=rules, timeout_ms=timeout_ms:
+                       regexrules.run(key, rules, text, timeout_ms))
+        regex_modes[name] = spec
+    return errors
+
+
+# -------------------- Replace Modes --------------------
+# Declared in the "replace_modes" setting, e.g.
+#   "replace_modes": {"renameuser": {"label": "user → account", "terms": {"user id": "account id"}}}
+# Every case-style variant of each old term (user_id, userId, USER_ID, ...) is replaced by the new
+# term in the same style; see multireplace. The matcher is compiled once here.
+replace_modes = {}  # name -> spec, for everything register_replace_modes() added to MODES
+
+
+def register_replace_modes(specs):
+    """Replace the previously registered replace modes with `specs`. Returns a list of error messages."""
+    errors = []
+    for name in replace_modes:
+        MODES.pop(name, None)
+    replace_modes.clear()
+    _compiled_pipelines.clear()
+    if not isinstance(specs, dict) or not specs:
+        return errors
+    import multireplace
+
+    for name, spec in specs.items():
+        if name in MODES or name in HOTKEY_ACTIONS:
+            errors.append(f"Replace mode {name!r} clashes with an existing mode")
+            continue
+        try:
+            MODES[name] = multireplace.compile_replacer(dict(spec["terms"]))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            errors.append(f"Replace mode {name!r}: {e}")
+            continue
+        replace_modes[name] = spec
+    return errors
+
+
+# -------------------- Locale-aware Casing --------------------
+# The "locale" setting (tr, az, lt, el, nl, de; see localecase) switches the built-in case modes
+# globally; "capital_sharp_s" makes uppercase write ẞ instead of SS. A single shortcut can pick its
+# own locale by binding "<mode>@<locale>", e.g. shortcuts["uppercase@tr"].
+LOCALE_MODES = ("uppercase", "lowercase", "titlecase", "sentencecase",
+                "macrocase", "snakecase", "pascalcase", "kebabcase")
+DEFAULT_CASE_MODES = {mode: MODES[mode] for mode in LOCALE_MODES}
+
+current_locale = {"locale": "", "capital_sharp_s": False}
+_localized_modes = {}  # (mode, locale, capital_sharp_s) -> function
+
+
+def localized_mode(mode, locale, capital_sharp_s=False):
+    """A LOCALE_MODES entry using `locale`'s casing rules. Raises ValueError for unknown locales or modes."""
+    key = (mode, locale, bool(capital_sharp_s))
+    func = _localized_modes.get(key)
+    if func is not None:
+        return func
+    casing = localecase.get_casing(locale, capital_sharp_s)
+    upper, lower = casing["upper"], casing["lower"]
+
+    def identifier(name):
+        delimiters = CELL_DELIMITERS[identifier_options["cells"]]
+        return lambda: make_identifier_modes(delimiters, upper, lower, casing["capitalize"])[name]
+    builders = {
+        "uppercase": lambda: upper,
+        "lowercase": lambda: lower,
+        "titlecase": lambda: _title_case_for(locale, casing),
+        "sentencecase": lambda: _sentence_case_for(locale, casing),
+        "macrocase": identifier("macrocase"),
+        "snakecase": identifier("snakecase"),
+        "pascalcase": identifier("pascalcase"),
+        "kebabcase": identifier("kebabcase"),
+    }
+    if mode not in builders:
+        raise ValueError(f"{mode!r} has no locale-specific version")
+    func = _localized_modes[key] = builders[mode]()
+    return func
+
+
+title_options = {"style": titlestyle.DEFAULT_STYLE, "dictionary": {}}
+
+
+def _title_case_for(locale, casing):
+    title_case = titlestyle.make_title_case(title_options["style"], title_options["dictionary"],
+                                            upper_char=casing["title"], lower=casing["lower"])
+    if locale == "nl":
+        return lambda text: localecase.DUTCH_IJ_RE.sub("IJ", title_case(text))
+    return title_case
+
+
+identifier_options = {"cells": ""}
+LINE_MODES = {"macrocase": TextModes.macro_case, "snakecase": TextModes.snake_case,
+              "pascalcase": TextModes.pascal_case, "kebabcase": TextModes.kebab_case}
+
+
+def set_identifier_cells(cells=""):
+    """
+    Convert the identifier styles per line ("") or per "tab"/"comma" separated cell.
+    Raises ValueError for other values.
+    """
+    cells = cells or ""
+    if cells not in CELL_DELIMITERS:
+        raise ValueError(f"identifier_cells must be one of {', '.join(repr(c) for c in CELL_DELIMITERS)}")
+    identifier_options["cells"] = cells
+    DEFAULT_CASE_MODES.update(make_identifier_modes(CELL_DELIMITERS[cells]) if cells else LINE_MODES)
+    for key in [key for key in _localized_modes if key[0] in LINE_MODES]:
+        del _localized_modes[key]
+    set_locale(current_locale["locale"], current_locale["capital_sharp_s"])
+
+
+sentence_options = {"keep_caps": False, "line_breaks": False}
+
+
+def _sentence_case_for(locale, casing):
+    # The English pronoun rule would turn a Turkish/Azeri "i" into "I" instead of "İ"
+    return sentencestyle.make_sentence_case(sentence_options["keep_caps"], sentence_options["line_breaks"],
+                                            upper_char=casing["title"], lower=casing["lower"],
+                                            pronoun_i=locale not in ("tr", "az"))
+
+
+def set_sentence_style(keep_caps=False, line_breaks=False):
+    """
+    Rebuild "sentencecase": keep_caps leaves words typed in all caps (NASA) alone,
+    line_breaks starts a new sentence on every line rather than only after blank lines.
+    """
+    sentence_options["keep_caps"] = bool(keep_caps)
+    sentence_options["line_breaks"] = bool(line_breaks)
+    DEFAULT_CASE_MODES["sentencecase"] = sentencestyle.make_sentence_case(bool(keep_caps), bool(line_breaks))
+    for key in [key for key in _localized_modes if key[0] == "sentencecase"]:
+        del _localized_modes[key]
+    set_locale(current_locale["locale"], current_locale["capital_sharp_s"])
+
+
+def set_title_style(style=None, dictionary=None):
+    """
+    Rebuild "titlecase" for a style guide ("ap", "chicago", "apa") and a brand/acronym
+    dictionary (list of words or path to a word list). Raises ValueError for unknown styles.
+    """
+    style = style or titlestyle.DEFAULT_STYLE
+    title_case = titlestyle.make_title_case(style)  # validates the style before anything changes
+    title_options["style"] = style
+    title_options["dictionary"] = titlestyle.load_dictionary(dictionary) if dictionary else {}
+    DEFAULT_CASE_MODES["titlecase"] = titlestyle.make_title_case(style, title_options["dictionary"]) \
+        if dictionary else title_case
+    for key in [key for key in _localized_modes if key[0] == "titlecase"]:
+        del _localized_modes[key]
+    set_locale(current_locale["locale"], current_locale["capital_sharp_s"])
+
+
+def set_locale(locale="", capital_sharp_s=False):
+    """Switch the built-in case modes to `locale` ("" restores Python's default casing)"""
+    locale = (locale or "").lower()
+    if not locale and not capital_sharp_s:
+        MODES.update(DEFAULT_CASE_MODES)
+    else:
+        MODES.update({mode: localized_mode(mode, locale, capital_sharp_s) for mode in LOCALE_MODES})
+    current_locale["locale"] = locale
+    current_locale["capital_sharp_s"] = bool(capital_sharp_s)
+    _compiled_pipelines.clear()
+    with precompute_lock:
+        precomputed["text"] = None  # cached renderings used the previous rules
+
+
+def uses_default_casing(mode):
+    return mode not in DEFAULT_CASE_MODES or MODES.get(mode) is DEFAULT_CASE_MODES[mode]
+
+
+# -------------------- Protected Words --------------------
+# "protected_words" (a list) and "protected_words_file" (a shared one-per-line list, e.g. on a team
+# drive) name acronyms and brands whose casing the mixed-case modes keep: API, iPhone, HTTPServer.
+# Modes whose output is one case by definition are left alone, as are smart toggle (mostly such
+# styles), the regex/replace modes, whose rules decide the casing themselves, and the cleanup modes,
+# which do not case anything.
+PROTECTED_WORDS_CACHE = "protected_words.cache"
+UNPROTECTED_MODES = ("uppercase", "lowercase", "macrocase", "snakecase", "kebabcase", "smarttoggle", "slugify",
+                     "cleanup", *CLEANUP_MODES)
+
+protected_words = {"protect": None}  # callable(text) while a dictionary is loaded
+
+
+def set_protected_words(words=None, path=None):
+    """
+    Load the protected words from a list and/or a word file, through the compiled cache in
+    PROTECTED_WORDS_CACHE. Raises OSError if the file cannot be read.
+    """
+    import protectedwords
+
+    protect = None
+    if words or path:
+        trie = protectedwords.load_trie(words, path, PROTECTED_WORDS_CACHE)
+        protect = protectedwords.make_protector(trie) if trie else None
+    protected_words["protect"] = protect
+    with precompute_lock:
+        precomputed["text"] = None  # cached renderings used the previous dictionary
+
+
+def protects(mode):
+    """True if protected words are restored in `mode`'s output"""
+    if "+" in mode:
+        return protects(mode.rpartition("+")[2])
+    base = mode.partition("@")[0]
+    if base in UNPROTECTED_MODES or base in regex_modes or base in replace_modes:
+        return False
+    spec = custom_modes.get(base)
+    if spec is not None:
+        first = spec.get("first", "lower")
+        rest = spec.get("rest", first)
+        return first != rest or first == "capitalize"
+    if base in MODES:
+        return True
+    steps = get_pipelines().get(base)
+    return bool(steps) and protects(steps[-1])
+
+
 # -------------------- Transform Function --------------------
 def transform_text(text, mode):
+    result = _transform(text, mode)
+    protect = protected_words["protect"]
+    if protect is not None and protects(mode):
+        result = protect(result)
+    return result
+
+
+def _transform(text, mode):
     # More robust: if mode unknown (for example "count" or "launch"), return original text unchanged.
     func = MODES.get(mode)
     if func:
         return func(text)
+    if "+" in mode:  # steps chained in front of a mode: "cleanup+snakecase"
+        return compile_pipeline(mode.split("+"))(text)
+    if "@" in mode:
+        base, _, locale = mode.partition("@")
+        return localized_mode(base, locale.lower(), current_locale["capital_sharp_s"])(text)
+    steps = get_pipelines().get(mode)
+    if steps:
+        return compile_pipeline(steps)(text)
     return text
 
 
-# -------------------- Clipboard Conversion --------------------
-last_transformed = {"text": None, "mode": None}
+# -------------------- Clipboard Helpers --------------------
+def get_clipboard_sequence():
+    """Windows clipboard change counter (bumped on every copy), or None where unavailable"""
+    try:
+        return ctypes.windll.user32.GetClipboardSequenceNumber()
+    except Exception:
+        return None
 
 
-def convert_clipboard_text(mode, retries=10):
-    global last_transformed
+def get_foreground_window():
+    """Handle of the window with the keyboard focus, or None where unavailable"""
+    try:
+        return ctypes.windll.user32.GetForegroundWindow()
+    except Exception:
+        return None
 
-    old_clipboard = pyperclip.paste()
-    new_text = None
 
-    # Try to grab fresh clipboard content
+def read_selection(retries=10):
+    """
+    Press Ctrl+C until the clipboard picks up the selection.
+    Returns (previous clipboard text, selected text or None).
+    """
+    import pyperclip  # deferred: only needed once a hotkey fires
+
+    old_clipboard = pyperclip.paste()
     for attempt in range(retries):
+        sequence = get_clipboard_sequence()
         keyboard.press_and_release('ctrl+c')
-        for _ in range(10):  # up to 0.5s total
+        for _ in range(10):  # up to 0.5s per attempt
             time.sleep(0.05)
             candidate = pyperclip.paste()
-            if candidate and candidate != old_clipboard:
-                new_text = candidate
-                break
-        if new_text:
+            # A changed sequence number also catches copying text identical to the clipboard
+            if candidate and (candidate != old_clipboard or
+                              (sequence is not None and get_clipboard_sequence() != sequence)):
+                if attempt:
+                    metrics.inc("clipboard_retries", attempt)
+                return old_clipboard, candidate
+    metrics.inc("clipboard_retries", retries - 1)
+    return old_clipboard, None
+
+
+# -------------------- Speculative Precomputation --------------------
+# Optional: watch the clipboard and render every mode for new content on a
+# background thread, so a later hotkey on the same text only has to paste.
+PRECOMPUTE_POLL_INTERVAL = 0.25  # seconds
+DEFAULT_PRECOMPUTE_MAX_CHARS = 200_000
+DEFAULT_PRECOMPUTE_CPU_BUDGET_MS = 50
+
+precomputed = {"text": None, "results": {}}
+precompute_stats = {"hits": 0, "misses": 0, "computed": 0, "skipped_size": 0, "budget_exceeded": 0}
+precompute_lock = threading.Lock()
+precompute_thread = None
+precompute_stop = None  # Event of the running watcher; each start gets a fresh one
+
+
+def precompute_modes(text, cpu_budget_ms):
+    """Render MODES (with_cleanup() applied) for `text` until the thread CPU budget runs out. Returns {mode: result}."""
+    results = {}
+    deadline = time.thread_time() + cpu_budget_ms / 1000
+    for mode in list(MODES):
+        if mode in regex_modes:
+            continue  # runs in the regex helper process under its own budget
+        if time.thread_time() > deadline:
+            precompute_stats["budget_exceeded"] += 1
             break
-    else:
+        mode = with_cleanup(mode)  # the name hotkeys look it up under
+        results[mode] = transform_text(text, mode)
+    return results
+
+
+def get_precomputed(text, mode):
+    """Cached result for (text, mode), or None. Counts hits and misses while the watcher runs."""
+    if precompute_thread is None:
+        return None
+    with precompute_lock:
+        if precomputed["text"] == text and mode in precomputed["results"]:
+            precompute_stats["hits"] += 1
+            metrics.inc("precompute_hits")
+            return precomputed["results"][mode]
+    precompute_stats["misses"] += 1
+    metrics.inc("precompute_misses")
+    return None
+
+
+def get_precompute_stats():
+    stats = dict(precompute_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def _watch_clipboard(stop_event, max_chars, cpu_budget_ms):
+    import pyperclip
+    last_sequence = None
+    last_text = None
+    while not stop_event.wait(PRECOMPUTE_POLL_INTERVAL):
+        try:
+            sequence = get_clipboard_sequence()
+            if sequence is not None:
+                if sequence == last_sequence:
+                    continue
+                last_sequence = sequence
+            text = pyperclip.paste()
+            if not text or text == last_text:
+                continue
+            last_text = text
+            if len(text) > max_chars:
+                precompute_stats["skipped_size"] += 1
+                continue
+            with precompute_lock:
+                if precomputed["text"] == text:
+                    continue
+            results = precompute_modes(text, cpu_budget_ms)
+            with precompute_lock:
+                precomputed["text"] = text
+                precomputed["results"] = results
+            precompute_stats["computed"] += 1
+        except Exception:
+            continue  # clipboard busy (another app holds it open); try again next poll
+
+
+def start_precompute(max_chars=None, cpu_budget_ms=None):
+    """Start the clipboard watcher (no-op if already running)"""
+    global precompute_thread, precompute_stop
+    if precompute_thread is not None:
+        return
+    max_chars = max_chars or DEFAULT_PRECOMPUTE_MAX_CHARS
+    cpu_budget_ms = cpu_budget_ms or DEFAULT_PRECOMPUTE_CPU_BUDGET_MS
+    precompute_stop = threading.Event()
+    precompute_thread = threading.Thread(target=_watch_clipboard, args=(precompute_stop, max_chars, cpu_budget_ms),
+                                         daemon=True)
+    precompute_thread.start()
+
+
+def stop_precompute():
+    global precompute_thread
+    if precompute_thread is None:
+        return
+    precompute_stop.set()
+    precompute_thread = None
+    with precompute_lock:
+        precomputed["text"] = None
+        precomputed["results"] = {}
+
+
+# -------------------- Clipboard Conversion --------------------
+last_transformed = {"text": None, "mode": None, "result": None}
+
+
+def convert_clipboard_text(mode, retries=10):
+    global last_transformed
+    import pyperclip
+
+    with span(mode, "copy"):
+        old_clipboard, new_text = read_selection(retries)
+    if new_text is None:
+        metrics.inc("selection_read_failures", mode=mode)
         raise RuntimeError("Could not read the selected text. Make sure Ctrl+C works.")
 
-    # Always re-transform (remove aggressive skipping)
-    transformed = transform_text(new_text, mode)
+    # Always re-transform (remove aggressive skipping) unless the watcher already did the work
+    with span(mode, "transform"):
+        transformed = get_precomputed(new_text, mode)
+        if transformed is None:
+            transformed = transform_text(new_text, mode)
     last_transformed["text"] = new_text
     last_transformed["mode"] = mode
+    last_transformed["result"] = transformed
+    invalidate_cycle()  # the selection now holds a different rendering
+
+    with span(mode, "paste"):
+        pyperclip.copy(transformed)
+        keyboard.press_and_release('ctrl+v')
+        time.sleep(0.2)  # allow paste to finish
+    with span(mode, "restore"):
+        pyperclip.copy(old_clipboard)
+
+
+# -------------------- Cycle Through Modes --------------------
+DEFAULT_CYCLE_MODES = ["uppercase", "lowercase", "titlecase"]
+DEFAULT_CYCLE_TIMEOUT = 3.0  # seconds between presses that still count as the same selection
+
+# original: selection captured by the first press; results: renderings cached per mode;
+# window: foreground window the last rendering was pasted into; sequence: clipboard sequence
+# number after the clipboard was restored (a copy made since then means a new selection)
+cycle_state = {"original": None, "results": {}, "index": 0, "time": 0.0, "window": None, "sequence": None}
+cycle_config = {"modes": list(DEFAULT_CYCLE_MODES), "timeout": DEFAULT_CYCLE_TIMEOUT}
+
+
+def set_cycle_modes(modes=None, timeout=None):
+    """Modes the cycle hotkey steps through (unknown names are skipped) and the repeat timeout in seconds"""
+    cycle_config["modes"] = [m for m in (modes or DEFAULT_CYCLE_MODES) if m in MODES] or list(DEFAULT_CYCLE_MODES)
+    cycle_config["timeout"] = timeout or DEFAULT_CYCLE_TIMEOUT
+
+
+def invalidate_cycle():
+    """Forget the cached selection (called when the user types or the selection changes)"""
+    cycle_state["original"] = None
+    cycle_state["results"] = {}
+
 
-    pyperclip.copy(transformed)
-    keyboard.press_and_release('ctrl+v')
-    time.sleep(0.2)  # allow paste to finish
-    pyperclip.copy(old_clipboard)
+def render_cycle_mode(mode):
+    results = cycle_state["results"]
+    if mode not in results:
+        original = cycle_state["original"]
+        cached = get_precomputed(original, mode)
+        results[mode] = cached if cached is not None else transform_text(original, mode)
+    return results[mode]
+
+
+def is_cycle_repeat(timeout):
+    """
+    True when this press continues the last cycle: within `timeout` seconds, in the same
+    foreground window and with nothing copied since. Other key presses already reset the
+    cycle through invalidate_cycle(), so none of this needs a Ctrl+C round-trip.
+    """
+    if cycle_state["original"] is None or time.monotonic() - cycle_state["time"] > timeout:
+        return False
+    if get_foreground_window() != cycle_state["window"]:
+        return False  # focus moved on: the undo history there is not ours
+    sequence = cycle_state["sequence"]
+    return sequence is None or get_clipboard_sequence() == sequence
+
+
+def cycle_clipboard_text(cycle_modes=None, timeout=None, retries=10):
+    """
+    Step the selection through `cycle_modes` on repeated presses (set_cycle_modes() by default).
+    The first press copies the selection; a repeat press (see is_cycle_repeat) undoes the
+    previous paste (editors restore and reselect the replaced text) and pastes the next cached
+    rendering without copying again.
+    """
+    import pyperclip
+
+    if cycle_modes is None:
+        modes = cycle_config["modes"]
+    else:
+        modes = [m for m in cycle_modes if m in MODES] or DEFAULT_CYCLE_MODES
+    timeout = timeout or cycle_config["timeout"]
+
+    if is_cycle_repeat(timeout):
+        current = cycle_state["results"].get(modes[cycle_state["index"] % len(modes)])
+        keyboard.press_and_release('ctrl+z')
+        old_clipboard = pyperclip.paste()
+        start = cycle_state["index"] + 1
+    else:
+        with span("cycle", "copy"):
+            old_clipboard, original = read_selection(retries)
+        if original is None:
+            metrics.inc("selection_read_failures", mode="cycle")
+            raise RuntimeError("Could not read the selected text. Make sure Ctrl+C works.")
+        invalidate_cycle()
+        cycle_state["original"] = original
+        current = original
+        start = 0
+
+    # Skip renderings that would not visibly change the text (e.g. UPPER on text that already is)
+    with span("cycle", "transform"):
+        for step in range(len(modes)):
+            index = (start + step) % len(modes)
+            transformed = render_cycle_mode(modes[index])
+            if transformed != current:
+                break
+
+    cycle_state["index"] = index
+    last_transformed["text"] = cycle_state["original"]
+    last_transformed["mode"] = modes[index]
+    last_transformed["result"] = transformed
+
+    with span("cycle", "paste"):
+        pyperclip.copy(transformed)
+        keyboard.press_and_release('ctrl+v')
+        time.sleep(0.2)  # allow paste to finish
+    with span("cycle", "restore"):
+        pyperclip.copy(old_clipboard)
+    cycle_state["time"] = time.monotonic()
+    cycle_state["window"] = get_foreground_window()
+    cycle_state["sequence"] = get_clipboard_sequence()
 
 
 # -------------------- NEW: Count (read selection and compute counts) --------------------
+def count_text(text):
+    """
+    Word, letter and character totals shown by the count popup and the status bar. Characters are
+    grapheme clusters, so an emoji ZWJ sequence, a flag or a letter with combining accents is one.
+    """
+    return {
+        "words": len(text.split()),
+        "letters": sum(1 for c in text if c.isalpha()),
+        "all_chars": graphemes.count(text),
+    }
+
+
 def count_selected_text(retries=10):
     """
     Copies the currently selected text (presses Ctrl+C similarly to convert_clipboard_text),
@@ -197,20 +1262,8 @@ def count_selected_text(retries=10):
     Restores the previous clipboard contents after reading.
     This function does not paste anything back.
     """
-    old_clipboard = pyperclip.paste()
-    new_text = None
-
-    for attempt in range(retries):
-        keyboard.press_and_release('ctrl+c')
-        for _ in range(10):  # up to 0.5s
-            time.sleep(0.05)
-            candidate = pyperclip.paste()
-            # If it changed and is not empty, take it
-            if candidate and candidate != old_clipboard:
-                new_text = candidate
-                break
-        if new_text:
-            break
+    import pyperclip
+    old_clipboard, new_text = read_selection(retries)
     
     # --- CORRECTED LOGIC START ---
     # If the clipboard content did not change after Ctrl+C, it means no text was selected.
@@ -219,9 +1272,7 @@ def count_selected_text(retries=10):
         new_text = ""
     # --- CORRECTED LOGIC END ---
 
-    words = len(new_text.split())
-    letters = sum(1 for c in new_text if c.isalpha())
-    all_chars = len(new_text)
+    counts = count_text(new_text)
 
     # restore previous clipboard so we don't disturb user's clipboard
     try:
@@ -229,4 +1280,102 @@ def count_selected_text(retries=10):
     except Exception:
         pass
 
-    return {"text": new_text, "words": words, "letters": letters, "all_chars": all_chars}
\ No newline at end of file
+    return {"text": new_text, **counts}
+
+
+# -------------------- File Conversion --------------------
+MAX_PENDING_CHARS = 1 << 24  # text without a line break buffered before stream_lines gives up streaming
+
+
+def stream_lines(chunks, func):
+    """
+    Yield func() over an iterable of text chunks, always handing it whole lines. A line cannot be
+    cut without changing the result, so once more than MAX_PENDING_CHARS have gone by without a
+    line break the rest of the text is collected and converted in one call (the whole-text path).
+    """
+    parts = []  # text since the last line break; joined once, not copied on every chunk
+    pending = 0
+    for chunk in chunks:
+        split = chunk.rfind("\n") + 1
+        if split and pending <= MAX_PENDING_CHARS:
+            parts.append(chunk[:split])
+            yield func("".join(parts))
+            parts = [chunk[split:]]
+            pending = len(chunk) - split
+        else:
+            parts.append(chunk)
+            pending += len(chunk)
+    rest = "".join(parts)
+    if rest:
+        yield func(rest)
+
+
+# Modes that can convert a file chunk by chunk: mode -> callable(chunks, mode function) yielding text.
+# Custom modes are line-wise too and stream with stream_lines.
+STREAMING_MODES = {
+    "sentencecase": sentencestyle.stream_sentence_case,
+    "titlecase": stream_lines,
+    "macrocase": stream_lines,
+    "snakecase": stream_lines,
+    "pascalcase": stream_lines,
+    "kebabcase": stream_lines,
+    "smarttoggle": stream_lines,
+    "slugify": stream_lines,
+}
+FILE_CHUNK_CHARS = 1 << 20
+
+
+def convert_file(path, mode):
+    """
+    Transform a text file in place (used by --convert and forwarded launch commands).
+    Raises ValueError for a mode that is not in MODES, a chain, a locale variant or a pipeline.
+    """
+    if mode not in MODES and mode not in pipelines and "+" not in mode and "@" not in mode:
+        raise ValueError(f"Unknown mode: {mode!r}")
+    # newline="" keeps the file's original line endings untouched
+    stream = STREAMING_MODES.get(mode) or (stream_lines if mode in custom_modes else None)
+    if stream is not None and mode in MODES:
+        protect = protected_words["protect"] if protects(mode) else None
+        # Stream into a temporary file next to the original, so big files never sit in memory whole
+        temp_path = path + ".casecon-tmp"
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as src, \
+                    open(temp_path, "w", encoding="utf-8", newline="") as dst:
+                chunks = iter(lambda: src.read(FILE_CHUNK_CHARS), "")
+                if mode == "sentencecase" and sentence_options["keep_caps"]:
+                    # All caps are kept unless the whole file is shouting: settle that first, then start over
+                    shouting = all(chunk.upper() == chunk for chunk in chunks)
+                    src.seek(0)
+                    chunks = iter(lambda: src.read(FILE_CHUNK_CHARS), "")
+                    stream = lambda pieces, func: sentencestyle.stream_sentence_case(pieces, func, shouting)
+                for piece in stream(chunks, MODES[mode]):
+                    dst.write(protect(piece) if protect else piece)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(transform_text(text, mode))
+
+
+# -------------------- Text Statistics --------------------
+# Word frequencies, word pairs, repeated phrases and longest words (see textstats) for the stats view,
+# the "textstats" hotkey and --stats. Words are folded with the current locale's lowercase.
+def _stats_fold():
+    return localecase.get_casing(current_locale["locale"])["lower"]
+
+
+def text_stats(text):
+    """textstats report for a selection or the text box"""
+    import textstats  # deferred: only needed when the stats view opens
+    return textstats.analyze_text(text, fold=_stats_fold())
+
+
+def file_stats(path):
+    """textstats report for a text file, read in FILE_CHUNK_CHARS chunks so it never sits in memory whole"""
+    import textstats
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return textstats.analyze(iter(lambda: f.read(FILE_CHUNK_CHARS), ""), fold=_stats_fold())
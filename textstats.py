@@ -0,0 +1,210 @@
+"""
+Word-frequency and n-gram statistics for CaseCon.
+analyze() reads text as a stream of chunks and reports the most frequent words, two-word
+pairs, repeated phrases and longest words, with case folded by the caller's lowercase
+(the locale's, so Turkish I and ı are counted apart). Common function words are left out
+of the rankings. Phrases never run across sentence punctuation or a blank line.
+Each chunk is tokenized by one regex and its words and n-grams are counted with Counter,
+then merged into TopCounters: exact dicts up to EXACT_LIMIT distinct keys, after which the
+counts move into a count-min sketch and only the most frequent candidates are kept. Memory
+therefore stays bounded however long the input is, at the price of estimated counts.
+
+Report on files from the command line with:
+    python textstats.py chapter1.txt chapter2.txt [--top 30] [--all-words]
+"""
+import heapq
+import re
+from array import array
+from collections import Counter
+from operator import itemgetter
+
+from graphemes import COMBINING_MARKS, count as count_clusters
+
+TOP = 20  # entries per ranking
+LONGEST = 10
+PHRASE_WORDS = 3  # a repeated phrase is this many words seen at least twice
+CHUNK_CHARS = 1 << 20
+MAX_PENDING_CHARS = 1 << 22  # text without whitespace is cut here rather than held whole
+EXACT_LIMIT = 200_000  # distinct keys a counter holds before it switches to the sketch
+CANDIDATES = 1_000  # keys a sketching counter keeps track of (well above TOP)
+SKETCH_WIDTH = 1 << 16
+SKETCH_DEPTH = 4
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she should so some such than that the
+their theirs them themselves then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+WORD = rf"[^\W\d_][\w{COMBINING_MARKS}]*(?:['’][\w{COMBINING_MARKS}]+)*"
+# A word, or a phrase break (found as ""): sentence punctuation, brackets, quotes or a blank line
+TOKEN_RE = re.compile(rf'({WORD})|[.!?…;:()\[\]{{}}"“”«»]|\n[^\S\n]*\n')
+SPACES = " \t\r\n"
+
+
+class TopCounter:
+    """
+    Counts keys exactly until exact_limit distinct keys have been seen, then estimates them with a
+    count-min sketch (conservative update) and remembers only the `keep` most frequent candidates.
+    """
+
+    def __init__(self, keep=CANDIDATES, exact_limit=EXACT_LIMIT, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.counts = {}
+        self.keep = keep
+        self.exact_limit = exact_limit
+        self.width = width
+        self.depth = depth
+        self.cells = None  # the sketch, depth rows of width counters, once counts are estimated
+        self.floor = 0  # smallest count kept at the last pruning; new keys must beat it
+
+    @property
+    def exact(self):
+        return self.cells is None
+
+    def update(self, counts):
+        """Add a {key: count} mapping, e.g. the Counter of one chunk"""
+        mine = self.counts
+        if self.cells is None:
+            get = mine.get
+            for key, count in counts.items():
+                mine[key] = get(key, 0) + count
+            if len(mine) > self.exact_limit:
+                self._start_sketch()
+            return
+        add, floor = self._add, self.floor
+        for key, count in counts.items():
+            estimate = add(key, count)
+            if estimate > floor or key in mine:
+                mine[key] = estimate
+        if len(mine) > 2 * self.keep:
+            self._prune()
+
+    def most_common(self, n):
+        """[(key, count)] of the n most frequent keys, ties in key order"""
+        return heapq.nsmallest(n, self.counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def _add(self, key, count):
+        code = hash(key)
+        step = (code >> 16) | 1  # double hashing: row r uses code + r * step
+        width, cells = self.width, self.cells
+        slots = [row * width + (code + row * step) % width for row in range(self.depth)]
+        estimate = min(cells[slot] for slot in slots) + count
+        for slot in slots:
+            if cells[slot] < estimate:
+                cells[slot] = estimate
+        return estimate
+
+    def _start_sketch(self):
+        self.cells = array("q", bytes(8 * self.width * self.depth))
+        for key, count in self.counts.items():
+            self._add(key, count)
+        self._prune()
+
+    def _prune(self):
+        top = heapq.nlargest(self.keep, self.counts.items(), key=itemgetter(1))
+        self.counts = dict(top)
+        self.floor = top[-1][1] if len(top) == self.keep else 0
+
+
+def _whole_words(chunks):
+    """Re-cut text chunks just before their last word, so no word or phrase break is split"""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        cut = max(pending.rfind(space, 0, len(pending.rstrip())) for space in SPACES) + 1
+        if not cut and len(pending) > MAX_PENDING_CHARS:
+            cut = len(pending)
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+    if pending:
+        yield pending
+
+
+def _longest_first(word):
+    return -count_clusters(word), word
+
+
+def _grams(tokens, size, carried, stop_words):
+    """Counter of the size-word n-grams of tokens that end past the first `carried` (already counted)"""
+    start = max(0, carried - size + 1)
+    grams = Counter(zip(*(tokens[start + offset:] for offset in range(size))))
+    for key in [key for key in grams if "" in key or stop_words.issuperset(key)]:
+        del grams[key]
+    return grams
+
+
+def analyze(chunks, fold=str.lower, top=TOP, stop_words=STOP_WORDS, phrase_words=PHRASE_WORDS,
+            exact_limit=EXACT_LIMIT):
+    """
+    Statistics over an iterable of text chunks: {"words": total words, "top_words", "bigrams",
+    "phrases": [(text, count)], "longest": [word], "exact": False once any count is estimated}.
+    fold lowercases the text (pass a locale's); stop_words are left out of the rankings.
+    """
+    words, bigrams, phrases = (TopCounter(exact_limit=exact_limit) for _ in range(3))
+    total = 0
+    longest = []
+    tail = []  # the last words of the previous chunk, so n-grams continue across chunks
+    for piece in _whole_words(chunks):
+        tokens = tail + TOKEN_RE.findall(fold(piece))
+        counts = Counter(tokens[len(tail):])
+        counts.pop("", None)
+        total += sum(counts.values())
+        longest = heapq.nsmallest(LONGEST, set(longest).union(counts), key=_longest_first)
+        for word in stop_words & counts.keys():
+            del counts[word]
+        words.update(counts)
+        bigrams.update(_grams(tokens, 2, len(tail), stop_words))
+        phrases.update(_grams(tokens, phrase_words, len(tail), stop_words))
+        tail = tokens[-(max(phrase_words, 2) - 1):]
+    return {
+        "words": total,
+        "top_words": words.most_common(top),
+        "bigrams": [(" ".join(pair), count) for pair, count in bigrams.most_common(top) if count > 1],
+        "phrases": [(" ".join(gram), count) for gram, count in phrases.most_common(top) if count > 1],
+        "longest": longest,
+        "exact": words.exact and bigrams.exact and phrases.exact,
+    }
+
+
+def analyze_text(text, **options):
+    """analyze() for text already in memory, fed in CHUNK_CHARS slices"""
+    return analyze((text[start:start + CHUNK_CHARS] for start in range(0, len(text), CHUNK_CHARS)), **options)
+
+
+def format_stats(report):
+    if not report["words"]:
+        return "No words to analyze."
+    lines = [f"Words: {report['words']}"]
+    if not report["exact"]:
+        lines.append("(counts are estimates: the text has too many distinct words to count exactly)")
+    sections = [("Most frequent words", report["top_words"]), ("Word pairs", report["bigrams"]),
+                ("Repeated phrases", report["phrases"])]
+    for title, rows in sections:
+        if rows:
+            width = max(len(text) for text, _ in rows)
+            digits = len(str(rows[0][1]))
+            lines += ["", title] + [f"  {text:<{width}}  {count:>{digits}}" for text, count in rows]
+    lines += ["", "Longest words"] + [f"  {word} ({count_clusters(word)})" for word in report["longest"]]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report word frequencies and repeated phrases of text files")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--top", type=int, default=TOP, help="entries per ranking")
+    parser.add_argument("--all-words", action="store_true", help="rank common function words too")
+    args = parser.parse_args()
+
+    def read_files():
+        for path in args.files:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                yield from iter(lambda: f.read(CHUNK_CHARS), "")
+            yield "\n\n"  # files are separate texts: no phrase runs from one into the next
+    stop = frozenset() if args.all_words else STOP_WORDS
+    print(format_stats(analyze(read_files(), top=args.top, stop_words=stop)))
@@ -0,0 +1,120 @@
+"""
+Style-guide title case for CaseCon.
+make_title_case(style) returns a renderer for AP, Chicago or APA headlines:
+minor words stay lowercase unless they open or close the title (or follow a colon),
+words typed with inner capitals (iPhone, NASA, McDonald) are kept, and a user
+dictionary fixes the casing of brands and acronyms. Only the first letter of a word
+is raised, so apostrophes no longer produce "Don'T". Each line is its own title.
+Minor-word and dictionary checks are set/dict lookups, so large dictionaries cost
+nothing per word.
+"""
+import re
+
+from graphemes import first_cluster
+
+ARTICLES = frozenset({"a", "an", "the"})
+COORDINATING_CONJUNCTIONS = frozenset({"and", "but", "for", "nor", "or", "so", "yet"})
+SHORT_PREPOSITIONS = frozenset({"as", "at", "by", "for", "in", "of", "off", "on", "per", "to", "up", "via",
+                                "vs", "vs.", "v."})
+LONG_PREPOSITIONS = frozenset({
+    "about", "above", "across", "after", "against", "along", "amid", "among", "around", "before", "behind",
+    "below", "beneath", "beside", "besides", "between", "beyond", "despite", "down", "during", "except",
+    "from", "inside", "into", "like", "near", "onto", "opposite", "outside", "over", "past", "since",
+    "than", "through", "throughout", "toward", "towards", "under", "underneath", "unlike", "until", "upon",
+    "with", "within", "without",
+})
+
+# minor: words kept lowercase inside a title; hyphen_minor: also lowercase them after a hyphen
+# (Out-of-Date) instead of capitalizing every part (Out-Of-Date)
+STYLES = {
+    "ap": {
+        "minor": ARTICLES | SHORT_PREPOSITIONS | frozenset(w for w in COORDINATING_CONJUNCTIONS if len(w) <= 3),
+        "hyphen_minor": False,
+    },
+    "chicago": {
+        "minor": ARTICLES | SHORT_PREPOSITIONS | LONG_PREPOSITIONS | frozenset({"and", "but", "for", "nor", "or"}),
+        "hyphen_minor": True,
+    },
+    "apa": {
+        "minor": frozenset(w for w in ARTICLES | SHORT_PREPOSITIONS | COORDINATING_CONJUNCTIONS if len(w) <= 3),
+        "hyphen_minor": True,
+    },
+}
+DEFAULT_STYLE = "chicago"
+
+SPACE_RE = re.compile(r'(\s+)')
+# leading punctuation, the word itself, trailing punctuation
+AFFIX_RE = re.compile(r'^(\W*)(.*?)(\W*)$', re.S)
+SUBTITLE_ENDINGS = (":", "—", "–", "?", "!")
+
+
+def load_dictionary(words):
+    """{lowercase: preferred casing} from a list of words or the path of a one-word-per-line file"""
+    if isinstance(words, str):
+        with open(words, "r", encoding="utf-8") as f:
+            words = f.read().split()
+    return {word.lower(): word for word in words or ()}
+
+
+def make_title_case(style=DEFAULT_STYLE, dictionary=None, upper_char=str.title, lower=str.lower):
+    """
+    Renderer for `style` ("ap", "chicago" or "apa"). dictionary maps lowercase words to their
+    casing (see load_dictionary); upper_char/lower let a locale supply its casing rules.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown title style {style!r} (available: {', '.join(STYLES)})")
+    minor = STYLES[style]["minor"]
+    hyphen_minor = STYLES[style]["hyphen_minor"]
+    dictionary = dictionary or {}
+
+    def case_part(part, keep_minor, shouting):
+        key = part.lower()
+        known = dictionary.get(key)
+        if known is not None:
+            return known
+        rest = part[1:]
+        if not shouting and rest.lower() != rest:
+            return part  # typed with inner capitals: acronym or brand
+        if keep_minor and key in minor:
+            return lower(part)
+        if part[:1].isalpha():
+            if part.isascii():
+                return upper_char(part[0]) + lower(rest)
+            head = first_cluster(part)  # the letter with its combining marks
+            return upper_char(head) + lower(part[len(head):])
+        for index, char in enumerate(part):
+            if char.isalpha():
+                head = first_cluster(part[index:])
+                return part[:index] + upper_char(head) + lower(part[index + len(head):])
+        return part
+
+    def title_line(line):
+        tokens = SPACE_RE.split(line)
+        last = len(tokens) - 1
+        while last >= 0 and not any(char.isalnum() for char in tokens[last]):
+            last -= 1
+        if last < 0:
+            return line
+        shouting = line.upper() == line
+        starts_title = True  # the first word, and the first word of a subtitle
+        for i in range(0, len(tokens), 2):
+            token = tokens[i]
+            inner = not (starts_title or i == last)
+            if token.isalpha():  # the common case: a plain word
+                tokens[i] = case_part(token, inner, shouting)
+                starts_title = False
+                continue
+            if any(char.isalnum() for char in token):
+                leading, core, trailing = AFFIX_RE.match(token).groups()
+                parts = core.split("-")
+                cased = [case_part(parts[0], inner, shouting)]
+                cased += [case_part(part, hyphen_minor, shouting) for part in parts[1:]]
+                tokens[i] = leading + "-".join(cased) + trailing
+                starts_title = False
+            if token.endswith(SUBTITLE_ENDINGS):
+                starts_title = True
+        return "".join(tokens)
+
+    def title_case(text):
+        return "".join(title_line(line) for line in text.splitlines(keepends=True))
+    return title_case
@@ -0,0 +1,191 @@
+"""
+Dictionary-driven word segmentation for CaseCon.
+Splits tokens that carry no case or separator cues (getuserbyemailaddress, MAXRETRYCOUNT)
+into words with a word-frequency list and dynamic programming: every split is scored
+by the summed cost of its words (rarer words cost more, unknown letters cost a lot) and
+the cheapest one wins.
+The word list is compiled once into a compact file, an open-addressing hash table of
+(word offset, length, cost) slots followed by the UTF-8 words, and then memory-mapped,
+so loading is instant whatever its size and only the pages that are looked up are read.
+Word costs and whole splits are cached, which keeps batches of repetitive identifiers fast.
+
+Compile a word list (most frequent first, or "word count" per line) from the command line with:
+    python wordsegment.py words.txt words.seg
+"""
+import math
+import mmap
+import os
+import re
+import struct
+import zlib
+
+MAGIC = b"CCSEG\x00\x00\x01"
+HEADER = struct.Struct("<8sQqIII")  # magic, source mtime_ns, source size, words, slots, longest word
+SLOT = struct.Struct("<IIf")  # word offset in the blob, length in bytes (0 = empty slot), cost
+UNKNOWN_CHAR_COST = 30.0  # per letter missing from the dictionary; well above any word cost
+MIN_SEGMENT_CHARS = 4
+CACHE_LIMIT = 100_000  # cached splits / word costs before the caches start over
+
+JOINED_RE = re.compile(r'[^\W\d_]{%d,}' % MIN_SEGMENT_CHARS)
+
+_mapped = {}  # compiled path -> mapping of the last segmenter loaded from it
+
+
+# -------------------- Compiling --------------------
+def read_word_list(path):
+    """[(word, cost)] from a list ordered by frequency, or with a count after each word"""
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [line.split() for line in f if line.strip() and not line.startswith("#")]
+    if rows and all(len(row) > 1 and row[1].isdigit() for row in rows):
+        counts = {}
+        for row in rows:
+            word = row[0].lower()
+            counts[word] = counts.get(word, 0) + int(row[1])
+        total = sum(counts.values()) or 1
+        return [(word, -math.log(max(count, 1) / total)) for word, count in counts.items()]
+    # Zipf's law: the word of rank r has probability about 1 / (r log N)
+    words = list(dict.fromkeys(row[0].lower() for row in rows))
+    log_n = math.log(max(len(words), 2))
+    return [(word, math.log((rank + 1) * log_n)) for rank, word in enumerate(words)]
+
+
+def compile_word_list(source_path, compiled_path):
+    """Write the hash table file for the word list at source_path"""
+    entries = read_word_list(source_path)
+    slots = 1 << max(4, (len(entries) * 2 - 1).bit_length())  # load factor at most 1/2
+    mask = slots - 1
+    table = bytearray(SLOT.size * slots)
+    blob = bytearray()
+    longest = 0
+    for word, cost in entries:
+        key = word.encode("utf-8")
+        index = zlib.crc32(key) & mask
+        while SLOT.unpack_from(table, index * SLOT.size)[1]:
+            index = (index + 1) & mask
+        SLOT.pack_into(table, index * SLOT.size, len(blob), len(key), cost)
+        blob += key
+        longest = max(longest, len(word))
+    stat = os.stat(source_path)
+    temp_path = compiled_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, stat.st_mtime_ns, stat.st_size, len(entries), slots, longest))
+        f.write(table)
+        f.write(blob)
+    os.replace(temp_path, compiled_path)
+
+
+def _is_current(source_path, compiled_path):
+    try:
+        with open(compiled_path, "rb") as f:
+            magic, mtime_ns, size = HEADER.unpack(f.read(HEADER.size))[:3]
+    except (OSError, struct.error):
+        return False
+    stat = os.stat(source_path)
+    return magic == MAGIC and mtime_ns == stat.st_mtime_ns and size == stat.st_size
+
+
+# -------------------- Segmenting --------------------
+def load_segmenter(source_path, compiled_path):
+    """
+    segment(token) -> list of words for the word list at source_path, compiled to compiled_path
+    first when that file is missing or older than the list. Raises OSError for unreadable files.
+    """
+    if not _is_current(source_path, compiled_path):
+        previous = _mapped.pop(compiled_path, None)
+        if previous is not None:
+            previous.close()  # Windows cannot replace a file that is still mapped
+        compile_word_list(source_path, compiled_path)
+    with open(compiled_path, "rb") as f:
+        data = _mapped[compiled_path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _, _, _, _, slots, longest = HEADER.unpack_from(data)
+    mask = slots - 1
+    blob_start = HEADER.size + SLOT.size * slots
+    costs = {}  # word -> cost, or None if not in the dictionary
+    splits = {}  # lowercase token -> words
+
+    def word_cost(word):
+        cost = costs.get(word, False)
+        if cost is not False:
+            return cost
+        if len(costs) > CACHE_LIMIT:
+            costs.clear()
+        key = word.encode("utf-8")
+        index = zlib.crc32(key) & mask
+        while True:
+            offset, length, cost = SLOT.unpack_from(data, HEADER.size + index * SLOT.size)
+            if not length:
+                cost = None
+                break
+            if length == len(key) and data[blob_start + offset:blob_start + offset + length] == key:
+                break
+            index = (index + 1) & mask
+        costs[word] = cost
+        return cost
+
+    def split(token):
+        # best[i]: (cost, start of the last word, whether it is a dictionary word) for token[:i]
+        best = [(0.0, 0, True)]
+        for end in range(1, len(token) + 1):
+            choice = (best[end - 1][0] + UNKNOWN_CHAR_COST, end - 1, False)
+            for start in range(max(0, end - longest), end):
+                cost = word_cost(token[start:end])
+                if cost is not None and best[start][0] + cost < choice[0]:
+                    choice = (best[start][0] + cost, start, True)
+            best.append(choice)
+        pieces = []  # (word, known); letters missing from the dictionary stay together as one word
+        end = len(token)
+        while end:
+            _, start, known = best[end]
+            if not known and pieces and not pieces[-1][1]:
+                pieces[-1] = (token[start:end] + pieces[-1][0], False)
+            else:
+                pieces.append((token[start:end], known))
+            end = start
+        pieces.reverse()
+        # One unknown word at either end is trusted (apikeyxyz), but letters the dictionary cannot
+        # place anywhere else make the split guesswork, so the token stays whole
+        unknown = [i for i, (_, known) in enumerate(pieces) if not known]
+        if len(unknown) > 1 or (unknown and unknown[0] not in (0, len(pieces) - 1)):
+            return [token]
+        return [word for word, _ in pieces]
+
+    def segment(token):
+        """Words of `token` in its original case; tokens under MIN_SEGMENT_CHARS are returned whole"""
+        if len(token) < MIN_SEGMENT_CHARS:
+            return [token]
+        key = token.lower()
+        words = splits.get(key)
+        if words is None:
+            if len(splits) > CACHE_LIMIT:
+                splits.clear()
+            words = splits[key] = split(key) if len(key) == len(token) else [key]
+        if len(words) == 1:
+            return [token]
+        pieces = []
+        start = 0
+        for word in words:
+            pieces.append(token[start:start + len(word)])
+            start += len(word)
+        return pieces
+    return segment
+
+
+def make_text_segmenter(segment):
+    """Callable(text) putting spaces between the words of every single-case letter run"""
+    def split_match(match):
+        token = match.group()
+        if not (token.islower() or token.isupper()):
+            return token  # camelCase already marks its words
+        return " ".join(segment(token))
+
+    def segment_text(text):
+        return JOINED_RE.sub(split_match, text)
+    return segment_text
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        sys.exit("usage: python wordsegment.py WORD_LIST COMPILED_FILE")
+    compile_word_list(sys.argv[1], sys.argv[2])